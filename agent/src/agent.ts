@@ -1,3 +1,4 @@
+import { writeFileSync } from "node:fs";
 import { type Tool } from "@blockrun/llm";
 import { AgentKit, erc20ActionProvider, walletActionProvider } from "@coinbase/agentkit";
 import {
@@ -387,6 +388,11 @@ export async function startAgent() {
   installX402Tracker();
   const llmClient = createLLMClient(config.privateKey);
 
+  // Readiness signal for the deployer's probe: set by the systemd unit
+  if (process.env.BASILEUS_READY_FILE) {
+    writeFileSync(process.env.BASILEUS_READY_FILE, `${new Date().toISOString()}\n`);
+  }
+
   let state: AgentState = {
     cycle: 0,
     wallet: { address: "", ethBalance: "0", usdcBalance: "0", chainName: "" },
@@ -1,12 +1,81 @@
 import asyncio
+import importlib
+import sys
+from dataclasses import dataclass
 from functools import wraps
-from typing import Any
+from typing import Any, ClassVar
 
+import click
 import typer
+from typer.core import TyperCommand, TyperGroup
+
+
+@dataclass
+class LazyCommand:
+    """Command registered by import path, loaded only when invoked."""
+
+    import_path: str  # "package.module:function"
+    help: str
+
+
+class LazyGroup(TyperGroup):
+    """Typer group that imports a command's module only when that command runs.
+
+    Listing commands (e.g. `--help`) uses the registered help text, so it does
+    not import any command module.
+    """
+
+    # Set per app: AsyncTyper makes a subclass holding its own dict
+    lazy_commands: ClassVar[dict[str, LazyCommand]] = {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return [*super().list_commands(ctx), *self.lazy_commands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.commands or cmd_name not in self.lazy_commands:
+            return super().get_command(ctx, cmd_name)
+        # Help listing only: a stub carrying the help text
+        return TyperCommand(
+            name=cmd_name, help=self.lazy_commands[cmd_name].help, callback=None
+        )
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        if args and args[0] in self.lazy_commands and args[0] not in self.commands:
+            self.commands[args[0]] = self._load(args[0])
+        return super().resolve_command(ctx, args)
+
+    def _load(self, cmd_name: str) -> click.Command:
+        module_name, attr = self.lazy_commands[cmd_name].import_path.split(":")
+        fn = getattr(importlib.import_module(module_name), attr)
+        single = AsyncTyper(add_completion=False)
+        single.command(name=cmd_name)(fn)
+        command = typer.main.get_command(single)
+        command.name = cmd_name
+        return command
+
+
+async def _run_command(coro: Any) -> Any:
+    """Await a command, then close pooled HTTP clients it opened."""
+    try:
+        return await coro
+    finally:
+        # Only loaded by commands that talk to Aleph/CRNs; never import it here
+        sessions = sys.modules.get("basileus.infra.sessions")
+        if sessions is not None:
+            await sessions.close_sessions()
 
 
 class AsyncTyper(typer.Typer):
-    """Typer subclass that supports async command functions."""
+    """Typer subclass that supports async command functions and lazy commands."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.lazy_commands: dict[str, LazyCommand] = {}
+        group_cls = type(
+            "AsyncTyperGroup", (LazyGroup,), {"lazy_commands": self.lazy_commands}
+        )
+        super().__init__(*args, cls=group_cls, **kwargs)
 
     def command(self, *args: Any, **kwargs: Any) -> Any:
         decorator = super().command(*args, **kwargs)
@@ -14,9 +83,13 @@ class AsyncTyper(typer.Typer):
         def wrapper(fn: Any) -> Any:
             @wraps(fn)
             def runner(*a: Any, **kw: Any) -> Any:
-                return asyncio.run(fn(*a, **kw))
+                return asyncio.run(_run_command(fn(*a, **kw)))
 
             decorator(runner)
             return fn
 
         return wrapper
+
+    def lazy_command(self, name: str, import_path: str, help: str) -> None:
+        """Register an async command by "module:function" path without importing it."""
+        self.lazy_commands[name] = LazyCommand(import_path=import_path, help=help)
@@ -5,7 +5,8 @@ from rich.live import Live
 from rich.spinner import Spinner
 from web3 import Web3
 
-from basileus.chain.constants import BASE_RPC_URL, MIN_ETH_FUNDING
+from basileus.chain.constants import MIN_ETH_FUNDING
+from basileus.chain.rpc import get_web3
 
 console = Console()
 
@@ -20,7 +21,7 @@ def wait_for_eth_funding(
     address: str, min_amount: float = MIN_ETH_FUNDING, poll_interval: int = 5
 ) -> float:
     """Poll RPC until ETH balance >= min_amount. Returns final balance."""
-    w3 = Web3(Web3.HTTPProvider(BASE_RPC_URL))
+    w3 = get_web3()
 
     with Live(
         Spinner("dots", text=f"Waiting for ETH deposit to {address}..."),
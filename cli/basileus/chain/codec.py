@@ -0,0 +1,157 @@
+"""Compiled call codec for the contracts the CLI talks to.
+
+Selectors, event topics and eth_abi encoders/decoders are computed once at
+import from the ABI lists in chain/constants.py, and contract addresses are
+checksummed once. This replaces per-call `w3.eth.contract(...)` factories,
+which re-parse the ABI and re-checksum addresses on every call.
+"""
+
+from typing import Any
+
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
+from eth_abi.encoding import TupleEncoder
+from eth_abi.registry import registry as abi_registry
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import Web3
+
+from basileus.chain.constants import (
+    ALEPH_ADDRESS,
+    ERC20_BALANCE_ABI,
+    ERC8004_IDENTITY_REGISTRY,
+    ERC8004_IDENTITY_REGISTRY_ABI,
+    L2_REGISTRAR_ABI,
+    L2_REGISTRAR_ADDRESS,
+    L2_REGISTRY_ABI,
+    L2_REGISTRY_ADDRESS,
+    MULTICALL3_ABI,
+    MULTICALL3_ADDRESS,
+    SIMPLE_7702_ACCOUNT,
+    SIMPLE_7702_ACCOUNT_ABI,
+    SUPERFLUID_CFA_ABI,
+    SUPERFLUID_CFA_V1,
+    UNISWAP_ALEPH_POOL,
+    UNISWAP_POOL_ABI,
+    UNISWAP_ROUTER,
+    UNISWAP_ROUTER_ABI,
+    USDC_ADDRESS,
+)
+
+
+def _abi_type(param: dict) -> str:
+    """Canonical type string for an ABI param, expanding tuples."""
+    type_str: str = param["type"]
+    if not type_str.startswith("tuple"):
+        return type_str
+    inner = ",".join(_abi_type(c) for c in param["components"])
+    return f"({inner}){type_str[len('tuple') :]}"
+
+
+def _tuple_encoder(*types: str) -> TupleEncoder:
+    return TupleEncoder(encoders=tuple(abi_registry.get_encoder(t) for t in types))
+
+
+def _tuple_decoder(*types: str) -> TupleDecoder:
+    return TupleDecoder(decoders=tuple(abi_registry.get_decoder(t) for t in types))
+
+
+class AbiFunction:
+    """One contract function with its selector and cached coders."""
+
+    def __init__(self, entry: dict) -> None:
+        self.name: str = entry["name"]
+        self.input_types = tuple(_abi_type(p) for p in entry["inputs"])
+        self.output_types = tuple(_abi_type(p) for p in entry.get("outputs", []))
+        self.signature = f"{self.name}({','.join(self.input_types)})"
+        self.selector = keccak(text=self.signature)[:4]
+        self._encoder = _tuple_encoder(*self.input_types)
+        self._decoder = _tuple_decoder(*self.output_types)
+
+    def encode(self, *args: Any) -> bytes:
+        """Calldata: selector followed by ABI-encoded arguments."""
+        return self.selector + self._encoder(args)
+
+    def decode(self, data: bytes) -> Any:
+        """Decode return data. Single outputs are unwrapped from the tuple."""
+        values = self._decoder(ContextFramesBytesIO(bytes(data)))
+        return values[0] if len(self.output_types) == 1 else values
+
+
+def _is_dynamic(type_str: str) -> bool:
+    return type_str in ("string", "bytes") or type_str.endswith("]")
+
+
+class AbiEvent:
+    """One contract event with its topic and cached decoders."""
+
+    def __init__(self, entry: dict) -> None:
+        self.name: str = entry["name"]
+        self.inputs: list[dict] = entry["inputs"]
+        types = ",".join(_abi_type(p) for p in self.inputs)
+        self.signature = f"{self.name}({types})"
+        self.topic = keccak(text=self.signature)
+        self._data_decoder = _tuple_decoder(
+            *(_abi_type(p) for p in self.inputs if not p["indexed"])
+        )
+        # Indexed dynamic types are stored as their keccak hash: keep raw topic
+        self._topic_decoders = [
+            None if _is_dynamic(p["type"]) else _tuple_decoder(p["type"])
+            for p in self.inputs
+            if p["indexed"]
+        ]
+
+    def matches(self, log: Any) -> bool:
+        topics = log["topics"]
+        return bool(topics) and bytes(HexBytes(topics[0])) == self.topic
+
+    def decode_log(self, log: Any) -> dict[str, Any]:
+        """Decode a log entry emitted by this event into {arg name: value}."""
+        data = iter(
+            self._data_decoder(ContextFramesBytesIO(bytes(HexBytes(log["data"]))))
+        )
+        topics = iter(zip(log["topics"][1:], self._topic_decoders))
+        args: dict[str, Any] = {}
+        for param in self.inputs:
+            if not param["indexed"]:
+                args[param["name"]] = next(data)
+                continue
+            topic, decoder = next(topics)
+            raw = bytes(HexBytes(topic))
+            args[param["name"]] = (
+                raw if decoder is None else decoder(ContextFramesBytesIO(raw))[0]
+            )
+        return args
+
+
+class ContractCodec:
+    """Checksummed address plus compiled functions and events for one contract."""
+
+    def __init__(self, address: str, abi: list[Any]) -> None:
+        self.address = Web3.to_checksum_address(address)
+        self.functions = {
+            e["name"]: AbiFunction(e) for e in abi if e["type"] == "function"
+        }
+        self.events = {e["name"]: AbiEvent(e) for e in abi if e["type"] == "event"}
+
+    def encode(self, fn_name: str, *args: Any) -> bytes:
+        return self.functions[fn_name].encode(*args)
+
+    def call(self, w3: Web3, fn_name: str, *args: Any) -> Any:
+        """eth_call a view function and decode its result."""
+        fn = self.functions[fn_name]
+        raw = w3.eth.call({"to": self.address, "data": HexBytes(fn.encode(*args))})
+        return fn.decode(raw)
+
+
+L2_REGISTRAR_CODEC = ContractCodec(L2_REGISTRAR_ADDRESS, L2_REGISTRAR_ABI)
+L2_REGISTRY_CODEC = ContractCodec(L2_REGISTRY_ADDRESS, L2_REGISTRY_ABI)
+ERC8004_REGISTRY_CODEC = ContractCodec(
+    ERC8004_IDENTITY_REGISTRY, ERC8004_IDENTITY_REGISTRY_ABI
+)
+ALEPH_POOL_CODEC = ContractCodec(UNISWAP_ALEPH_POOL, UNISWAP_POOL_ABI)
+ROUTER_CODEC = ContractCodec(UNISWAP_ROUTER, UNISWAP_ROUTER_ABI)
+USDC_CODEC = ContractCodec(USDC_ADDRESS, ERC20_BALANCE_ABI)
+ALEPH_CODEC = ContractCodec(ALEPH_ADDRESS, ERC20_BALANCE_ABI)
+MULTICALL3_CODEC = ContractCodec(MULTICALL3_ADDRESS, MULTICALL3_ABI)
+SUPERFLUID_CFA_CODEC = ContractCodec(SUPERFLUID_CFA_V1, SUPERFLUID_CFA_ABI)
+SIMPLE_7702_CODEC = ContractCodec(SIMPLE_7702_ACCOUNT, SIMPLE_7702_ACCOUNT_ABI)
@@ -3,7 +3,12 @@ BUILDER_CODE = "bc_kj26kx76"
 
 # Base mainnet
 BASE_RPC_URL = "https://mainnet.base.org"
+# (url, weight) tried by chain/rpc.py, overridden by $BASILEUS_RPC_URLS
+BASE_RPC_URLS = ((BASE_RPC_URL, 2.0), ("https://base-rpc.publicnode.com", 1.0))
 BASE_CHAIN_ID = 8453
+BASE_BLOCK_TIME = 2  # seconds
+# Flashblocks endpoint: preconfirmed (pending) receipts ~200ms after send
+BASE_PRECONF_RPC_URL = "https://mainnet-preconf.base.org"
 
 # USDC on Base
 USDC_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
@@ -26,6 +31,9 @@ UNISWAP_ALEPH_POOL = "0xe11C66b25F0e9a9eBEf1616B43424CC6E2168FC8"
 UNISWAP_FEE_ALEPH = 10000  # 1% for WETH/ALEPH
 UNISWAP_FEE_USDC = 500  # 0.05% for WETH/USDC
 
+# Fixed gas limit for exactInputSingle (unused gas is not charged)
+SWAP_GAS_LIMIT = 500_000
+
 # Funding flow
 MIN_ETH_FUNDING = 0.01
 MIN_ETH_RESERVE = 0.001
@@ -70,7 +78,17 @@ L2_REGISTRAR_ABI = [
         "stateMutability": "nonpayable",
         "type": "function",
     },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "label", "type": "string"},
+            {"indexed": True, "name": "owner", "type": "address"},
+        ],
+        "name": "NameRegistered",
+        "type": "event",
+    },
 ]
+L2_REGISTRAR_DEPLOY_BLOCK = 42102582
 
 # IPFS content hash (EIP-1577 encoded) — output of `npm run deploy:ipfs` in frontend/
 FRONTEND_CONTENT_HASH = (
@@ -155,6 +173,16 @@ ERC8004_IDENTITY_REGISTRY_ABI = [
         "name": "Registered",
         "type": "event",
     },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "from", "type": "address"},
+            {"indexed": True, "name": "to", "type": "address"},
+            {"indexed": True, "name": "tokenId", "type": "uint256"},
+        ],
+        "name": "Transfer",
+        "type": "event",
+    },
 ]
 
 # Uniswap V3 pool ABI (slot0 for price reading)
@@ -200,3 +228,125 @@ UNISWAP_ROUTER_ABI = [
         "type": "function",
     }
 ]
+
+# Multicall3 (same address on every chain)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "value", "type": "uint256"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3Value",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+# Superfluid ConstantFlowAgreementV1 on Base (ALEPH is its own super token)
+SUPERFLUID_CFA_V1 = "0x19ba78B9cDB05A877718841c574325fdB53601bb"
+
+SUPERFLUID_CFA_ABI = [
+    {
+        "inputs": [
+            {"name": "token", "type": "address"},
+            {"name": "sender", "type": "address"},
+            {"name": "receiver", "type": "address"},
+        ],
+        "name": "getFlow",
+        "outputs": [
+            {"name": "timestamp", "type": "uint256"},
+            {"name": "flowRate", "type": "int96"},
+            {"name": "deposit", "type": "uint256"},
+            {"name": "owedDeposit", "type": "uint256"},
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "token", "type": "address"},
+            {"name": "account", "type": "address"},
+        ],
+        "name": "getNetFlow",
+        "outputs": [{"name": "flowRate", "type": "int96"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+# eth-infinitism Simple7702Account (v0.8): batch executor an EOA delegates to
+# via EIP-7702. executeBatch only accepts calls from the account itself.
+SIMPLE_7702_ACCOUNT = "0x4Cd241E8d1510e30b2076397afc7508Ae59C66c9"
+
+SIMPLE_7702_ACCOUNT_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "value", "type": "uint256"},
+                    {"name": "data", "type": "bytes"},
+                ],
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "executeBatch",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    }
+]
@@ -0,0 +1,85 @@
+"""Atomic call batches from an agent EOA delegated via EIP-7702.
+
+The EOA delegates its code to Simple7702Account and sends itself one
+executeBatch tx: every call runs with the agent as msg.sender, and if one
+reverts the whole batch does. The delegation is set by the same tx the first
+time, and kept afterwards.
+"""
+
+from eth_account import Account
+from eth_account.datastructures import SignedSetCodeAuthorization
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.types import TxParams, TxReceipt
+
+from basileus.chain.codec import SIMPLE_7702_CODEC
+from basileus.chain.constants import BASE_CHAIN_ID
+from basileus.chain.fees import GAS_ESTIMATE_HEADROOM
+from basileus.chain.tx import ContractCall, send_transaction
+
+# Code of an EOA delegated with EIP-7702: 0xef0100 || delegate address
+DELEGATION_PREFIX = bytes.fromhex("ef0100")
+
+
+def delegation_code(delegate: str) -> bytes:
+    return DELEGATION_PREFIX + bytes.fromhex(delegate.removeprefix("0x"))
+
+
+def is_delegated(w3: Web3, address: str, delegate: str) -> bool:
+    """Whether address already delegates its code to delegate."""
+    code = w3.eth.get_code(Web3.to_checksum_address(address))
+    return bytes(code) == delegation_code(delegate)
+
+
+def sign_delegation(
+    w3: Web3, private_key: str, delegate: str
+) -> SignedSetCodeAuthorization:
+    """Authorize delegate as the code of the key's EOA, for a tx it sends itself."""
+    account = Account.from_key(private_key)
+    # Sender nonce is bumped before authorizations are processed
+    nonce = w3.eth.get_transaction_count(account.address, "pending") + 1
+    return Account.sign_authorization(
+        {"chainId": BASE_CHAIN_ID, "address": delegate, "nonce": nonce},
+        private_key,
+    )
+
+
+def batch_call(address: str, calls: list[ContractCall]) -> ContractCall:
+    """executeBatch(calls) sent by the delegated EOA to itself.
+
+    Builder code suffixes of the inner calls are dropped; the outer tx
+    carries the ERC-8021 suffix once.
+    """
+    entries = [(c.to, c.value, c.data) for c in calls]
+    return ContractCall(
+        to=address, data=SIMPLE_7702_CODEC.encode("executeBatch", entries)
+    )
+
+
+def send_batch(
+    w3: Web3, private_key: str, calls: list[ContractCall], label: str = "Batch"
+) -> tuple[HexBytes, TxReceipt]:
+    """Run calls atomically in one tx from the key's EOA. Returns (tx_hash, receipt).
+
+    Delegates the EOA to Simple7702Account in the same tx if needed.
+    """
+    address = Account.from_key(private_key).address
+    delegate = SIMPLE_7702_CODEC.address
+    authorizations = []
+    if not is_delegated(w3, address, delegate):
+        authorizations.append(sign_delegation(w3, private_key, delegate))
+
+    call = batch_call(address, calls)
+    tx: TxParams = {"from": address, "to": address, "data": HexBytes(call.data)}
+    if authorizations:
+        tx["authorizationList"] = authorizations  # type: ignore[typeddict-item]
+    gas = int(w3.eth.estimate_gas(tx) * GAS_ESTIMATE_HEADROOM)
+
+    return send_transaction(
+        w3,
+        private_key,
+        call,
+        gas=gas,
+        label=label,
+        authorizations=authorizations,
+    )
@@ -1,30 +1,27 @@
+import re
+
 from web3 import Web3
-from eth_account import Account
-
-from basileus.chain.constants import (
-    BUILDER_CODE,
-    L2_REGISTRAR_ADDRESS,
-    L2_REGISTRAR_ABI,
-    L2_REGISTRY_ADDRESS,
-    L2_REGISTRY_ABI,
-)
-from basileus.chain.builder_code import builder_code_suffix
-
-
-def _get_registrar(w3: Web3):
-    return w3.eth.contract(
-        address=Web3.to_checksum_address(L2_REGISTRAR_ADDRESS),
-        abi=L2_REGISTRAR_ABI,
-    )
+
+from basileus.chain.codec import L2_REGISTRAR_CODEC, L2_REGISTRY_CODEC
+from basileus.chain.multicall import Read, multicall
+from basileus.chain.tx import ContractCall, send_transaction
+from basileus.infra.cache import load_json_cache, update_json_cache
+
+MIN_LABEL_LENGTH = 3
+# Candidates generated from a pattern / suggested for a taken label
+MAX_PATTERN_CANDIDATES = 1000
+SUGGESTION_COUNT = 5
+# baseNode per registry address, and whether local makeNode matched on-chain
+REGISTRY_CACHE = "ens-registry"
+_PROBE_LABEL = "basileus"
+
+_PATTERN_FIELD = re.compile(r"\{n(:[^}]*)?\}")
 
 
 def check_existing_subname(w3: Web3, address: str) -> str | None:
     """Call reverseNames(address). Returns label or None if no subname."""
     try:
-        contract = _get_registrar(w3)
-        label = contract.functions.reverseNames(
-            Web3.to_checksum_address(address)
-        ).call()
+        label = L2_REGISTRAR_CODEC.call(w3, "reverseNames", address)
         return label if label else None
     except Exception:
         return None
@@ -32,59 +29,135 @@ def check_existing_subname(w3: Web3, address: str) -> str | None:
 
 def check_label_available(w3: Web3, label: str) -> bool:
     """Call available(label). Returns True if label can be registered."""
-    contract = _get_registrar(w3)
-    return contract.functions.available(label).call()
+    return L2_REGISTRAR_CODEC.call(w3, "available", label)
 
 
-def register_subname(w3: Web3, private_key: str, label: str, owner: str) -> str:
-    """Call register(label, owner). Signs and sends tx. Returns tx hash hex.
-    Raises on failure."""
-    contract = _get_registrar(w3)
-    account = Account.from_key(private_key)
-    owner_checksummed = Web3.to_checksum_address(owner)
-
-    call = contract.functions.register(label, owner_checksummed)
-    tx = call.build_transaction(
-        {
-            "from": account.address,
-            "nonce": w3.eth.get_transaction_count(account.address, "pending"),
-            "gas": call.estimate_gas({"from": account.address}),
-        }
+def labels_available(w3: Web3, labels: list[str]) -> list[bool | None]:
+    """available(label) for many labels in one Multicall3 batch.
+
+    None for a label whose check failed.
+    """
+    return multicall(
+        w3, [Read(L2_REGISTRAR_CODEC, "available", (label,)) for label in labels]
     )
 
-    if BUILDER_CODE:
-        suffix = builder_code_suffix(BUILDER_CODE)
-        tx["data"] += suffix.hex()
-        tx["gas"] += len(suffix) * 16
 
-    signed = account.sign_transaction(tx)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
+def _fill_pattern(pattern: str, n: int) -> str:
+    """Replace every {n} / {n:spec} field of pattern with n."""
+    return _PATTERN_FIELD.sub(lambda m: format(n, (m.group(1) or ":")[1:]), pattern)
+
+
+def expand_label_candidates(
+    spec: str, start: int = 1, limit: int = MAX_PATTERN_CANDIDATES
+) -> list[str]:
+    """Candidate labels from a comma-separated list and/or {n} patterns.
+
+    `trader-{n}` gives trader-1, trader-2...; format specs work, e.g.
+    `bot-{n:03}` gives bot-001. Labels are lowercased and ones shorter than
+    MIN_LABEL_LENGTH are dropped.
+    """
+    candidates: list[str] = []
+    for part in spec.split(","):
+        part = part.strip().lower()
+        if _PATTERN_FIELD.search(part):
+            candidates += [_fill_pattern(part, n) for n in range(start, start + limit)]
+        elif part:
+            candidates.append(part)
+    return [c for c in dict.fromkeys(candidates) if len(c) >= MIN_LABEL_LENGTH]
+
+
+def suggest_labels(label: str, limit: int = MAX_PATTERN_CANDIDATES) -> list[str]:
+    """Alternatives to a taken label: label-2, label-3..."""
+    return expand_label_candidates(f"{label}-{{n}}", start=2, limit=limit)
+
+
+def find_available_labels(
+    w3: Web3, candidates: list[str], count: int = 1, contiguous: bool = False
+) -> list[str]:
+    """First `count` free labels among candidates, checked in one batch.
+
+    With contiguous, returns the first run of `count` candidates that are all
+    free (e.g. trader-7..trader-16 for a fleet). Returns fewer labels, or
+    none for contiguous, when not enough are free.
+    """
+    free = labels_available(w3, candidates)
+    if not contiguous:
+        return [c for c, ok in zip(candidates, free) if ok][:count]
+    run: list[str] = []
+    for candidate, ok in zip(candidates, free):
+        run = run + [candidate] if ok else []
+        if len(run) == count:
+            return run
+    return []
+
+
+def register_call(label: str, owner: str) -> ContractCall:
+    """Encode register(label, owner) on the L2Registrar."""
+    return ContractCall(
+        to=L2_REGISTRAR_CODEC.address,
+        data=L2_REGISTRAR_CODEC.encode("register", label, owner),
+    )
 
-    if receipt["status"] != 1:
-        raise RuntimeError(f"Transaction reverted: 0x{tx_hash.hex()}")
 
+def register_subname(w3: Web3, private_key: str, label: str, owner: str) -> str:
+    """Call register(label, owner). Signs and sends tx. Returns tx hash hex.
+    Raises on failure."""
+    tx_hash, _receipt = send_transaction(w3, private_key, register_call(label, owner))
     return f"0x{tx_hash.hex()}"
 
 
-def _get_registry(w3: Web3):
-    return w3.eth.contract(
-        address=Web3.to_checksum_address(L2_REGISTRY_ADDRESS),
-        abi=L2_REGISTRY_ABI,
+def make_node(parent_node: bytes, label: str) -> bytes:
+    """keccak256(parentNode, keccak256(label)), as L2Registry.makeNode."""
+    return bytes(Web3.keccak(parent_node + Web3.keccak(text=label)))
+
+
+def _registry_base_node(w3: Web3) -> tuple[bytes, bool]:
+    """(baseNode, whether make_node matches the registry), cached on disk.
+
+    baseNode never changes for a registry, so it is read once; makeNode is
+    pure, so it is checked once against the contract and then computed locally.
+    """
+    key = L2_REGISTRY_CODEC.address.lower()
+    entry = load_json_cache(REGISTRY_CACHE).get(key)
+    if isinstance(entry, dict) and "base_node" in entry:
+        return bytes.fromhex(entry["base_node"]), bool(entry.get("local"))
+
+    base_node = L2_REGISTRY_CODEC.call(w3, "baseNode")
+    probe = L2_REGISTRY_CODEC.call(w3, "makeNode", base_node, _PROBE_LABEL)
+    local = make_node(base_node, _PROBE_LABEL) == probe
+    update_json_cache(
+        REGISTRY_CACHE, {key: {"base_node": base_node.hex(), "local": local}}
     )
+    return base_node, local
+
+
+def _get_node(w3: Web3, label: str) -> bytes:
+    """Namehash of <label>.basileus-agent.eth on the L2Registry."""
+    base_node, local = _registry_base_node(w3)
+    if local:
+        return make_node(base_node, label)
+    return L2_REGISTRY_CODEC.call(w3, "makeNode", base_node, label)
 
 
 def get_content_hash(w3: Web3, label: str) -> str | None:
     """Read current contentHash from L2Registry for a subname. Returns hex string or None."""
-    registry = _get_registry(w3)
-    base_node = registry.functions.baseNode().call()
-    node = registry.functions.makeNode(base_node, label).call()
-    raw = registry.functions.contenthash(node).call()
+    raw = L2_REGISTRY_CODEC.call(w3, "contenthash", _get_node(w3, label))
     if not raw:
         return None
     return f"0x{raw.hex()}"
 
 
+def set_content_hash_call(w3: Web3, label: str, content_hash_hex: str) -> ContractCall:
+    """Encode setContenthash(node, hash) on the L2Registry for a subname."""
+    content_hash = bytes.fromhex(content_hash_hex.removeprefix("0x"))
+    return ContractCall(
+        to=L2_REGISTRY_CODEC.address,
+        data=L2_REGISTRY_CODEC.encode(
+            "setContenthash", _get_node(w3, label), content_hash
+        ),
+    )
+
+
 def set_content_hash(
     w3: Web3, private_key: str, label: str, content_hash_hex: str
 ) -> str:
@@ -93,33 +166,7 @@ def set_content_hash(
     content_hash_hex: EIP-1577 encoded hex from the frontend deploy script (0x...).
     Returns tx hash hex.
     """
-    registry = _get_registry(w3)
-    account = Account.from_key(private_key)
-
-    base_node = registry.functions.baseNode().call()
-    node = registry.functions.makeNode(base_node, label).call()
-
-    content_hash = bytes.fromhex(content_hash_hex.removeprefix("0x"))
-
-    call = registry.functions.setContenthash(node, content_hash)
-    tx = call.build_transaction(
-        {
-            "from": account.address,
-            "nonce": w3.eth.get_transaction_count(account.address, "pending"),
-            "gas": call.estimate_gas({"from": account.address}),
-        }
+    tx_hash, _receipt = send_transaction(
+        w3, private_key, set_content_hash_call(w3, label, content_hash_hex)
     )
-
-    if BUILDER_CODE:
-        suffix = builder_code_suffix(BUILDER_CODE)
-        tx["data"] += suffix.hex()
-        tx["gas"] += len(suffix) * 16
-
-    signed = account.sign_transaction(tx)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
-
-    if receipt["status"] != 1:
-        raise RuntimeError(f"Transaction reverted: 0x{tx_hash.hex()}")
-
     return f"0x{tx_hash.hex()}"
@@ -1,29 +1,25 @@
 """ERC-8004 IdentityRegistry interactions for registering Basileus agents on Base."""
 
+import asyncio
+import hashlib
 import json
-import warnings
 
+import aiohttp
+import aleph_cid
 import eth_abi
 from aleph.sdk.chains.ethereum import ETHAccount
-from aleph.sdk.client.authenticated_http import AuthenticatedAlephHttpClient
 from aleph.sdk.types import StorageEnum
-from eth_account import Account
 from web3 import Web3
+from web3.types import TxReceipt
 
-from basileus.chain.builder_code import builder_code_suffix
-from basileus.chain.constants import (
-    BUILDER_CODE,
-    ERC8004_IDENTITY_REGISTRY,
-    ERC8004_IDENTITY_REGISTRY_ABI,
-)
-from basileus.infra.aleph import ALEPH_API_URL, ALEPH_CHANNEL
+from basileus.chain.codec import ERC8004_REGISTRY_CODEC
+from basileus.chain.tx import ContractCall, send_transaction
+from basileus.infra.aleph import ALEPH_API_URL, ALEPH_CHANNEL, store_message_exists
+from basileus.infra.cache import load_json_cache, update_json_cache
+from basileus.infra.sessions import authenticated_aleph_client
 
-
-def _get_registry(w3: Web3):
-    return w3.eth.contract(
-        address=Web3.to_checksum_address(ERC8004_IDENTITY_REGISTRY),
-        abi=ERC8004_IDENTITY_REGISTRY_ABI,
-    )
+# sha256 of uploaded metadata JSON -> ipfs:// URI
+METADATA_CACHE = "ipfs-metadata"
 
 
 def build_agent_metadata(label: str) -> dict:
@@ -44,27 +40,40 @@ def build_agent_metadata(label: str) -> dict:
 async def upload_metadata_to_ipfs(
     aleph_account: ETHAccount, metadata: dict, max_retries: int = 3
 ) -> str:
-    """Upload agent metadata JSON to IPFS via Aleph. Returns ipfs:// URI."""
-    import asyncio
+    """Upload agent metadata JSON to IPFS via Aleph. Returns ipfs:// URI.
 
+    The CID is computed locally first: metadata already pinned on Aleph, or
+    uploaded earlier from this machine, is not uploaded again.
+    """
     content_bytes = json.dumps(metadata, indent=2).encode("utf-8")
+    content_key = hashlib.sha256(content_bytes).hexdigest()
+    cached = load_json_cache(METADATA_CACHE).get(content_key)
+    if cached:
+        return cached
+
+    cid = aleph_cid.compute_cid(content_bytes)
+    try:
+        if await store_message_exists(cid):
+            update_json_cache(METADATA_CACHE, {content_key: f"ipfs://{cid}"})
+            return f"ipfs://{cid}"
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass  # only an optimization, fall back to uploading
 
     for attempt in range(max_retries):
         try:
-            async with AuthenticatedAlephHttpClient(
-                account=aleph_account, api_server=ALEPH_API_URL
-            ) as client:
-                result, _status = await asyncio.wait_for(
-                    client.create_store(
-                        file_content=content_bytes,
-                        storage_engine=StorageEnum.ipfs,
-                        channel=ALEPH_CHANNEL,
-                        guess_mime_type=True,
-                    ),
-                    timeout=120,
-                )
-            cid = result.content.item_hash
-            return f"ipfs://{cid}"
+            client = await authenticated_aleph_client(aleph_account, ALEPH_API_URL)
+            result, _status = await asyncio.wait_for(
+                client.create_store(
+                    file_content=content_bytes,
+                    storage_engine=StorageEnum.ipfs,
+                    channel=ALEPH_CHANNEL,
+                    guess_mime_type=True,
+                ),
+                timeout=120,
+            )
+            uri = f"ipfs://{result.content.item_hash}"
+            update_json_cache(METADATA_CACHE, {content_key: uri})
+            return uri
         except Exception:
             if attempt >= max_retries - 1:
                 raise
@@ -74,12 +83,22 @@ async def upload_metadata_to_ipfs(
 
 def check_existing_registration(w3: Web3, address: str) -> bool:
     """Check if address already owns an ERC-8004 identity NFT."""
-    contract = _get_registry(w3)
-    checksummed = Web3.to_checksum_address(address)
-    balance = contract.functions.balanceOf(checksummed).call()
+    balance = ERC8004_REGISTRY_CODEC.call(w3, "balanceOf", address)
     return balance > 0
 
 
+def register_agent_call(agent_uri: str, ens_name: str) -> ContractCall:
+    """Encode register(agentURI, metadata) on the IdentityRegistry."""
+    # Encode ENS name as metadata entry: (key, abi-encoded value)
+    ens_value = eth_abi.encode(["string"], [ens_name])
+    metadata_entries = [("ens", ens_value)]
+
+    return ContractCall(
+        to=ERC8004_REGISTRY_CODEC.address,
+        data=ERC8004_REGISTRY_CODEC.encode("register", agent_uri, metadata_entries),
+    )
+
+
 def register_agent(
     w3: Web3, private_key: str, agent_uri: str, ens_name: str
 ) -> tuple[int, str]:
@@ -87,41 +106,22 @@ def register_agent(
 
     Returns (agentId, tx_hash).
     """
-    contract = _get_registry(w3)
-    account = Account.from_key(private_key)
-
-    # Encode ENS name as metadata entry: (key, abi-encoded value)
-    ens_value = eth_abi.encode(["string"], [ens_name])
-    metadata_entries = [("ens", ens_value)]
-
-    call = contract.functions.register(agent_uri, metadata_entries)
-    tx = call.build_transaction(
-        {
-            "from": account.address,
-            "nonce": w3.eth.get_transaction_count(account.address, "pending"),
-            "gas": call.estimate_gas({"from": account.address}),
-        }
+    tx_hash, receipt = send_transaction(
+        w3, private_key, register_agent_call(agent_uri, ens_name)
     )
+    return (registered_agent_id(receipt), f"0x{tx_hash.hex()}")
 
-    if BUILDER_CODE:
-        suffix = builder_code_suffix(BUILDER_CODE)
-        tx["data"] += suffix.hex()
-        tx["gas"] += len(suffix) * 16
-
-    signed = account.sign_transaction(tx)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
 
-    if receipt["status"] != 1:
-        raise RuntimeError(f"Transaction reverted: 0x{tx_hash.hex()}")
-
-    # Extract agentId from Registered event (suppress MismatchedABI warnings
-    # from unrelated logs like ERC-721 Transfer/Approval)
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message=".*MismatchedABI.*")
-        registered_events = contract.events.Registered().process_receipt(receipt)
+def registered_agent_id(receipt: TxReceipt) -> int:
+    """agentId from the Registered event of a receipt (other logs are ERC-721 Transfer etc.)."""
+    registered = ERC8004_REGISTRY_CODEC.events["Registered"]
+    registered_events = [
+        registered.decode_log(log)
+        for log in receipt["logs"]
+        if log["address"] == ERC8004_REGISTRY_CODEC.address and registered.matches(log)
+    ]
     if not registered_events:
-        raise RuntimeError(f"No Registered event found in tx 0x{tx_hash.hex()}")
-    agent_id = registered_events[0]["args"]["agentId"]
-
-    return (agent_id, f"0x{tx_hash.hex()}")
+        raise RuntimeError(
+            f"No Registered event found in tx 0x{receipt['transactionHash'].hex()}"
+        )
+    return registered_events[0]["agentId"]
@@ -0,0 +1,89 @@
+"""EIP-1559 fee oracle and gas estimate memoization shared by all tx builders."""
+
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+
+from web3 import Web3
+from web3.types import TxParams
+
+from basileus.chain.constants import BASE_BLOCK_TIME
+
+FEE_HISTORY_BLOCKS = 5
+FEE_HISTORY_PERCENTILE = 50
+MIN_PRIORITY_FEE_WEI = 1_000_000  # 0.001 gwei
+BASE_FEE_MULTIPLIER = 2
+GAS_ESTIMATE_HEADROOM = 1.1
+CALLDATA_GAS_PER_BYTE = 16
+
+
+@dataclass(frozen=True)
+class FeeParams:
+    """EIP-1559 fee fields sampled from eth_feeHistory."""
+
+    max_fee_per_gas: int
+    max_priority_fee_per_gas: int
+    block_number: int
+
+
+_lock = threading.Lock()
+_fee_cache: dict[str, tuple[float, FeeParams]] = {}
+_gas_cache: dict[tuple[str, str, str, bytes, int], int] = {}
+
+
+def _endpoint_key(w3: Web3) -> str:
+    return str(getattr(w3.provider, "endpoint_uri", None) or id(w3.provider))
+
+
+def get_fee_params(w3: Web3) -> FeeParams:
+    """Return maxFeePerGas/maxPriorityFeePerGas, sampling eth_feeHistory at most once per block."""
+    key = _endpoint_key(w3)
+    now = time.monotonic()
+    with _lock:
+        cached = _fee_cache.get(key)
+    if cached is not None and now - cached[0] < BASE_BLOCK_TIME:
+        return cached[1]
+
+    history = w3.eth.fee_history(FEE_HISTORY_BLOCKS, "latest", [FEE_HISTORY_PERCENTILE])
+    # baseFeePerGas has one extra entry: the base fee of the next block
+    next_base_fee = history["baseFeePerGas"][-1]
+    rewards = [r[0] for r in history.get("reward", []) if r]
+    priority_fee = max(
+        int(statistics.median(rewards)) if rewards else 0, MIN_PRIORITY_FEE_WEI
+    )
+    newest_block = history["oldestBlock"] + len(history["baseFeePerGas"]) - 2
+
+    params = FeeParams(
+        max_fee_per_gas=next_base_fee * BASE_FEE_MULTIPLIER + priority_fee,
+        max_priority_fee_per_gas=priority_fee,
+        block_number=newest_block,
+    )
+    with _lock:
+        _fee_cache[key] = (now, params)
+    return params
+
+
+def estimate_gas(w3: Web3, sender: str, to: str, data: bytes, value: int = 0) -> int:
+    """Estimate gas for a call, memoized per endpoint, sender, target, calldata and value.
+
+    Gas depends on the arguments and on the sender's state (a first ENS label
+    or ERC-8004 registration writes fresh storage), so an estimate is only
+    reused for the exact same call sent again by this process.
+    """
+    key = (_endpoint_key(w3), sender.lower(), to.lower(), bytes(data), value)
+    with _lock:
+        cached = _gas_cache.get(key)
+    if cached is not None:
+        return cached
+
+    tx: TxParams = {"from": sender, "to": to, "data": data, "value": value}  # type: ignore[typeddict-item]
+    gas = int(w3.eth.estimate_gas(tx) * GAS_ESTIMATE_HEADROOM)
+    with _lock:
+        _gas_cache[key] = gas
+    return gas
+
+
+def suffix_gas(suffix: bytes) -> int:
+    """Extra intrinsic gas for calldata appended after estimation (ERC-8021 builder code)."""
+    return len(suffix) * CALLDATA_GAS_PER_BYTE
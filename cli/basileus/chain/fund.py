@@ -0,0 +1,160 @@
+"""Funding many agent wallets from a treasury in one Multicall3 transaction."""
+
+from dataclasses import dataclass
+
+from eth_account import Account
+from web3 import Web3
+
+from basileus.chain.codec import ALEPH_CODEC, MULTICALL3_CODEC, USDC_CODEC
+from basileus.chain.constants import (
+    ALEPH_ADDRESS,
+    ALEPH_DECIMALS,
+    MIN_ETH_RESERVE,
+    TARGET_ALEPH_TOKENS,
+    UNISWAP_FEE_ALEPH,
+    UNISWAP_FEE_USDC,
+    USDC_ADDRESS,
+    USDC_DECIMALS,
+)
+from basileus.chain.multicall import Read, aggregate_call, multicall
+from basileus.chain.swap import swap_call
+from basileus.chain.tx import ContractCall, send_transaction
+
+
+@dataclass
+class Balances:
+    """ETH, ALEPH and USDC balances of one address. None when a read failed."""
+
+    address: str
+    eth: float | None
+    aleph: float | None
+    usdc: float | None
+
+    @property
+    def known(self) -> bool:
+        """All three balances were read."""
+        return None not in (self.eth, self.aleph, self.usdc)
+
+    @property
+    def swapped(self) -> bool:
+        """Holds ETH, ALEPH and USDC: deploy skips funding and swaps."""
+        return bool(self.eth and self.aleph and self.usdc)
+
+
+def read_balances(w3: Web3, addresses: list[str]) -> list[Balances]:
+    """Read ETH, ALEPH and USDC balances of all addresses in one batch."""
+    reads: list[Read] = []
+    for address in addresses:
+        reads += [
+            Read(MULTICALL3_CODEC, "getEthBalance", (address,)),
+            Read(ALEPH_CODEC, "balanceOf", (address,)),
+            Read(USDC_CODEC, "balanceOf", (address,)),
+        ]
+    values = multicall(w3, reads)
+    balances = []
+    for i, address in enumerate(addresses):
+        eth, aleph, usdc = values[i * 3 : i * 3 + 3]
+        balances.append(
+            Balances(
+                address=address,
+                eth=None if eth is None else eth / 10**18,
+                aleph=None if aleph is None else aleph / 10**ALEPH_DECIMALS,
+                usdc=None if usdc is None else usdc / 10**USDC_DECIMALS,
+            )
+        )
+    return balances
+
+
+@dataclass
+class Funding:
+    """What one agent receives: plain ETH plus ETH swapped on its behalf."""
+
+    address: str
+    eth: float = 0.0
+    aleph_eth: float = 0.0  # swapped to ALEPH, tokens sent to the agent
+    usdc_eth: float = 0.0  # swapped to USDC, tokens sent to the agent
+
+    @property
+    def total_eth(self) -> float:
+        return self.eth + self.aleph_eth + self.usdc_eth
+
+    def calls(self) -> list[ContractCall]:
+        calls = []
+        if self.eth > 0:
+            calls.append(
+                ContractCall(
+                    to=self.address,
+                    data=b"",
+                    value=Web3.to_wei(self.eth, "ether"),
+                    with_builder_code=False,
+                )
+            )
+        if self.aleph_eth > 0:
+            calls.append(
+                swap_call(
+                    self.address, ALEPH_ADDRESS, UNISWAP_FEE_ALEPH, self.aleph_eth
+                )
+            )
+        if self.usdc_eth > 0:
+            calls.append(
+                swap_call(self.address, USDC_ADDRESS, UNISWAP_FEE_USDC, self.usdc_eth)
+            )
+        return calls
+
+
+def plan_funding(
+    balances: list[Balances],
+    eth_amount: float,
+    swap: bool = False,
+    aleph_eth: float = 0.0,
+) -> list[Funding]:
+    """Work out what each agent needs. Agents needing nothing are left out.
+
+    Without swap, agents are topped up to eth_amount ETH. With swap,
+    eth_amount is split like `basileus deploy` does: aleph_eth buys ALEPH
+    (skipped if the agent already has TARGET_ALEPH_TOKENS), MIN_ETH_RESERVE
+    stays as ETH for gas and the rest buys USDC. Agents already holding all
+    three are skipped, and so are agents whose balances could not all be
+    read (see Balances.known): funding them blind could send a full top-up
+    to an agent that is already funded.
+    """
+    plans = []
+    for b in balances:
+        if not b.known:
+            continue
+        assert b.eth is not None and b.aleph is not None
+        if not swap:
+            missing = round(eth_amount - b.eth, 6)
+            if missing > 0:
+                plans.append(Funding(b.address, eth=missing))
+            continue
+        if b.swapped:
+            continue
+        needs_aleph = b.aleph < TARGET_ALEPH_TOKENS
+        plan = Funding(b.address, eth=MIN_ETH_RESERVE)
+        plan.aleph_eth = aleph_eth if needs_aleph else 0.0
+        plan.usdc_eth = round(eth_amount - plan.eth - plan.aleph_eth, 6)
+        if plan.usdc_eth <= 0:
+            raise ValueError(
+                f"{eth_amount} ETH per agent does not cover the ALEPH swap "
+                f"({aleph_eth} ETH) and the gas reserve ({MIN_ETH_RESERVE} ETH)"
+            )
+        plans.append(plan)
+    return plans
+
+
+def fund_agents(w3: Web3, private_key: str, plans: list[Funding]) -> str:
+    """Send every transfer and swap of plans in one transaction. Returns tx hash."""
+    calls = [call for plan in plans for call in plan.calls()]
+    treasury = Account.from_key(private_key).address
+    total = sum(c.value for c in calls)
+    available = w3.eth.get_balance(treasury)
+    if available < total:
+        raise ValueError(
+            f"Treasury {treasury} has {available / 10**18:.6f} ETH, "
+            f"funding needs {total / 10**18:.6f} ETH plus gas"
+        )
+    tx_hash, _receipt = send_transaction(
+        w3, private_key, aggregate_call(calls), label="Funding transaction"
+    )
+    return f"0x{tx_hash.hex()}"
@@ -0,0 +1,355 @@
+"""Local SQLite index of ERC-8004 `Registered` / `Transfer` and L2Registrar
+`NameRegistered` logs.
+
+Logs are fetched with chunked eth_getLogs and each chunk is committed with
+the next block to fetch, so a sync resumes where the last one stopped. Only
+blocks REORG_MARGIN behind the head are indexed. The index answers agentId,
+owner and label questions for any number of agents without one RPC each;
+it can lag the chain, so writes still check on-chain.
+
+Agent owners follow ERC-8004 `Transfer`s. Name owners are the registrants:
+L2Registry transfers are not indexed.
+
+NameRegistered indexes the label as its keccak hash: labels are recovered
+with one reverseNames Multicall3 batch over the new owners. reverseNames
+only holds an owner's latest label, so each name is looked up once and
+earlier names of a multi-name owner stay unlabelled.
+"""
+
+import sqlite3
+from collections.abc import Callable
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from basileus.chain.codec import (
+    ERC8004_REGISTRY_CODEC,
+    L2_REGISTRAR_CODEC,
+    ContractCodec,
+)
+from basileus.chain.constants import L2_REGISTRAR_DEPLOY_BLOCK
+from basileus.chain.multicall import Read, multicall
+from basileus.chain.rpc import RateLimited
+from basileus.infra.cache import cache_dir
+
+INDEX_FILE = "index.sqlite3"
+INDEX_VERSION = 1  # bump when the schema or the indexed events change: rebuilds it
+LOG_CHUNK_BLOCKS = 10_000  # eth_getLogs range, halved when a provider refuses it
+MIN_LOG_CHUNK_BLOCKS = 100
+GROW_CHUNK_AFTER = 8  # chunks fetched in a row before a halved range is doubled
+REORG_MARGIN = 10  # blocks behind the head left unindexed
+# How nodes without historical state (non-archive) refuse an old eth_getCode
+MISSING_STATE_ERRORS = (
+    "missing trie node",
+    "header not found",
+    "historical state",
+    "state not available",
+    "state is not available",
+    "pruned",
+)
+# How providers refuse an eth_getLogs range or result set over their cap
+LOG_RANGE_ERRORS = (
+    "block range",
+    "range too large",
+    "range is too large",
+    "too many blocks",
+    "query returned more than",
+    "response size",
+    "too many results",
+    "max results",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    agent_id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    agent_uri TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS agents_owner ON agents (owner);
+CREATE TABLE IF NOT EXISTS names (
+    label_hash TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    label TEXT,
+    block INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS names_owner ON names (owner);
+CREATE TABLE IF NOT EXISTS label_lookups (
+    label_hash TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS sync (
+    contract TEXT PRIMARY KEY,
+    next_block INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class IndexedAgent:
+    """What the index knows about one address."""
+
+    address: str
+    agent_ids: list[int]
+    labels: list[str]
+
+
+def index_path() -> Path:
+    return cache_dir() / INDEX_FILE
+
+
+def open_index(path: Path | None = None) -> sqlite3.Connection:
+    """Open (creating if needed) the index database.
+
+    An index built by another INDEX_VERSION is dropped and rebuilt from scratch.
+    """
+    db = sqlite3.connect(path or index_path())
+    if db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        tables = [
+            row[0]
+            for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        ]
+        with db:
+            for table in tables:
+                db.execute(f'DROP TABLE "{table}"')
+            db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+    db.executescript(_SCHEMA)
+    return db
+
+
+def find_deploy_block(w3: Web3, address: str, head: int) -> int:
+    """First block where address has code, by binary search over eth_getCode."""
+    lo, hi = 0, head
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if w3.eth.get_code(Web3.to_checksum_address(address), mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def _start_block(w3: Web3, codec: ContractCodec, head: int) -> int:
+    if codec is L2_REGISTRAR_CODEC:
+        return L2_REGISTRAR_DEPLOY_BLOCK
+    try:
+        return find_deploy_block(w3, codec.address, head)
+    except Web3RPCError as e:
+        if not any(m in str(e).lower() for m in MISSING_STATE_ERRORS):
+            raise
+        # Node without historical state: every Basileus agent registered
+        # after the registrar was deployed
+        return L2_REGISTRAR_DEPLOY_BLOCK
+
+
+def _get_logs(
+    w3: Web3,
+    codec: ContractCodec,
+    topics: list[bytes],
+    from_block: int,
+    to_block: int,
+) -> list[Any]:
+    """Logs of any of the event topics, in chain order."""
+    return list(
+        w3.eth.get_logs(
+            {
+                "address": codec.address,
+                "topics": [[HexBytes(topic) for topic in topics]],
+                "fromBlock": from_block,
+                "toBlock": to_block,
+            }
+        )
+    )
+
+
+def _store_agents(db: sqlite3.Connection, logs: list[Any]) -> None:
+    """Registrations and transfers, applied in order so the last owner wins."""
+    registered = ERC8004_REGISTRY_CODEC.events["Registered"]
+    transfer = ERC8004_REGISTRY_CODEC.events["Transfer"]
+    for log in logs:
+        if registered.matches(log):
+            args = registered.decode_log(log)
+            db.execute(
+                "INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?)",
+                (
+                    args["agentId"],
+                    Web3.to_checksum_address(args["owner"]),
+                    args["agentURI"],
+                    log["blockNumber"],
+                    f"0x{bytes(log['transactionHash']).hex()}",
+                ),
+            )
+        elif transfer.matches(log):
+            # The mint's Transfer comes before Registered and matches no row
+            args = transfer.decode_log(log)
+            db.execute(
+                "UPDATE agents SET owner = ? WHERE agent_id = ?",
+                (Web3.to_checksum_address(args["to"]), args["tokenId"]),
+            )
+
+
+def _store_names(db: sqlite3.Connection, logs: list[Any]) -> None:
+    name_registered = L2_REGISTRAR_CODEC.events["NameRegistered"]
+    db.executemany(
+        "INSERT OR IGNORE INTO names (label_hash, owner, block, tx_hash) "
+        "VALUES (?, ?, ?, ?)",
+        [
+            (
+                args["label"].hex(),
+                Web3.to_checksum_address(args["owner"]),
+                log["blockNumber"],
+                f"0x{bytes(log['transactionHash']).hex()}",
+            )
+            for log in logs
+            for args in [name_registered.decode_log(log)]
+        ],
+    )
+
+
+_SOURCES: list[
+    tuple[ContractCodec, list[str], Callable[[sqlite3.Connection, list], None]]
+] = [
+    (ERC8004_REGISTRY_CODEC, ["Registered", "Transfer"], _store_agents),
+    (L2_REGISTRAR_CODEC, ["NameRegistered"], _store_names),
+]
+
+
+def _is_range_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(m in message for m in LOG_RANGE_ERRORS)
+
+
+def _sync_source(
+    w3: Web3,
+    db: sqlite3.Connection,
+    codec: ContractCodec,
+    events: list[str],
+    store: Callable[[sqlite3.Connection, list], None],
+    head: int,
+) -> int:
+    """Index events of one contract up to head. Returns logs indexed."""
+    row = db.execute(
+        "SELECT next_block FROM sync WHERE contract = ?", (codec.address,)
+    ).fetchone()
+    start = row[0] if row else _start_block(w3, codec, head)
+    topics = [codec.events[event].topic for event in events]
+    chunk = LOG_CHUNK_BLOCKS
+    streak = 0  # chunks fetched since the range was last halved or doubled
+    indexed = 0
+    while start <= head:
+        end = min(start + chunk - 1, head)
+        try:
+            logs = _get_logs(w3, codec, topics, start, end)
+        except (Web3RPCError, RateLimited) as e:
+            # Range or result size over the provider's cap (Infura's shares
+            # the rate limit code, so it can come as RateLimited)
+            if chunk <= MIN_LOG_CHUNK_BLOCKS or not _is_range_error(e):
+                raise
+            chunk //= 2
+            streak = 0
+            continue
+        with db:
+            store(db, logs)
+            db.execute(
+                "INSERT OR REPLACE INTO sync VALUES (?, ?)", (codec.address, end + 1)
+            )
+        indexed += len(logs)
+        start = end + 1
+        # A refused range may have been one busy stretch: grow back past it,
+        # but not so eagerly that a provider's fixed cap refuses every other call
+        streak += 1
+        if streak >= GROW_CHUNK_AFTER and chunk < LOG_CHUNK_BLOCKS:
+            chunk = min(chunk * 2, LOG_CHUNK_BLOCKS)
+            streak = 0
+    return indexed
+
+
+def _resolve_labels(w3: Web3, db: sqlite3.Connection) -> None:
+    """Fill in labels of names not looked up yet from reverseNames(owner)."""
+    owners = [
+        row[0]
+        for row in db.execute(
+            "SELECT DISTINCT owner FROM names WHERE label IS NULL "
+            "AND label_hash NOT IN (SELECT label_hash FROM label_lookups)"
+        )
+    ]
+    if not owners:
+        return
+    labels = multicall(
+        w3, [Read(L2_REGISTRAR_CODEC, "reverseNames", (owner,)) for owner in owners]
+    )
+    with db:
+        for owner, label in zip(owners, labels):
+            if label is None:
+                continue  # read failed: try again next sync
+            if label:
+                db.execute(
+                    "UPDATE names SET label = ? WHERE label_hash = ?",
+                    (label, Web3.keccak(text=label).hex().removeprefix("0x")),
+                )
+            db.execute(
+                "INSERT OR IGNORE INTO label_lookups "
+                "SELECT label_hash FROM names WHERE owner = ?",
+                (owner,),
+            )
+
+
+def sync_index(w3: Web3, db: sqlite3.Connection) -> int:
+    """Bring the index up to REORG_MARGIN blocks behind the head.
+
+    Returns the number of new logs indexed.
+    """
+    head = w3.eth.block_number - REORG_MARGIN
+    indexed = sum(
+        _sync_source(w3, db, codec, events, store, head)
+        for codec, events, store in _SOURCES
+    )
+    _resolve_labels(w3, db)
+    return indexed
+
+
+def lookup_agents(db: sqlite3.Connection, addresses: list[str]) -> list[IndexedAgent]:
+    """Indexed agentIds and ENS labels of each address."""
+    agents = []
+    for address in addresses:
+        owner = Web3.to_checksum_address(address)
+        ids = db.execute(
+            "SELECT agent_id FROM agents WHERE owner = ? ORDER BY agent_id", (owner,)
+        )
+        labels = db.execute(
+            "SELECT label FROM names WHERE owner = ? AND label IS NOT NULL "
+            "ORDER BY block",
+            (owner,),
+        )
+        agents.append(
+            IndexedAgent(
+                address=owner,
+                agent_ids=[row[0] for row in ids],
+                labels=[row[0] for row in labels],
+            )
+        )
+    return agents
+
+
+def label_owners(db: sqlite3.Connection, labels: list[str]) -> dict[str, str | None]:
+    """Registrant of each label per the index, None if not registered (as of the sync)."""
+    owners: dict[str, str | None] = {}
+    for label in labels:
+        label_hash = Web3.keccak(text=label).hex().removeprefix("0x")
+        row = db.execute(
+            "SELECT owner FROM names WHERE label_hash = ?", (label_hash,)
+        ).fetchone()
+        owners[label] = row[0] if row else None
+    return owners
+
+
+def with_index(fn: Callable[[sqlite3.Connection], Any]) -> Any:
+    """Run fn on the opened index, closing it afterwards."""
+    with closing(open_index()) as db:
+        return fn(db)
@@ -0,0 +1,60 @@
+"""Batched calls through Multicall3: view reads (aggregate3) and value-carrying txs."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from web3 import Web3
+
+from basileus.chain.codec import MULTICALL3_CODEC, ContractCodec
+from basileus.chain.tx import ContractCall
+
+# Calls per aggregate3 eth_call, keeps requests under provider size/gas caps
+MULTICALL_CHUNK_SIZE = 500
+
+
+@dataclass
+class Read:
+    """One view call to batch: codec.fn_name(*args)."""
+
+    codec: ContractCodec
+    fn_name: str
+    args: tuple = ()
+
+
+def multicall(w3: Web3, reads: list[Read]) -> list[Any | None]:
+    """Run view calls in as few eth_calls as possible.
+
+    Returns decoded results in the same order. A call that reverts or whose
+    result cannot be decoded yields None instead of failing the whole batch.
+    """
+    results: list[Any | None] = []
+    for start in range(0, len(reads), MULTICALL_CHUNK_SIZE):
+        chunk = reads[start : start + MULTICALL_CHUNK_SIZE]
+        calls = [
+            (r.codec.address, True, r.codec.encode(r.fn_name, *r.args)) for r in chunk
+        ]
+        outcomes = MULTICALL3_CODEC.call(w3, "aggregate3", calls)
+        for read, (success, data) in zip(chunk, outcomes):
+            if not success:
+                results.append(None)
+                continue
+            try:
+                results.append(read.codec.functions[read.fn_name].decode(data))
+            except Exception:
+                results.append(None)
+    return results
+
+
+def aggregate_call(calls: list[ContractCall]) -> ContractCall:
+    """Bundle calls into one Multicall3 aggregate3Value tx.
+
+    The tx value is the sum of the call values. No call may fail, so the batch
+    applies atomically. Calls are made by Multicall3: ETH transfers and
+    swaps must name their recipient explicitly.
+    """
+    entries = [(c.to, False, c.value, c.data) for c in calls]
+    return ContractCall(
+        to=MULTICALL3_CODEC.address,
+        data=MULTICALL3_CODEC.encode("aggregate3Value", entries),
+        value=sum(c.value for c in calls),
+    )
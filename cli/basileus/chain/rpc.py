@@ -0,0 +1,376 @@
+"""Base JSON-RPC over several endpoints: failover, hedged reads, health stats.
+
+Endpoints come from $BASILEUS_RPC_URLS (comma-separated `url` or `url=weight`),
+else BASE_RPC_URLS. Each request goes to the healthiest endpoint: lowest
+median latency divided by weight, skipping endpoints cooling down after
+errors. A transport error, HTTP error or rate limit fails over to the next
+one. Reads are hedged: if the first endpoint has not answered within its own
+p95 latency, the next one is raced and the first answer wins. Writes are sent
+to one endpoint at a time and never raced. Reads that must see a write
+(the pending nonce right after it, the receipt of a hash just sent) go to
+the endpoint that accepted it, since the others may lag behind.
+
+Plain node reads (balances, nonces, receipts, ...) issued concurrently from
+several threads within BATCH_WINDOW are coalesced into one JSON-RPC batch
+array and the responses fanned back out to the callers.
+"""
+
+import os
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, TypeVar
+
+import requests
+from web3 import Web3
+from web3.providers import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from basileus.chain.constants import BASE_RPC_URLS
+
+RPC_URLS_ENV = "BASILEUS_RPC_URLS"
+REQUEST_TIMEOUT = 15  # seconds
+LATENCY_WINDOW = 50  # samples kept per endpoint
+MIN_HEDGE_SAMPLES = 10
+DEFAULT_HEDGE_DELAY = 0.5  # seconds, until an endpoint has enough samples
+MAX_COOLDOWN = 60  # seconds
+PIN_SECONDS = 120  # pending-nonce reads go to the last write's endpoint
+MAX_PINNED_TXS = 256  # sent tx hashes whose receipts stay pinned
+BATCH_WINDOW = 0.005  # seconds a batchable read waits for others to join it
+MAX_BATCH_SIZE = 100  # requests per JSON-RPC batch, under provider caps
+
+# JSON-RPC error codes providers use for rate limiting
+RATE_LIMIT_CODES = frozenset({-32005, -32016, 429})
+# Sent to one endpoint at a time; retried elsewhere only if it was not sent
+WRITE_METHODS = frozenset(
+    {"eth_sendRawTransaction", "eth_sendRawTransactionSync", "eth_sendTransaction"}
+)
+# Reads that cannot go through Multicall3, coalesced into JSON-RPC batches
+BATCH_METHODS = frozenset(
+    {
+        "eth_blockNumber",
+        "eth_chainId",
+        "eth_estimateGas",
+        "eth_feeHistory",
+        "eth_gasPrice",
+        "eth_getBalance",
+        "eth_getCode",
+        "eth_getTransactionCount",
+        "eth_getTransactionReceipt",
+        "eth_maxPriorityFeePerGas",
+    }
+)
+
+T = TypeVar("T")
+
+
+class RateLimited(OSError):
+    """An endpoint answered with a rate limit error."""
+
+
+class BatchRejected(RuntimeError):
+    """An endpoint does not accept JSON-RPC batches (or this one)."""
+
+
+class Endpoint:
+    """One RPC endpoint and its recent latency and error history."""
+
+    def __init__(self, url: str, weight: float = 1.0) -> None:
+        self.url = url
+        self.weight = weight
+        self.provider = Web3.HTTPProvider(
+            url,
+            request_kwargs={"timeout": REQUEST_TIMEOUT},
+            exception_retry_configuration=None,
+        )
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.errors = 0  # consecutive
+        self.cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def median_latency(self) -> float | None:
+        with self._lock:
+            return statistics.median(self.latencies) if self.latencies else None
+
+    def hedge_delay(self) -> float:
+        """p95 latency, or DEFAULT_HEDGE_DELAY until enough samples are in."""
+        with self._lock:
+            if len(self.latencies) < MIN_HEDGE_SAMPLES:
+                return DEFAULT_HEDGE_DELAY
+            return statistics.quantiles(self.latencies, n=20)[-1]
+
+    def score(self) -> float:
+        """Lower is better."""
+        latency = self.median_latency
+        return (DEFAULT_HEDGE_DELAY if latency is None else latency) / self.weight
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self.errors = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.errors += 1
+            backoff = min(MAX_COOLDOWN, 2 ** (self.errors - 1))
+            self.cooldown_until = time.monotonic() + backoff
+
+
+def parse_rpc_urls(spec: str) -> list[tuple[str, float]]:
+    """Parse `url[=weight],...`. A url without weight gets 1."""
+    endpoints = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        url, sep, weight = item.rpartition("=")
+        try:
+            if not sep or float(weight) <= 0:
+                raise ValueError
+            endpoints.append((url, float(weight)))
+        except ValueError:
+            endpoints.append((item, 1.0))
+    if not endpoints:
+        raise ValueError(f"No RPC endpoint in {RPC_URLS_ENV}={spec!r}")
+    return endpoints
+
+
+class FailoverProvider(JSONBaseProvider):
+    """web3 provider spreading requests over several HTTP endpoints."""
+
+    def __init__(self, endpoints: list[tuple[str, float]]) -> None:
+        super().__init__()
+        self.endpoints = [Endpoint(url, weight) for url, weight in endpoints]
+        self._coalescer = _Coalescer(self)
+        self._pin_lock = threading.Lock()
+        self._last_write: tuple[Endpoint, float] | None = None
+        self._sent: OrderedDict[str, Endpoint] = OrderedDict()
+
+    def ranked(self) -> list[Endpoint]:
+        """Endpoints from healthiest to least healthy."""
+        return sorted(self.endpoints, key=lambda e: (not e.healthy, e.score()))
+
+    def _timed(self, endpoint: Endpoint, call: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        try:
+            result = call()
+        except (OSError, ValueError):
+            endpoint.record_failure()
+            raise
+        endpoint.record_success(time.perf_counter() - start)
+        return result
+
+    def _request(self, endpoint: Endpoint, method: RPCEndpoint, params: Any) -> Any:
+        response = self._timed(
+            endpoint, lambda: endpoint.provider.make_request(method, params)
+        )
+        _check_rate_limit(endpoint, response)
+        return response
+
+    def _request_batch(
+        self, endpoint: Endpoint, calls: list[tuple[RPCEndpoint, Any]]
+    ) -> list[RPCResponse]:
+        responses = self._timed(
+            endpoint, lambda: endpoint.provider.make_batch_request(calls)
+        )
+        if not isinstance(responses, list):
+            # One error object for the whole batch
+            _check_rate_limit(endpoint, responses)
+            raise BatchRejected(f"{endpoint.url}: {responses.get('error')}")
+        if len(responses) != len(calls):
+            raise BatchRejected(f"{endpoint.url}: incomplete batch response")
+        for response in responses:
+            _check_rate_limit(endpoint, response)
+        return responses
+
+    def _record_write(self, endpoint: Endpoint, response: RPCResponse) -> None:
+        result = response.get("result")
+        if isinstance(result, dict):  # eth_sendRawTransactionSync: a receipt
+            result = result.get("transactionHash")
+        with self._pin_lock:
+            self._last_write = (endpoint, time.monotonic())
+            if result:
+                self._sent[_hash_key(result)] = endpoint
+                while len(self._sent) > MAX_PINNED_TXS:
+                    self._sent.popitem(last=False)
+
+    def _pinned(self, method: RPCEndpoint, params: Any) -> Endpoint | None:
+        """Endpoint that accepted the write this read depends on, if any."""
+        endpoint = None
+        with self._pin_lock:
+            if method == "eth_getTransactionReceipt" and params:
+                endpoint = self._sent.get(_hash_key(params[0]))
+            elif (
+                method == "eth_getTransactionCount"
+                and len(params) > 1
+                and params[1] == "pending"
+                and self._last_write is not None
+                and time.monotonic() - self._last_write[1] < PIN_SECONDS
+            ):
+                endpoint = self._last_write[0]
+        return endpoint if endpoint is not None and endpoint.healthy else None
+
+    def _send(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        last_error: Exception | None = None
+        for endpoint in self.ranked():
+            try:
+                response = self._request(endpoint, method, params)
+                if "error" not in response:
+                    self._record_write(endpoint, response)
+                return response
+            except requests.Timeout:
+                raise  # may have been broadcast: do not send it twice
+            except (OSError, ValueError) as e:
+                last_error = e
+        assert last_error is not None
+        raise last_error
+
+    def _hedged(self, call: Callable[[Endpoint], T]) -> T:
+        pending = self.ranked()
+        in_flight: dict[Future, Endpoint] = {}
+        last_error: Exception | None = None
+
+        def launch() -> None:
+            endpoint = pending.pop(0)
+            in_flight[_in_daemon_thread(lambda: call(endpoint))] = endpoint
+
+        launch()
+        while in_flight:
+            # Race one more endpoint if the only one in flight is past its p95
+            timeout = None
+            if pending and len(in_flight) == 1:
+                timeout = next(iter(in_flight.values())).hedge_delay()
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                launch()
+                continue
+            for future in done:
+                del in_flight[future]
+                try:
+                    return future.result()
+                except (OSError, ValueError) as e:
+                    last_error = e
+                    if pending:
+                        launch()  # fail over right away
+        assert last_error is not None
+        raise last_error
+
+    def _read(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return self._hedged(lambda e: self._request(e, method, params))
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method in WRITE_METHODS:
+            return self._send(method, params)
+        endpoint = self._pinned(method, params)
+        if endpoint is not None:
+            try:
+                return self._request(endpoint, method, params)
+            except (OSError, ValueError):
+                pass  # fall back to the other endpoints
+        if method in BATCH_METHODS:
+            return self._coalescer.request(method, params)
+        return self._read(method, params)
+
+    def make_batch_request(
+        self, calls: list[tuple[RPCEndpoint, Any]]
+    ) -> list[RPCResponse]:
+        try:
+            return self._hedged(lambda e: self._request_batch(e, calls))
+        except BatchRejected:
+            # Not through make_request: these would be coalesced again
+            return [self._read(method, params) for method, params in calls]
+
+
+class _Coalescer:
+    """Collects concurrent reads for BATCH_WINDOW and sends them as one batch.
+
+    The first caller of a window waits for the others, sends the batch and
+    hands every caller its own response.
+    """
+
+    def __init__(self, provider: FailoverProvider) -> None:
+        self._provider = provider
+        self._lock = threading.Lock()
+        self._queue: list[tuple[RPCEndpoint, Any, Future]] = []
+
+    def request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        future: Future = Future()
+        with self._lock:
+            self._queue.append((method, params, future))
+            leader = len(self._queue) == 1
+        if leader:
+            time.sleep(BATCH_WINDOW)
+            with self._lock:
+                batch, self._queue = self._queue, []
+            for start in range(0, len(batch), MAX_BATCH_SIZE):
+                self._flush(batch[start : start + MAX_BATCH_SIZE])
+        return future.result()
+
+    def _flush(self, batch: list[tuple[RPCEndpoint, Any, Future]]) -> None:
+        try:
+            if len(batch) == 1:
+                method, params, _ = batch[0]
+                responses = [self._provider._read(method, params)]
+            else:
+                calls = [(method, params) for method, params, _ in batch]
+                responses = self._provider.make_batch_request(calls)
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, _, future), response in zip(batch, responses):
+            future.set_result(response)
+
+
+def _in_daemon_thread(fn: Callable[[], T]) -> Future:
+    """Run fn on a daemon thread, so a losing hedged request never delays exit."""
+    future: Future = Future()
+
+    def run() -> None:
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="rpc-hedge", daemon=True).start()
+    return future
+
+
+def _hash_key(value: Any) -> str:
+    """Tx hash as lowercase 0x-hex, whether given as hex string or bytes."""
+    if isinstance(value, bytes):
+        return f"0x{value.hex()}"
+    return str(value).lower()
+
+
+def _check_rate_limit(endpoint: Endpoint, response: RPCResponse) -> None:
+    error = response.get("error")
+    if isinstance(error, dict) and error.get("code") in RATE_LIMIT_CODES:
+        endpoint.record_failure()
+        raise RateLimited(f"{endpoint.url}: {error.get('message')}")
+
+
+_lock = threading.Lock()
+_w3: Web3 | None = None
+
+
+def rpc_endpoints() -> list[tuple[str, float]]:
+    spec = os.environ.get(RPC_URLS_ENV)
+    return parse_rpc_urls(spec) if spec else list(BASE_RPC_URLS)
+
+
+def get_web3() -> Web3:
+    """Process-wide Web3 on the failover provider, so endpoint stats accumulate."""
+    global _w3
+    with _lock:
+        if _w3 is None:
+            _w3 = Web3(FailoverProvider(rpc_endpoints()))
+        return _w3
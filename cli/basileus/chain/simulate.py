@@ -0,0 +1,88 @@
+"""Pre-flight simulation of deploy transactions via eth_simulateV1."""
+
+from dataclasses import dataclass
+
+import eth_abi
+from eth_abi.exceptions import DecodingError
+from web3 import Web3
+from web3.types import RPCEndpoint
+
+from basileus.chain.tx import ContractCall
+
+_ERROR_STRING_SELECTOR = bytes.fromhex("08c379a0")  # Error(string)
+
+
+@dataclass
+class SimulatedCall:
+    """Outcome of one call in a simulated deploy."""
+
+    label: str
+    success: bool
+    gas_used: int
+    error: str | None = None
+
+
+def _revert_reason(error: dict | None) -> str:
+    """Extract a readable revert reason from an eth_simulateV1 call error."""
+    if not error:
+        return "execution reverted"
+    message = error.get("message") or "execution reverted"
+    data = error.get("data")
+    if isinstance(data, str) and data.startswith("0x"):
+        try:
+            raw = bytes.fromhex(data[2:])
+            if raw[:4] == _ERROR_STRING_SELECTOR:
+                (reason,) = eth_abi.decode(["string"], raw[4:])
+                return f"{message}: {reason}"
+        except (DecodingError, ValueError):
+            pass  # malformed revert data: keep the node's message
+    return message
+
+
+def simulate_calls(
+    w3: Web3,
+    sender: str,
+    calls: list[tuple[str, ContractCall]],
+    balance_override: int | None = None,
+) -> list[SimulatedCall]:
+    """Simulate labelled calls from sender in order, in a single RPC request.
+
+    Calls run sequentially on top of the latest block, so later calls see the
+    state written by earlier ones (e.g. setContenthash after ENS register).
+    balance_override (wei) stands in for the ETH the wallet is expected to hold.
+    Nothing is signed or broadcast.
+    """
+    sender = Web3.to_checksum_address(sender)
+    block: dict = {
+        "calls": [
+            {
+                "from": sender,
+                "to": Web3.to_checksum_address(call.to),
+                "data": f"0x{call.calldata.hex()}",
+                "value": hex(call.value),
+            }
+            for _label, call in calls
+        ]
+    }
+    if balance_override is not None:
+        block["stateOverrides"] = {sender: {"balance": hex(balance_override)}}
+
+    result = w3.manager.request_blocking(
+        RPCEndpoint("eth_simulateV1"),
+        [{"blockStateCalls": [block], "validation": False}, "latest"],
+    )
+
+    outcomes = result[0]["calls"]
+    return [
+        SimulatedCall(
+            label=label,
+            success=int(outcome["status"], 16) == 1,
+            gas_used=int(outcome["gasUsed"], 16),
+            error=(
+                None
+                if int(outcome["status"], 16) == 1
+                else _revert_reason(outcome.get("error"))
+            ),
+        )
+        for (label, _call), outcome in zip(calls, outcomes)
+    ]
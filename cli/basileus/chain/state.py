@@ -0,0 +1,91 @@
+"""On-chain state of many agents, read in one Multicall3 batch."""
+
+from dataclasses import dataclass
+
+from web3 import Web3
+
+from basileus.chain.codec import (
+    ALEPH_CODEC,
+    ERC8004_REGISTRY_CODEC,
+    L2_REGISTRAR_CODEC,
+    MULTICALL3_CODEC,
+    SUPERFLUID_CFA_CODEC,
+    USDC_CODEC,
+)
+from basileus.chain.constants import ALEPH_ADDRESS, ALEPH_DECIMALS, USDC_DECIMALS
+from basileus.chain.multicall import Read, multicall
+
+_READS_PER_AGENT = 8
+
+
+@dataclass
+class ChainState:
+    """Balances, ENS/ERC-8004 registration and Superfluid flows of one agent.
+
+    Fields are None when the corresponding read failed. Flow rates are in
+    ALEPH wei per second; net_flow is negative for an agent paying streams.
+    """
+
+    address: str
+    eth: float | None
+    aleph: float | None
+    usdc: float | None
+    label: str | None
+    erc8004_registered: bool | None
+    operator_flow: int | None
+    community_flow: int | None
+    net_flow: int | None
+
+    @property
+    def runway_seconds(self) -> float | None:
+        """Seconds until the ALEPH balance is drained by outgoing streams."""
+        if self.aleph is None or not self.net_flow or self.net_flow >= 0:
+            return None
+        return self.aleph * 10**ALEPH_DECIMALS / -self.net_flow
+
+
+def _agent_reads(address: str, operator: str, community: str) -> list[Read]:
+    return [
+        Read(MULTICALL3_CODEC, "getEthBalance", (address,)),
+        Read(ALEPH_CODEC, "balanceOf", (address,)),
+        Read(USDC_CODEC, "balanceOf", (address,)),
+        Read(L2_REGISTRAR_CODEC, "reverseNames", (address,)),
+        Read(ERC8004_REGISTRY_CODEC, "balanceOf", (address,)),
+        Read(SUPERFLUID_CFA_CODEC, "getFlow", (ALEPH_ADDRESS, address, operator)),
+        Read(SUPERFLUID_CFA_CODEC, "getFlow", (ALEPH_ADDRESS, address, community)),
+        Read(SUPERFLUID_CFA_CODEC, "getNetFlow", (ALEPH_ADDRESS, address)),
+    ]
+
+
+def _scaled(raw: int | None, decimals: int) -> float | None:
+    return None if raw is None else raw / (10**decimals)
+
+
+def read_chain_states(
+    w3: Web3, addresses: list[str], operator_receiver: str, community_receiver: str
+) -> list[ChainState]:
+    """Read balances, ENS label, ERC-8004 registration and flows for all addresses."""
+    reads: list[Read] = []
+    for address in addresses:
+        reads += _agent_reads(address, operator_receiver, community_receiver)
+    values = multicall(w3, reads)
+
+    states = []
+    for i, address in enumerate(addresses):
+        eth, aleph, usdc, label, nft_balance, op_flow, com_flow, net_flow = values[
+            i * _READS_PER_AGENT : (i + 1) * _READS_PER_AGENT
+        ]
+        states.append(
+            ChainState(
+                address=address,
+                eth=_scaled(eth, 18),
+                aleph=_scaled(aleph, ALEPH_DECIMALS),
+                usdc=_scaled(usdc, USDC_DECIMALS),
+                label=label or None,
+                erc8004_registered=None if nft_balance is None else nft_balance > 0,
+                operator_flow=None if op_flow is None else op_flow[1],
+                community_flow=None if com_flow is None else com_flow[1],
+                net_flow=net_flow,
+            )
+        )
+    return states
@@ -1,13 +1,14 @@
 import asyncio
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Any
 
 from aleph.sdk.chains.ethereum import ETHAccount
-from aleph.sdk.client.authenticated_http import AuthenticatedAlephHttpClient
 from aleph.sdk.evm_utils import FlowUpdate
 from aleph_message.models import InstanceMessage
 
 from basileus.infra.aleph import ALEPH_API_URL, COMMUNITY_RECEIVER, CRNInfo
+from basileus.infra.sessions import authenticated_aleph_client
 
 COMMUNITY_FLOW_PERCENTAGE = Decimal("0.2")
 
@@ -25,19 +26,17 @@ async def compute_flow_rates(
     instance_hash: str,
 ) -> FlowRates:
     """Compute required Superfluid flow rates from instance pricing."""
-    async with AuthenticatedAlephHttpClient(
-        account=account, api_server=ALEPH_API_URL
-    ) as client:
-        instance_msg = await client.get_message(instance_hash, with_status=False)
-        if not isinstance(instance_msg, InstanceMessage):
-            raise ValueError(f"{instance_hash} is not an instance")
-
-        estimated = await client.get_estimated_price(content=instance_msg.content)
-        total_flow = Decimal(estimated.required_tokens)
-        return FlowRates(
-            operator=total_flow * (1 - COMMUNITY_FLOW_PERCENTAGE),
-            community=total_flow * COMMUNITY_FLOW_PERCENTAGE,
-        )
+    client = await authenticated_aleph_client(account, ALEPH_API_URL)
+    instance_msg: Any = await client.get_message(instance_hash, with_status=False)
+    if not isinstance(instance_msg, InstanceMessage):
+        raise ValueError(f"{instance_hash} is not an instance")
+
+    estimated = await client.get_estimated_price(content=instance_msg.content)
+    total_flow = Decimal(estimated.required_tokens)
+    return FlowRates(
+        operator=total_flow * (1 - COMMUNITY_FLOW_PERCENTAGE),
+        community=total_flow * COMMUNITY_FLOW_PERCENTAGE,
+    )
 
 
 def _check_tx(account: ETHAccount, tx_hash: str | None, label: str) -> None:
@@ -46,9 +45,9 @@ def _check_tx(account: ETHAccount, tx_hash: str | None, label: str) -> None:
         raise ValueError(f"{label}: no tx hash returned")
     from hexbytes import HexBytes
 
-    receipt = account._provider.eth.wait_for_transaction_receipt(  # type: ignore[union-attr]
-        HexBytes(tx_hash), timeout=60
-    )
+    from basileus.chain.tx import wait_for_receipt
+
+    receipt = wait_for_receipt(account._provider, HexBytes(tx_hash))  # type: ignore[arg-type]
     if receipt["status"] != 1:
         raise ValueError(f"{label}: tx {tx_hash} reverted on-chain")
 
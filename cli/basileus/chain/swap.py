@@ -4,33 +4,58 @@ from web3 import Web3
 from basileus.chain.constants import (
     ALEPH_ADDRESS,
     ALEPH_DECIMALS,
-    BASE_CHAIN_ID,
-    ERC20_BALANCE_ABI,
     MIN_ETH_RESERVE,
+    SWAP_GAS_LIMIT,
     TARGET_ALEPH_TOKENS,
-    UNISWAP_ALEPH_POOL,
     UNISWAP_FEE_ALEPH,
     UNISWAP_FEE_USDC,
-    UNISWAP_POOL_ABI,
-    UNISWAP_ROUTER,
-    UNISWAP_ROUTER_ABI,
     USDC_ADDRESS,
+    USDC_DECIMALS,
     WETH_ADDRESS,
 )
+from basileus.chain.codec import (
+    ALEPH_CODEC,
+    ALEPH_POOL_CODEC,
+    ROUTER_CODEC,
+    USDC_CODEC,
+)
+from basileus.chain.tx import ContractCall, send_transaction
 
 
 def get_aleph_price(w3: Web3) -> float:
     """Read ALEPH/ETH price from Uniswap V3 pool. Returns aleph_per_eth."""
-    pool = w3.eth.contract(
-        address=Web3.to_checksum_address(UNISWAP_ALEPH_POOL),
-        abi=UNISWAP_POOL_ABI,
-    )
-    slot0 = pool.functions.slot0().call()
+    slot0 = ALEPH_POOL_CODEC.call(w3, "slot0")
     sqrt_price_x96 = slot0[0]
     price = sqrt_price_x96 / (2**96)
     return price * price
 
 
+def swap_call(
+    recipient: str, token_out: str, fee: int, eth_amount: float
+) -> ContractCall:
+    """Encode a Uniswap V3 exactInputSingle swap from ETH to token_out."""
+    amount_wei = Web3.to_wei(eth_amount, "ether")
+
+    data = ROUTER_CODEC.encode(
+        "exactInputSingle",
+        (
+            WETH_ADDRESS,  # tokenIn
+            token_out,  # tokenOut
+            fee,  # fee
+            recipient,  # recipient
+            amount_wei,  # amountIn
+            0,  # amountOutMinimum
+            0,  # sqrtPriceLimitX96
+        ),
+    )
+    return ContractCall(
+        to=ROUTER_CODEC.address,
+        data=data,
+        value=amount_wei,
+        with_builder_code=False,
+    )
+
+
 def _send_swap(
     w3: Web3,
     private_key: str,
@@ -39,42 +64,14 @@ def _send_swap(
     eth_amount: float,
 ) -> str:
     """Execute Uniswap V3 exactInputSingle swap from ETH. Returns tx hash."""
-    account = Account.from_key(private_key)
-    address = account.address
-    amount_wei = w3.to_wei(eth_amount, "ether")
-
-    router = w3.eth.contract(
-        address=Web3.to_checksum_address(UNISWAP_ROUTER),
-        abi=UNISWAP_ROUTER_ABI,
-    )
-
-    tx_data = router.functions.exactInputSingle(
-        (
-            Web3.to_checksum_address(WETH_ADDRESS),  # tokenIn
-            Web3.to_checksum_address(token_out),  # tokenOut
-            fee,  # fee
-            Web3.to_checksum_address(address),  # recipient
-            amount_wei,  # amountIn
-            0,  # amountOutMinimum
-            0,  # sqrtPriceLimitX96
-        )
-    ).build_transaction(
-        {  # type: ignore[arg-type]
-            "from": address,
-            "value": amount_wei,
-            "nonce": w3.eth.get_transaction_count(address),
-            "gas": 500_000,
-            "maxFeePerGas": w3.eth.gas_price * 2,
-            "maxPriorityFeePerGas": w3.to_wei(0.001, "gwei"),
-            "chainId": BASE_CHAIN_ID,
-        }
+    address = Account.from_key(private_key).address
+    tx_hash, _receipt = send_transaction(
+        w3,
+        private_key,
+        swap_call(address, token_out, fee, eth_amount),
+        gas=SWAP_GAS_LIMIT,
+        label="Swap transaction",
     )
-
-    signed = account.sign_transaction(tx_data)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-    if receipt["status"] != 1:
-        raise RuntimeError(f"Swap transaction reverted: 0x{tx_hash.hex()}")
     return tx_hash.hex()
 
 
@@ -90,23 +87,13 @@ def swap_eth_to_usdc(w3: Web3, private_key: str, eth_amount: float) -> str:
 
 def get_usdc_balance(w3: Web3, address: str) -> float:
     """Get USDC token balance for address. Returns human-readable float."""
-    from basileus.chain.constants import USDC_ADDRESS, USDC_DECIMALS
-
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(USDC_ADDRESS),
-        abi=ERC20_BALANCE_ABI,
-    )
-    raw = contract.functions.balanceOf(Web3.to_checksum_address(address)).call()
+    raw = USDC_CODEC.call(w3, "balanceOf", address)
     return raw / (10**USDC_DECIMALS)
 
 
 def get_aleph_balance(w3: Web3, address: str) -> float:
     """Get ALEPH token balance for address. Returns human-readable float."""
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(ALEPH_ADDRESS),
-        abi=ERC20_BALANCE_ABI,
-    )
-    raw = contract.functions.balanceOf(Web3.to_checksum_address(address)).call()
+    raw = ALEPH_CODEC.call(w3, "balanceOf", address)
     return raw / (10**ALEPH_DECIMALS)
 
 
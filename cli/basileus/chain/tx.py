@@ -0,0 +1,178 @@
+"""Shared transaction builder: fees, gas, builder code suffix, sign, send, confirm."""
+
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from eth_account import Account
+from eth_account.datastructures import SignedSetCodeAuthorization
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import MethodUnavailable, Web3RPCError
+from web3.types import RPCEndpoint, TxParams, TxReceipt
+
+from basileus.chain.builder_code import builder_code_suffix
+from basileus.chain.constants import BASE_CHAIN_ID, BASE_PRECONF_RPC_URL, BUILDER_CODE
+from basileus.chain.fees import estimate_gas, get_fee_params, suffix_gas
+
+RECEIPT_TIMEOUT = 60
+PRECONF_POLL_INTERVAL = 0.2
+METHOD_NOT_FOUND = -32601  # JSON-RPC error code
+
+
+class Confirmation(str, Enum):
+    receipt = "receipt"  # wait for the tx to be mined in a block
+    preconf = "preconf"  # accept a Base flashblock preconfirmation (~200ms)
+
+
+# Set once per command (see set_confirmation); asyncio.to_thread copies it
+_confirmation: ContextVar[Confirmation] = ContextVar(
+    "basileus_confirmation", default=Confirmation.receipt
+)
+
+_lock = threading.Lock()
+_preconf_w3: Web3 | None = None
+# Endpoints that answered eth_sendRawTransactionSync with method not found
+_sync_send_unsupported: set[str] = set()
+
+
+def set_confirmation(policy: Confirmation) -> None:
+    """Select how every tx sent by this command is confirmed."""
+    _confirmation.set(policy)
+
+
+def _preconf_web3() -> Web3:
+    global _preconf_w3
+    with _lock:
+        if _preconf_w3 is None:
+            _preconf_w3 = Web3(Web3.HTTPProvider(BASE_PRECONF_RPC_URL))
+        return _preconf_w3
+
+
+def _send_raw_sync(w3: Web3, raw_tx: bytes) -> TxReceipt | None:
+    """eth_sendRawTransactionSync: returns the receipt once the tx is preconfirmed.
+
+    Returns None if the endpoint does not support it (remembered per endpoint).
+    """
+    endpoint = str(getattr(w3.provider, "endpoint_uri", w3.provider))
+    with _lock:
+        if endpoint in _sync_send_unsupported:
+            return None
+    try:
+        receipt = w3.manager.request_blocking(
+            RPCEndpoint("eth_sendRawTransactionSync"), [f"0x{raw_tx.hex()}"]
+        )
+    except MethodUnavailable:
+        pass
+    except Web3RPCError as e:
+        error: Any = (e.rpc_response or {}).get("error")
+        if not (isinstance(error, dict) and error.get("code") == METHOD_NOT_FOUND):
+            raise
+    else:
+        # web3 has no formatters for this method: format it like eth_getTransactionReceipt
+        return AttributeDict.recursive(receipt_formatter(dict(receipt)))
+    with _lock:
+        _sync_send_unsupported.add(endpoint)
+    return None
+
+
+def wait_for_receipt(w3: Web3, tx_hash: HexBytes) -> TxReceipt:
+    """Wait for a tx receipt according to the confirmation policy.
+
+    With preconf, the flashblocks endpoint is polled and answers from pending
+    state; otherwise w3 is polled until the tx is mined.
+    """
+    if _confirmation.get() is Confirmation.preconf:
+        return _preconf_web3().eth.wait_for_transaction_receipt(
+            tx_hash, timeout=RECEIPT_TIMEOUT, poll_latency=PRECONF_POLL_INTERVAL
+        )
+    return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=RECEIPT_TIMEOUT)
+
+
+def send_raw_and_confirm(w3: Web3, raw_tx: bytes) -> tuple[HexBytes, TxReceipt]:
+    """Broadcast a signed tx and wait for it per the confirmation policy."""
+    tx_hash = HexBytes(Web3.keccak(raw_tx))
+    if _confirmation.get() is Confirmation.preconf:
+        receipt = _send_raw_sync(_preconf_web3(), raw_tx)
+        if receipt is not None:
+            return tx_hash, receipt
+    w3.eth.send_raw_transaction(raw_tx)
+    return tx_hash, wait_for_receipt(w3, tx_hash)
+
+
+@dataclass
+class ContractCall:
+    """Encoded contract call, ready to be sent or simulated."""
+
+    to: str
+    data: bytes
+    value: int = 0
+    with_builder_code: bool = True
+
+    @property
+    def calldata(self) -> bytes:
+        """Calldata as broadcast, including the ERC-8021 builder code suffix."""
+        if self.with_builder_code and BUILDER_CODE:
+            return self.data + builder_code_suffix(BUILDER_CODE)
+        return self.data
+
+
+def send_transaction(
+    w3: Web3,
+    private_key: str,
+    call: ContractCall,
+    gas: int | None = None,
+    label: str = "Transaction",
+    authorizations: Sequence[SignedSetCodeAuthorization] = (),
+) -> tuple[HexBytes, TxReceipt]:
+    """Build, sign and send a tx, then wait for its receipt.
+
+    Fees come from the shared fee oracle and gas from the memoized estimate
+    (unless given), so no extra fee/chainId RPC calls are made per tx.
+    With EIP-7702 authorizations, a type-4 tx is sent (gas must be given).
+    Returns (tx_hash, receipt). Raises if the tx reverted.
+    """
+    account = Account.from_key(private_key)
+
+    # Independent reads, issued together so the RPC layer sends one batch
+    with ThreadPoolExecutor(3) as pool:
+        fees_future = pool.submit(get_fee_params, w3)
+        nonce_future = pool.submit(
+            w3.eth.get_transaction_count, account.address, "pending"
+        )
+        if gas is None:
+            gas = estimate_gas(w3, account.address, call.to, call.data, call.value)
+        fees = fees_future.result()
+        nonce = nonce_future.result()
+    data = call.calldata
+    gas += suffix_gas(data[len(call.data) :])
+
+    tx: TxParams = {
+        "type": 2,
+        "chainId": BASE_CHAIN_ID,
+        "from": account.address,
+        "to": Web3.to_checksum_address(call.to),
+        "data": HexBytes(data),
+        "value": call.value,  # type: ignore[typeddict-item]
+        "nonce": nonce,
+        "gas": gas,
+        "maxFeePerGas": fees.max_fee_per_gas,  # type: ignore[typeddict-item]
+        "maxPriorityFeePerGas": fees.max_priority_fee_per_gas,  # type: ignore[typeddict-item]
+    }
+    if authorizations:
+        tx["type"] = 4
+        tx["authorizationList"] = list(authorizations)  # type: ignore[typeddict-item]
+
+    signed = account.sign_transaction(tx)  # type: ignore[arg-type]
+    tx_hash, receipt = send_raw_and_confirm(w3, signed.raw_transaction)
+
+    if receipt["status"] != 1:
+        raise RuntimeError(f"{label} reverted: 0x{tx_hash.hex()}")
+
+    return tx_hash, receipt
@@ -22,3 +22,14 @@ def load_existing_wallet(agent_dir: Path) -> tuple[str, str] | None:
             address = Account.from_key(pk).address
             return address, pk
     return None
+
+
+def load_wallet_addresses(agent_dirs: list[Path]) -> list[str]:
+    """Load the wallet address of each agent directory. Raises if one has no wallet."""
+    addresses = []
+    for agent_dir in agent_dirs:
+        existing = load_existing_wallet(agent_dir.resolve())
+        if not existing:
+            raise FileNotFoundError(f"No wallet found in {agent_dir}/.env.prod or .env")
+        addresses.append(existing[0])
+    return addresses
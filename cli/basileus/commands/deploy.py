@@ -1,5 +1,7 @@
 import asyncio
 import os
+import shutil
+import tempfile
 from pathlib import Path
 
 import typer
@@ -9,14 +11,19 @@ from rich.console import Console
 from rich.panel import Panel
 
 import paramiko
+from aleph.sdk.chains.ethereum import ETHAccount
 
+from basileus.commands.options import CONFIRMATION_OPTION
+from basileus.infra.build import AgentRuntime, build_agent
+from basileus.infra.bundle import CodeDelivery, Compression
+from basileus.infra.sizing import DEFAULT_INSTANCE_SIZE, instance_size
 from basileus.infra.ssh import (
-    configure_service,
-    deploy_code,
-    install_deps,
-    install_node,
+    fetch_bundle,
+    mark_code_delivered,
+    start_provisioning,
     upload_agent,
-    verify_service,
+    upload_secrets,
+    wait_for_provisioning,
     wait_for_ssh,
 )
 from basileus.infra.aleph import (
@@ -28,6 +35,9 @@ from basileus.infra.aleph import (
     get_aleph_account,
     get_user_ssh_pubkey,
     notify_allocation,
+    publish_agent_bundle,
+    publish_agent_volume,
+    stored_file_url,
     wait_for_instance,
 )
 from basileus.chain.superfluid import (
@@ -41,34 +51,295 @@ from basileus.chain.swap import (
     compute_usdc_swap_eth,
     get_aleph_balance,
     get_usdc_balance,
+    swap_call,
     swap_eth_to_aleph,
     swap_eth_to_usdc,
 )
 from basileus.chain.wallet import generate_wallet, load_existing_wallet
 from basileus.chain.constants import (
-    BASE_RPC_URL,
+    ALEPH_ADDRESS,
     BUILDER_CODE,
     FRONTEND_CONTENT_HASH,
     MIN_ETH_FUNDING,
     MIN_ETH_RESERVE,
     TARGET_ALEPH_TOKENS,
+    UNISWAP_FEE_ALEPH,
+    UNISWAP_FEE_USDC,
+    USDC_ADDRESS,
 )
+from basileus.chain.rpc import get_web3
 from basileus.chain.ens import (
+    MIN_LABEL_LENGTH,
+    SUGGESTION_COUNT,
     check_existing_subname,
-    check_label_available,
+    expand_label_candidates,
+    find_available_labels,
+    register_call,
     register_subname,
     set_content_hash,
+    set_content_hash_call,
+    suggest_labels,
 )
 from basileus.chain.erc8004 import (
     build_agent_metadata,
     check_existing_registration,
     register_agent,
+    register_agent_call,
+    registered_agent_id,
     upload_metadata_to_ipfs,
 )
-from basileus.ui import _fail, _run_step
+from basileus.chain.eip7702 import send_batch
+from basileus.chain.fees import get_fee_params
+from basileus.chain.simulate import simulate_calls
+from basileus.chain.tx import Confirmation, ContractCall, set_confirmation
+from basileus.ui import _fail, _run_step, _run_transfer_step
 
 console = Console()
 
+# Placeholder metadata URI for simulation (the real one comes from the IPFS upload)
+DRY_RUN_AGENT_URI = "ipfs://dry-run"
+
+
+def _resolve_label(w3: Web3, spec: str) -> str | None:
+    """First free label for spec (a label, candidate list or {n} pattern).
+
+    Prints why nothing was picked, with free alternatives for a taken label.
+    """
+    candidates = expand_label_candidates(spec)
+    if not candidates:
+        rprint(f"  [red]Labels must be at least {MIN_LABEL_LENGTH} characters[/red]")
+        return None
+    free = find_available_labels(w3, candidates)
+    if free:
+        return free[0]
+    if len(candidates) > 1:
+        rprint(f"  [red]None of the {len(candidates)} candidates is available[/red]")
+        return None
+    rprint(
+        f"  [red]{candidates[0]}.basileus-agent.eth is already taken, try another[/red]"
+    )
+    suggestions = find_available_labels(
+        w3, suggest_labels(candidates[0]), SUGGESTION_COUNT
+    )
+    if suggestions:
+        rprint(f"  [dim]Available: {', '.join(suggestions)}[/dim]")
+    return None
+
+
+def _prompt_label(w3: Web3) -> str:
+    """Prompt for an ENS label until an available one is entered."""
+    rprint(
+        "  [dim]A list (a,b,c) or a pattern (trader-{n}) picks the first free one[/dim]"
+    )
+    while True:
+        spec = typer.prompt("  Enter subname").strip()
+        try:
+            label = _resolve_label(w3, spec)
+        except Exception as e:
+            rprint(f"  [red]Error checking availability: {e}[/red]")
+            continue
+
+        if label is not None:
+            return label
+
+
+def _pick_label(w3: Web3, spec: str | None) -> str:
+    """Label from --label if given (failing if none is free), else prompted."""
+    if spec is None:
+        return _prompt_label(w3)
+    label = _resolve_label(w3, spec)
+    if label is None:
+        _fail("Choosing ENS subname", RuntimeError(f"No free label for {spec!r}"))
+    assert label is not None
+    rprint(f"  [green]Using free label:[/green] {label}")
+    return label
+
+
+def _swap_calls(
+    w3: Web3,
+    address: str,
+    eth_balance: float,
+    current_aleph: float,
+    current_usdc: float,
+) -> list[tuple[str, ContractCall]]:
+    """Swaps funding a fresh wallet: ~10 ALEPH, the rest minus gas reserve to USDC."""
+    calls: list[tuple[str, ContractCall]] = []
+    if eth_balance - MIN_ETH_RESERVE <= 0:
+        return calls
+    aleph_eth = 0.0
+    if current_aleph < TARGET_ALEPH_TOKENS:
+        aleph_eth = compute_aleph_swap_eth(w3)
+        if aleph_eth <= eth_balance - MIN_ETH_RESERVE:
+            calls.append(
+                (
+                    "Swap ETH → ALEPH",
+                    swap_call(address, ALEPH_ADDRESS, UNISWAP_FEE_ALEPH, aleph_eth),
+                )
+            )
+        else:
+            aleph_eth = 0.0
+    if current_usdc <= 0:
+        usdc_eth = compute_usdc_swap_eth(eth_balance - aleph_eth)
+        if usdc_eth > 0:
+            calls.append(
+                (
+                    "Swap ETH → USDC",
+                    swap_call(address, USDC_ADDRESS, UNISWAP_FEE_USDC, usdc_eth),
+                )
+            )
+    return calls
+
+
+async def _onboard_in_one_tx(
+    w3: Web3,
+    account: ETHAccount,
+    private_key: str,
+    address: str,
+    label: str | None,
+    label_spec: str | None,
+    swaps: list[tuple[str, ContractCall]],
+) -> tuple[str, int | None]:
+    """Swaps, ENS and ERC-8004 registration as one atomic EIP-7702 batch.
+
+    Returns (label, agentId or None if already registered).
+    """
+    calls = list(swaps)
+    if label is None:
+        rprint(
+            "  Choose a name for your agent (will become [cyan]<name>.basileus-agent.eth[/cyan])"
+        )
+        label = _pick_label(w3, label_spec)
+        calls.append(
+            (f"Register {label}.basileus-agent.eth", register_call(label, address))
+        )
+        calls.append(
+            (
+                "Set contentHash",
+                set_content_hash_call(w3, label, FRONTEND_CONTENT_HASH),
+            )
+        )
+
+    registering = not check_existing_registration(w3, address)
+    if registering:
+        ens_name = f"{label}.basileus-agent.eth"
+        metadata = build_agent_metadata(label)
+        agent_uri = await _run_step(
+            "Uploading metadata to IPFS",
+            fn=lambda: upload_metadata_to_ipfs(account, metadata),
+        )
+        rprint(f"  [dim]URI: {agent_uri}[/dim]")
+        calls.append(("Register on ERC-8004", register_agent_call(agent_uri, ens_name)))
+
+    if not calls:
+        rprint("  [green]Already funded and registered[/green]")
+        return label, None
+
+    for name, _call in calls:
+        rprint(f"  [dim]• {name}[/dim]")
+    tx_hash, receipt = await _run_step(
+        f"Sending {len(calls)} calls in one transaction",
+        fn=lambda: asyncio.to_thread(
+            send_batch,
+            w3,
+            private_key,
+            [call for _name, call in calls],
+            "Onboarding batch",
+        ),
+    )
+    rprint(
+        f"  [dim]Tx: [link=https://basescan.org/tx/0x{tx_hash.hex()}]0x{tx_hash.hex()}[/link][/dim]"
+    )
+    if not registering:
+        return label, None
+    agent_id = registered_agent_id(receipt)
+    agent_url = f"https://8004agents.ai/base/agent/{agent_id}"
+    rprint(
+        f"  [green]Registered:[/green] agentId = [link={agent_url}]{agent_id}[/link]"
+    )
+    return label, agent_id
+
+
+async def _dry_run(
+    w3: Web3,
+    address: str,
+    label: str | None,
+    min_eth: float,
+    label_spec: str | None = None,
+) -> None:
+    """Simulate swaps, ENS and ERC-8004 txs in one batched call. Broadcasts nothing."""
+    rprint("[bold]Dry run:[/bold] simulating on-chain steps (nothing is broadcast)")
+    rprint()
+
+    eth_balance = get_eth_balance(w3, address)
+    current_aleph = get_aleph_balance(w3, address)
+    current_usdc = get_usdc_balance(w3, address)
+    # Stand in for the deposit the real deploy would wait for
+    simulated_eth = max(eth_balance, min_eth)
+
+    calls: list[tuple[str, ContractCall]] = []
+
+    already_funded = eth_balance > 0 and current_aleph > 0 and current_usdc > 0
+    if not already_funded:
+        calls += _swap_calls(w3, address, simulated_eth, current_aleph, current_usdc)
+
+    if label is None:
+        rprint(
+            "  Choose a name for your agent (will become [cyan]<name>.basileus-agent.eth[/cyan])"
+        )
+        label = _pick_label(w3, label_spec)
+        calls.append(
+            (
+                f"Register {label}.basileus-agent.eth",
+                register_call(label, address),
+            )
+        )
+        calls.append(
+            (
+                "Set contentHash",
+                set_content_hash_call(w3, label, FRONTEND_CONTENT_HASH),
+            )
+        )
+
+    if not check_existing_registration(w3, address):
+        ens_name = f"{label}.basileus-agent.eth"
+        calls.append(
+            (
+                "Register on ERC-8004",
+                register_agent_call(DRY_RUN_AGENT_URI, ens_name),
+            )
+        )
+
+    if not calls:
+        rprint(
+            "  [green]Nothing to do on-chain — wallet is funded and registered[/green]"
+        )
+        return
+
+    results = await _run_step(
+        f"Simulating {len(calls)} transactions",
+        fn=lambda: asyncio.to_thread(
+            simulate_calls, w3, address, calls, w3.to_wei(simulated_eth, "ether")
+        ),
+    )
+
+    fees = get_fee_params(w3)
+    total_gas = 0
+    for result in results:
+        total_gas += result.gas_used
+        if result.success:
+            rprint(
+                f"  [green]\u2714[/green] {result.label} [dim]({result.gas_used:,} gas)[/dim]"
+            )
+        else:
+            rprint(f"  [red]\u2718[/red] {result.label}: [red]{result.error}[/red]")
+
+    max_cost = w3.from_wei(total_gas * fees.max_fee_per_gas, "ether")
+    rprint()
+    rprint(f"  [dim]Total gas: {total_gas:,} (max cost {max_cost:.6f} ETH)[/dim]")
+
+    if not all(result.success for result in results):
+        raise typer.Exit(1)
+
 
 async def deploy_command(
     path: Path = typer.Argument(
@@ -85,9 +356,67 @@ async def deploy_command(
         "--ssh-key",
         help="Path to SSH public key file (default: auto-detect from ~/.ssh/)",
     ),
+    label_spec: str = typer.Option(
+        None,
+        "--label",
+        help="ENS label to register: a name, a list (a,b,c) or a pattern "
+        "(trader-{n}, bot-{n:03}); the first free one is used",
+    ),
+    one_tx: bool = typer.Option(
+        False,
+        "--one-tx",
+        help="Send the swaps, ENS and ERC-8004 registration as one atomic "
+        "transaction (delegates the agent wallet to Simple7702Account, EIP-7702)",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Simulate the on-chain steps and report gas/failures without broadcasting",
+    ),
+    compression: Compression = typer.Option(
+        Compression.deflate,
+        "--compression",
+        help="Agent bundle compression (zstd needs Python 3.14+ or basileus[zstd])",
+    ),
+    compression_level: int = typer.Option(
+        None,
+        "--compression-level",
+        help="Compression level (default: 6 for deflate, 3 for zstd)",
+    ),
+    code_delivery: CodeDelivery = typer.Option(
+        CodeDelivery.ssh,
+        "--code-delivery",
+        help="ssh: upload code to the instance; aleph: store it once on Aleph "
+        "(public, env files excluded) and let the instance fetch it; volume: "
+        "attach it to the instance as an immutable volume (needs mksquashfs)",
+    ),
+    runtime: AgentRuntime = typer.Option(
+        AgentRuntime.bundle,
+        "--runtime",
+        help="bundle: build one minified JS file with esbuild and run it with "
+        "node (needs local node_modules); tsx: ship sources, npm install and "
+        "run with tsx on the instance",
+    ),
+    confirmation: Confirmation = CONFIRMATION_OPTION,
+    vcpus: int = typer.Option(
+        DEFAULT_INSTANCE_SIZE.vcpus,
+        "--vcpus",
+        help="Instance vCPUs (see `basileus profile` for a recommendation)",
+    ),
+    memory: int = typer.Option(
+        DEFAULT_INSTANCE_SIZE.memory,
+        "--memory",
+        help="Instance memory in MiB, 2048 per vCPU",
+    ),
 ) -> None:
     """Deploy a new Basileus agent — generates wallet, funds it, and deploys to Aleph Cloud."""
 
+    set_confirmation(confirmation)
+    try:
+        size = instance_size(vcpus, memory)
+    except ValueError as e:
+        _fail("Checking instance size", e)
+
     if path is None:
         path = Path.cwd()
 
@@ -99,6 +428,7 @@ async def deploy_command(
 
     step = 0
     ssh_client: paramiko.SSHClient | None = None
+    build_dir: Path | None = None
 
     try:
         # Wallet
@@ -120,7 +450,7 @@ async def deploy_command(
         except Exception as e:
             _fail("Setting up Base wallet", e)
 
-        w3 = Web3(Web3.HTTPProvider(BASE_RPC_URL))
+        w3 = get_web3()
         existing_label = check_existing_subname(w3, address)
         needs_ens = existing_label is None
         label = existing_label
@@ -131,6 +461,12 @@ async def deploy_command(
             )
         rprint()
 
+        if dry_run:
+            if env_vars is not None:
+                rprint("  [dim]Dry run: generated wallet is not saved[/dim]")
+            await _dry_run(w3, address, existing_label, min_eth, label_spec)
+            return
+
         # Write .env.prod (only if new wallet)
         if env_vars is not None:
             step += 1
@@ -154,6 +490,17 @@ async def deploy_command(
                 _fail("Configuring agent environment", e)
             rprint()
 
+        # Build before anything is paid for, so a broken build fails fast
+        code_path = path
+        if runtime is AgentRuntime.bundle:
+            build_dir = Path(tempfile.mkdtemp(prefix="basileus-build-"))
+            built_dir = build_dir
+            code_path = await _run_step(
+                "Building agent bundle",
+                fn=lambda: asyncio.to_thread(build_agent, path, built_dir),
+            )
+            rprint()
+
         # Check for existing Aleph resources
         account = get_aleph_account(private_key)
         crn = DEFAULT_CRN
@@ -220,7 +567,7 @@ async def deploy_command(
 
             # Swap ETH → ALEPH + USDC
             eth_available = eth_balance - MIN_ETH_RESERVE
-            if eth_available > 0:
+            if eth_available > 0 and not one_tx:
                 step += 1
                 rprint(f"[bold]Step {step}:[/bold] Swapping ETH → ALEPH + USDC...")
                 rprint()
@@ -271,8 +618,33 @@ async def deploy_command(
                         )
                 rprint()
 
+        agent_id_display = None
+        if one_tx:
+            step += 1
+            rprint(
+                f"[bold]Step {step}:[/bold] Onboarding agent in one transaction (EIP-7702)..."
+            )
+            rprint()
+            swaps: list[tuple[str, ContractCall]] = []
+            if not already_funded:
+                swaps = await _run_step(
+                    "Computing swap amounts",
+                    fn=lambda: asyncio.to_thread(
+                        _swap_calls,
+                        w3,
+                        address,
+                        get_eth_balance(w3, address),
+                        current_aleph,
+                        current_usdc,
+                    ),
+                )
+            label, agent_id_display = await _onboard_in_one_tx(
+                w3, account, private_key, address, label, label_spec, swaps
+            )
+            rprint()
+
         # Register ENS subname (if needed)
-        if needs_ens:
+        if needs_ens and not one_tx:
             step += 1
             rprint(f"[bold]Step {step}:[/bold] Register ENS subname")
             rprint(
@@ -281,19 +653,7 @@ async def deploy_command(
             rprint("  [dim]Must be at least 3 characters[/dim]")
             rprint()
 
-            while True:
-                label = typer.prompt("  Enter subname").strip().lower()
-                try:
-                    is_available = check_label_available(w3, label)
-                except Exception as e:
-                    rprint(f"  [red]Error checking availability: {e}[/red]")
-                    continue
-
-                if is_available:
-                    break
-                rprint(
-                    f"  [red]{label}.basileus-agent.eth is already taken, try another[/red]"
-                )
+            label = _pick_label(w3, label_spec)
 
             try:
                 tx_hash = await _run_step(
@@ -327,45 +687,45 @@ async def deploy_command(
             await asyncio.sleep(2)
 
         # Register on ERC-8004 IdentityRegistry
-        agent_id_display = None
-        step += 1
-        rprint(f"[bold]Step {step}:[/bold] ERC-8004 agent registration...")
-        rprint()
+        if not one_tx:
+            step += 1
+            rprint(f"[bold]Step {step}:[/bold] ERC-8004 agent registration...")
+            rprint()
 
-        if label is None:
-            _fail("ERC-8004 registration", RuntimeError("ENS label not available"))
-        assert label is not None
+            if label is None:
+                _fail("ERC-8004 registration", RuntimeError("ENS label not available"))
+            assert label is not None
 
-        already_registered = check_existing_registration(w3, address)
-        if already_registered:
-            rprint("  [green]Already registered on ERC-8004[/green]")
-        else:
-            ens_name = f"{label}.basileus-agent.eth"
-            metadata = build_agent_metadata(label)
+            already_registered = check_existing_registration(w3, address)
+            if already_registered:
+                rprint("  [green]Already registered on ERC-8004[/green]")
+            else:
+                ens_name = f"{label}.basileus-agent.eth"
+                metadata = build_agent_metadata(label)
 
-            agent_uri = await _run_step(
-                "Uploading metadata to IPFS",
-                fn=lambda: upload_metadata_to_ipfs(account, metadata),
-            )
-            rprint(f"  [dim]URI: {agent_uri}[/dim]")
+                agent_uri = await _run_step(
+                    "Uploading metadata to IPFS",
+                    fn=lambda: upload_metadata_to_ipfs(account, metadata),
+                )
+                rprint(f"  [dim]URI: {agent_uri}[/dim]")
 
-            agent_id, reg_tx = await _run_step(
-                "Registering agent on-chain",
-                fn=lambda: asyncio.to_thread(
-                    register_agent, w3, private_key, agent_uri, ens_name
-                ),
-            )
-            agent_url = f"https://8004agents.ai/base/agent/{agent_id}"
-            rprint(
-                f"  [green]Registered:[/green] agentId = [link={agent_url}]{agent_id}[/link]"
-            )
-            rprint(
-                f"  [dim]Tx: [link=https://basescan.org/tx/{reg_tx}]{reg_tx}[/link][/dim]"
-            )
-            agent_id_display = agent_id
-        rprint()
+                agent_id, reg_tx = await _run_step(
+                    "Registering agent on-chain",
+                    fn=lambda: asyncio.to_thread(
+                        register_agent, w3, private_key, agent_uri, ens_name
+                    ),
+                )
+                agent_url = f"https://8004agents.ai/base/agent/{agent_id}"
+                rprint(
+                    f"  [green]Registered:[/green] agentId = [link={agent_url}]{agent_id}[/link]"
+                )
+                rprint(
+                    f"  [dim]Tx: [link=https://basescan.org/tx/{reg_tx}]{reg_tx}[/link][/dim]"
+                )
+                agent_id_display = agent_id
+            rprint()
 
-        await asyncio.sleep(2)
+            await asyncio.sleep(2)
 
         # Create Aleph Cloud instance
         step += 1
@@ -385,13 +745,42 @@ async def deploy_command(
         except Exception as e:
             _fail("Checking ALEPH balance", e)
 
+        bundle_hash: str | None = None
+        if code_delivery is CodeDelivery.aleph:
+            bundle_hash = await _run_step(
+                "Publishing agent bundle to Aleph",
+                fn=lambda: publish_agent_bundle(
+                    account, code_path, compression, compression_level
+                ),
+            )
+            rprint(f"  [dim]Bundle: {stored_file_url(bundle_hash)}[/dim]")
+
+        volumes = None
+        if code_delivery is CodeDelivery.volume:
+            code_volume = await _run_step(
+                "Publishing agent code volume to Aleph",
+                fn=lambda: publish_agent_volume(
+                    account, code_path, compression, compression_level
+                ),
+            )
+            rprint(f"  [dim]Volume: {code_volume['ref']}[/dim]")
+            volumes = [code_volume]
+
         instance_msg = await _run_step(
             "Creating Aleph instance message",
-            fn=lambda: create_instance(account, crn, ssh_pubkey=ssh_pubkey),
+            fn=lambda: create_instance(
+                account,
+                crn,
+                vcpus=size.vcpus,
+                memory=size.memory,
+                ssh_pubkey=ssh_pubkey,
+                volumes=volumes,
+            ),
         )
         instance_hash = instance_msg.item_hash
         explorer_url = f"https://explorer.aleph.cloud/address/ETH/{address}/message/INSTANCE/{instance_hash}"
         rprint(f"  [dim]Instance: [link={explorer_url}]{instance_hash}[/link][/dim]")
+        rprint(f"  [dim]Size: {size.describe()}[/dim]")
 
         flow_rates = await _run_step(
             "Computing flow rates",
@@ -441,44 +830,64 @@ async def deploy_command(
         assert ssh_client is not None
         client = ssh_client
 
+        # Node.js installs on the instance while the code is being delivered
         await _run_step(
-            "Uploading agent code",
-            fn=lambda: asyncio.to_thread(upload_agent, client, path),
-        )
-
-        await _run_step(
-            "Installing Node.js",
-            fn=lambda: asyncio.to_thread(install_node, client),
-        )
-
-        await _run_step(
-            "Deploying agent code",
-            fn=lambda: asyncio.to_thread(deploy_code, client),
+            "Starting provisioning on instance",
+            fn=lambda: asyncio.to_thread(start_provisioning, client),
         )
 
-        await _run_step(
-            "Installing dependencies",
-            fn=lambda: asyncio.to_thread(install_deps, client),
-        )
+        if code_delivery is CodeDelivery.volume:
+            await _run_step(
+                "Uploading agent secrets",
+                fn=lambda: asyncio.to_thread(upload_secrets, client, code_path),
+            )
+        elif bundle_hash is None:
+            await _run_transfer_step(
+                "Uploading agent code",
+                fn=lambda report: asyncio.to_thread(
+                    upload_agent,
+                    client,
+                    code_path,
+                    report,
+                    compression,
+                    compression_level,
+                ),
+            )
+        else:
+            published_hash = bundle_hash
+            await _run_step(
+                "Fetching agent bundle on instance",
+                fn=lambda: asyncio.to_thread(
+                    fetch_bundle,
+                    client,
+                    stored_file_url(published_hash),
+                    published_hash,
+                    compression,
+                ),
+            )
+            await _run_step(
+                "Uploading agent secrets",
+                fn=lambda: asyncio.to_thread(upload_secrets, client, code_path),
+            )
 
         await _run_step(
-            "Configuring agent service",
-            fn=lambda: asyncio.to_thread(configure_service, client),
+            "Handing code over to provisioning",
+            fn=lambda: asyncio.to_thread(mark_code_delivered, client),
         )
 
-        is_active = await _run_step(
-            "Verifying agent is running",
-            fn=lambda: asyncio.to_thread(verify_service, client),
-        )
-        if not is_active:
-            _fail(
-                "Verifying agent is running",
-                RuntimeError("basileus-agent service failed to start"),
-            )
-
         ssh_client.close()
         ssh_client = None
 
+        readiness = await _run_step(
+            "Waiting for agent to be provisioned",
+            fn=lambda: asyncio.to_thread(
+                wait_for_provisioning, instance_ip, ssh_key_path
+            ),
+        )
+        service = "basileus-agent (active)"
+        if readiness is not None:
+            service = f"basileus-agent ({readiness.describe()})"
+
         rprint()
         console.rule("[bold green]Deployment Complete")
         rprint()
@@ -494,7 +903,7 @@ async def deploy_command(
                 + f"[bold]ETH Balance:[/bold]      {get_eth_balance(w3, address):.4f} ETH\n"
                 f"[bold]Instance IP:[/bold]      {instance_ip}\n"
                 f"[bold]Network:[/bold]          Base Mainnet\n"
-                f"[bold]Service:[/bold]          [green]basileus-agent (active)[/green]\n"
+                f"[bold]Service:[/bold]          [green]{service}[/green]\n"
                 f"\n"
                 f"[bold]Dashboard:[/bold]       [cyan][link=https://{label}.basileus-agent.eth.limo]https://{label}.basileus-agent.eth.limo[/link][/cyan]",
                 title="[bold green]Basileus Agent[/bold green]",
@@ -504,3 +913,5 @@ async def deploy_command(
     finally:
         if ssh_client is not None:
             ssh_client.close()
+        if build_dir is not None:
+            shutil.rmtree(build_dir, ignore_errors=True)
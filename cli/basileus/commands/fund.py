@@ -0,0 +1,149 @@
+import asyncio
+from pathlib import Path
+
+import typer
+from eth_account import Account
+from rich import print as rprint
+from rich.console import Console
+from rich.table import Table
+
+from basileus.chain.constants import MIN_ETH_FUNDING
+from basileus.chain.rpc import get_web3
+from basileus.chain.fund import Balances, fund_agents, plan_funding, read_balances
+from basileus.chain.swap import compute_aleph_swap_eth
+from basileus.chain.tx import Confirmation, set_confirmation
+from basileus.chain.wallet import load_wallet_addresses
+from basileus.commands.options import CONFIRMATION_OPTION
+from basileus.ui import _fail, _run_step
+
+console = Console()
+
+
+def _fmt(value: float | None, digits: int) -> str:
+    return "[dim]?[/dim]" if value is None else f"{value:.{digits}f}"
+
+
+def _render(balances: list[Balances]) -> Table:
+    table = Table(header_style="bold")
+    table.add_column("Agent", style="cyan")
+    table.add_column("ETH", justify="right")
+    table.add_column("ALEPH", justify="right")
+    table.add_column("USDC", justify="right")
+    for b in balances:
+        table.add_row(b.address, _fmt(b.eth, 4), _fmt(b.aleph, 2), _fmt(b.usdc, 2))
+    return table
+
+
+async def fund_command(
+    paths: list[Path] = typer.Argument(
+        None,
+        help="Agent directories (default: current working directory)",
+    ),
+    addresses: list[str] = typer.Option(
+        [],
+        "--address",
+        help="Agent address to fund (repeatable, no agent directory needed)",
+    ),
+    treasury_key: str = typer.Option(
+        None,
+        "--treasury-key",
+        envvar="BASILEUS_TREASURY_KEY",
+        help="Private key of the wallet paying for the funding (prompted if unset)",
+    ),
+    eth_amount: float = typer.Option(
+        MIN_ETH_FUNDING,
+        "--eth",
+        help="ETH per agent: agents are topped up to this balance",
+    ),
+    swap: bool = typer.Option(
+        False,
+        "--swap",
+        help="Pre-swap each agent's ETH to ALEPH + USDC like deploy does, "
+        "so deploy skips funding and swaps",
+    ),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Do not ask for confirmation"),
+    confirmation: Confirmation = CONFIRMATION_OPTION,
+) -> None:
+    """Fund many agent wallets from a treasury in a single transaction."""
+
+    set_confirmation(confirmation)
+
+    if not paths and not addresses:
+        paths = [Path.cwd()]
+
+    try:
+        all_addresses = list(addresses) + load_wallet_addresses(paths or [])
+    except FileNotFoundError as e:
+        _fail("Loading agent wallets", e)
+
+    if treasury_key is None:
+        treasury_key = typer.prompt("  Treasury private key", hide_input=True)
+    try:
+        treasury = Account.from_key(treasury_key).address
+    except Exception as e:
+        _fail("Loading treasury key", e)
+
+    console.rule("[bold blue]Basileus Agent Funding")
+    rprint()
+    rprint(f"  [green]Treasury:[/green] {treasury}")
+
+    w3 = get_web3()
+    n = len(all_addresses)
+    balances = await _run_step(
+        f"Reading balances of {n} agent{'s' if n > 1 else ''}",
+        fn=lambda: asyncio.to_thread(read_balances, w3, all_addresses),
+    )
+
+    aleph_eth = 0.0
+    if swap:
+        aleph_eth = await _run_step(
+            "Computing ALEPH swap amount",
+            fn=lambda: asyncio.to_thread(compute_aleph_swap_eth, w3),
+        )
+
+    try:
+        plans = plan_funding(balances, eth_amount, swap, aleph_eth)
+    except ValueError as e:
+        _fail("Planning funding", e)
+
+    unknown = [b.address for b in balances if not b.known]
+    for address in unknown:
+        rprint(
+            f"  [yellow]{address}: balances could not be read, skipped "
+            "(run fund again)[/yellow]"
+        )
+
+    if not plans:
+        if unknown:
+            raise typer.Exit(1)
+        rprint("  [green]All agents are already funded[/green]")
+        rprint()
+        return
+
+    total = sum(p.total_eth for p in plans)
+    rprint()
+    for plan in plans:
+        detail = f"{plan.eth:.4f} ETH"
+        if plan.aleph_eth:
+            detail += f" + {plan.aleph_eth:.4f} ETH → ALEPH"
+        if plan.usdc_eth:
+            detail += f" + {plan.usdc_eth:.4f} ETH → USDC"
+        rprint(f"  [cyan]{plan.address}[/cyan]  {detail}")
+    rprint()
+    rprint(f"  [bold]Total:[/bold] {total:.4f} ETH to {len(plans)} agents, one tx")
+    if not yes and not typer.confirm("  Send funding transaction?", default=True):
+        raise typer.Exit(1)
+
+    tx_hash = await _run_step(
+        "Sending funding transaction",
+        fn=lambda: asyncio.to_thread(fund_agents, w3, treasury_key, plans),
+    )
+    rprint(f"  [dim]Tx: [link=https://basescan.org/tx/{tx_hash}]{tx_hash}[/link][/dim]")
+
+    funded = [plan.address for plan in plans]
+    after = await _run_step(
+        "Confirming balances",
+        fn=lambda: asyncio.to_thread(read_balances, w3, funded),
+    )
+    rprint()
+    console.print(_render(after))
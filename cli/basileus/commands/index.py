@@ -0,0 +1,92 @@
+import asyncio
+from pathlib import Path
+
+import typer
+from rich import print as rprint
+from rich.console import Console
+from rich.table import Table
+
+from basileus.chain.indexer import (
+    index_path,
+    label_owners,
+    lookup_agents,
+    sync_index,
+    with_index,
+)
+from basileus.chain.rpc import get_web3
+from basileus.chain.wallet import load_wallet_addresses
+from basileus.ui import _fail, _run_step
+
+console = Console()
+
+
+async def index_command(
+    paths: list[Path] = typer.Argument(
+        None,
+        help="Agent directories to look up (default: current working directory)",
+    ),
+    addresses: list[str] = typer.Option(
+        [],
+        "--address",
+        help="Agent address to look up (repeatable, no agent directory needed)",
+    ),
+    labels: list[str] = typer.Option(
+        [],
+        "--label",
+        help="ENS label whose registrant to look up (repeatable; transfers of "
+        "names are not indexed)",
+    ),
+    sync: bool = typer.Option(
+        True,
+        "--sync/--no-sync",
+        help="Index new ERC-8004 and ENS registrations (and agent transfers) "
+        "before answering",
+    ),
+) -> None:
+    """Look up agentIds, ENS labels and label owners from a local event index."""
+
+    if not paths and not addresses and not labels:
+        paths = [Path.cwd()]
+    try:
+        all_addresses = list(addresses) + load_wallet_addresses(paths or [])
+    except FileNotFoundError as e:
+        _fail("Loading agent wallets", e)
+
+    console.rule("[bold blue]Basileus Registration Index")
+    rprint()
+    rprint(f"  [dim]Index: {index_path()}[/dim]")
+
+    if sync:
+        w3 = get_web3()
+        indexed = await _run_step(
+            "Syncing registrations",
+            fn=lambda: asyncio.to_thread(with_index, lambda db: sync_index(w3, db)),
+        )
+        rprint(f"  [dim]{indexed} new registrations indexed[/dim]")
+
+    agents, owners = await asyncio.to_thread(
+        with_index,
+        lambda db: (lookup_agents(db, all_addresses), label_owners(db, labels)),
+    )
+
+    rprint()
+    if agents:
+        table = Table(header_style="bold")
+        table.add_column("Agent", style="cyan")
+        table.add_column("ENS")
+        table.add_column("ERC-8004 ID", justify="right")
+        for agent in agents:
+            table.add_row(
+                agent.address,
+                ", ".join(f"{label}.basileus-agent.eth" for label in agent.labels)
+                or "[dim]—[/dim]",
+                ", ".join(str(i) for i in agent.agent_ids) or "[dim]—[/dim]",
+            )
+        console.print(table)
+    if owners:
+        table = Table(header_style="bold")
+        table.add_column("Label", style="cyan")
+        table.add_column("Registrant")
+        for label, owner in owners.items():
+            table.add_row(f"{label}.basileus-agent.eth", owner or "[green]free[/green]")
+        console.print(table)
@@ -0,0 +1,54 @@
+import asyncio
+
+import typer
+from rich import print as rprint
+from rich.console import Console
+
+from basileus.chain.rpc import get_web3
+from basileus.chain.ens import (
+    MAX_PATTERN_CANDIDATES,
+    expand_label_candidates,
+    find_available_labels,
+)
+from basileus.ui import _fail, _run_step
+
+console = Console()
+
+
+async def labels_command(
+    spec: str = typer.Argument(
+        ...,
+        help="Candidate labels: a list (a,b,c) and/or patterns (trader-{n}, bot-{n:03})",
+    ),
+    count: int = typer.Option(1, "--count", "-n", help="Number of free labels to find"),
+    contiguous: bool = typer.Option(
+        False,
+        "--contiguous",
+        help="Find a run of consecutive free labels (e.g. trader-7..trader-16)",
+    ),
+    start: int = typer.Option(1, "--start", help="First {n} of patterns"),
+    limit: int = typer.Option(
+        MAX_PATTERN_CANDIDATES, "--limit", help="Candidates generated per pattern"
+    ),
+) -> None:
+    """Find free <label>.basileus-agent.eth names, checked in one batch."""
+
+    candidates = expand_label_candidates(spec, start, limit)
+    if not candidates:
+        _fail("Expanding candidates", ValueError(f"No valid label in {spec!r}"))
+
+    w3 = get_web3()
+    free = await _run_step(
+        f"Checking {len(candidates)} labels",
+        fn=lambda: asyncio.to_thread(
+            find_available_labels, w3, candidates, count, contiguous
+        ),
+    )
+    if len(free) < count:
+        _fail(
+            "Finding free labels",
+            RuntimeError(f"Only {len(free)} of {count} free labels found"),
+        )
+    rprint()
+    for label in free:
+        console.print(f"{label}.basileus-agent.eth", highlight=False)
@@ -0,0 +1,258 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import typer
+from rich import print as rprint
+from rich.console import Console
+from web3 import Web3
+
+from basileus.chain.constants import ALEPH_DECIMALS
+from basileus.chain.rpc import FailoverProvider, get_web3
+from basileus.chain.state import read_chain_states
+from basileus.chain.wallet import load_wallet_addresses
+from basileus.infra.aleph import (
+    COMMUNITY_RECEIVER,
+    DEFAULT_CRN,
+    fetch_executions,
+    fetch_instance_messages,
+    instance_ip,
+)
+from basileus.infra.health import (
+    ALEPH_TIMEOUT,
+    CHAIN_TIMEOUT,
+    CRN_TIMEOUT,
+    SSH_TIMEOUT,
+    bounded,
+    check_services,
+)
+from basileus.infra.metrics import Gauge, MetricsRegistry, serve_metrics
+from basileus.ui import _fail
+
+console = Console()
+
+
+@dataclass
+class MonitorMetrics:
+    """Gauges exported by the monitor, labelled by agent address."""
+
+    registry: MetricsRegistry = field(default_factory=MetricsRegistry)
+
+    def __post_init__(self) -> None:
+        g = self.registry.gauge
+        self.eth = g("basileus_eth_balance", "ETH balance of the agent wallet")
+        self.aleph = g("basileus_aleph_balance", "ALEPH balance of the agent wallet")
+        self.usdc = g("basileus_usdc_balance", "USDC balance of the agent wallet")
+        self.registered = g(
+            "basileus_erc8004_registered", "1 if the agent holds an ERC-8004 identity"
+        )
+        self.flow = g(
+            "basileus_flow_rate_aleph_per_second",
+            "Outgoing Superfluid ALEPH flow rate per receiver",
+        )
+        self.runway = g(
+            "basileus_aleph_runway_seconds",
+            "Seconds until outgoing flows drain the ALEPH balance",
+        )
+        self.execution = g(
+            "basileus_crn_execution_present",
+            "1 if the CRN runs an instance of the agent",
+        )
+        self.service = g(
+            "basileus_service_up", "1 if the basileus-agent systemd unit is active"
+        )
+        self.rpc_latency = g(
+            "basileus_rpc_latency_seconds",
+            "Median round-trip time of JSON-RPC requests to the endpoint",
+        )
+        self.rpc_healthy = g(
+            "basileus_rpc_endpoint_healthy",
+            "1 unless the endpoint is cooling down after errors",
+        )
+        self.source_up = g(
+            "basileus_source_up", "1 if the last poll of the source succeeded"
+        )
+        self.last_poll = g(
+            "basileus_last_poll_timestamp_seconds",
+            "Unix time of the last successful poll of the source",
+        )
+
+
+def _set(gauge: Gauge, value: float | None, **labels: str) -> None:
+    """Set a gauge, or drop the sample when the value is unknown."""
+    if value is None:
+        gauge.remove(**labels)
+    else:
+        gauge.set(value, **labels)
+
+
+def _aleph(wei: int | None) -> float | None:
+    """ALEPH wei (per second) to ALEPH, as the balance gauges are."""
+    return None if wei is None else wei / 10**ALEPH_DECIMALS
+
+
+async def _poll_chain(w3: Web3, addresses: list[str], m: MonitorMetrics) -> None:
+    await asyncio.to_thread(lambda: w3.eth.block_number)
+    if isinstance(w3.provider, FailoverProvider):
+        for endpoint in w3.provider.endpoints:
+            latency = endpoint.median_latency
+            if latency is not None:
+                m.rpc_latency.set(latency, endpoint=endpoint.url)
+            m.rpc_healthy.set(float(endpoint.healthy), endpoint=endpoint.url)
+
+    states = await asyncio.to_thread(
+        read_chain_states,
+        w3,
+        addresses,
+        DEFAULT_CRN.receiver_address,
+        COMMUNITY_RECEIVER,
+    )
+    for s in states:
+        _set(m.eth, s.eth, agent=s.address)
+        _set(m.aleph, s.aleph, agent=s.address)
+        _set(m.usdc, s.usdc, agent=s.address)
+        registered = None if s.erc8004_registered is None else int(s.erc8004_registered)
+        _set(m.registered, registered, agent=s.address)
+        _set(m.flow, _aleph(s.operator_flow), agent=s.address, receiver="operator")
+        _set(m.flow, _aleph(s.community_flow), agent=s.address, receiver="community")
+        _set(m.runway, s.runway_seconds, agent=s.address)
+
+
+async def _poll_instances(
+    addresses: list[str], ips: dict[str, str], m: MonitorMetrics
+) -> None:
+    instances, executions = await asyncio.gather(
+        asyncio.wait_for(fetch_instance_messages(addresses), ALEPH_TIMEOUT),
+        asyncio.wait_for(fetch_executions(DEFAULT_CRN), CRN_TIMEOUT),
+    )
+    for address in addresses:
+        found = [instance_ip(executions, h) for h in instances[address]]
+        ip = next((ip for ip in found if ip), "")
+        m.execution.set(int(bool(ip)), agent=address)
+        if ip:
+            ips[address] = ip
+        else:
+            ips.pop(address, None)
+
+
+async def _poll_services(
+    ips: dict[str, str], ssh_pubkey_path: Path | None, m: MonitorMetrics
+) -> None:
+    targets = list(ips.items())
+    results = await check_services([ip for _, ip in targets], ssh_pubkey_path)
+    for (address, _), (state, err) in zip(targets, results):
+        if err:
+            m.service.remove(agent=address)
+            rprint(f"  [yellow]{address} (ssh): {err}[/yellow]")
+        else:
+            m.service.set(int(state == "active"), agent=address)
+
+
+async def _loop(
+    source: str,
+    interval: float,
+    timeout: float,
+    poll: Callable[[], Awaitable[None]],
+    m: MonitorMetrics,
+) -> None:
+    """Run poll every interval seconds, recording success per source."""
+    while True:
+        start = time.monotonic()
+        _, err = await bounded(source, timeout, poll)
+        m.source_up.set(int(err is None), source=source)
+        if err is None:
+            m.last_poll.set(time.time(), source=source)
+        else:
+            rprint(f"  [yellow]{source}: {err}[/yellow]")
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+
+async def monitor_command(
+    paths: list[Path] = typer.Argument(
+        None,
+        help="Agent directories (default: current working directory)",
+    ),
+    addresses: list[str] = typer.Option(
+        [],
+        "--address",
+        help="Agent address to monitor (repeatable, no agent directory needed)",
+    ),
+    host: str = typer.Option("127.0.0.1", "--host", help="Metrics listen address"),
+    port: int = typer.Option(9464, "--port", help="Metrics listen port"),
+    chain_interval: float = typer.Option(
+        60, "--chain-interval", help="Seconds between on-chain polls"
+    ),
+    instance_interval: float = typer.Option(
+        120, "--instance-interval", help="Seconds between Aleph/CRN polls"
+    ),
+    ssh_interval: float = typer.Option(
+        300, "--ssh-interval", help="Seconds between systemd checks over SSH"
+    ),
+    ssh_pubkey_path: Path = typer.Option(
+        None,
+        "--ssh-key",
+        help="Path to SSH public key file (default: auto-detect from ~/.ssh/)",
+    ),
+    no_ssh: bool = typer.Option(
+        False,
+        "--no-ssh",
+        help="Skip the systemd service check over SSH",
+    ),
+) -> None:
+    """Continuously monitor agents and export Prometheus metrics on /metrics."""
+
+    if not paths and not addresses:
+        paths = [Path.cwd()]
+    try:
+        all_addresses = list(addresses) + load_wallet_addresses(paths or [])
+    except FileNotFoundError as e:
+        _fail("Loading agent wallets", e)
+
+    # One provider (and its pooled HTTP session) shared by every chain poll
+    w3 = get_web3()
+    metrics = MonitorMetrics()
+    ips: dict[str, str] = {}
+
+    try:
+        runner = await serve_metrics(metrics.registry, host, port)
+    except OSError as e:
+        _fail(f"Listening on {host}:{port}", e)
+
+    console.rule("[bold blue]Basileus Monitor")
+    n = len(all_addresses)
+    rprint(f"  Watching {n} agent{'s' if n > 1 else ''}")
+    rprint(f"  Metrics on [cyan]http://{host}:{port}/metrics[/cyan]\n")
+
+    loops = [
+        _loop(
+            "chain",
+            chain_interval,
+            CHAIN_TIMEOUT,
+            lambda: _poll_chain(w3, all_addresses, metrics),
+            metrics,
+        ),
+        _loop(
+            "instances",
+            instance_interval,
+            max(ALEPH_TIMEOUT, CRN_TIMEOUT),
+            lambda: _poll_instances(all_addresses, ips, metrics),
+            metrics,
+        ),
+    ]
+    if not no_ssh:
+        loops.append(
+            _loop(
+                "ssh",
+                ssh_interval,
+                SSH_TIMEOUT * 3,
+                lambda: _poll_services(ips, ssh_pubkey_path, metrics),
+                metrics,
+            )
+        )
+
+    try:
+        await asyncio.gather(*loops)
+    finally:
+        await runner.cleanup()
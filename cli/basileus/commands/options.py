@@ -0,0 +1,12 @@
+"""Typer options shared by several commands."""
+
+import typer
+
+from basileus.chain.tx import Confirmation
+
+CONFIRMATION_OPTION = typer.Option(
+    Confirmation.receipt,
+    "--confirmation",
+    help="receipt: wait for each tx to be mined; preconf: accept Base "
+    "flashblock preconfirmations (~200ms, synchronous send when supported)",
+)
@@ -0,0 +1,134 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import typer
+from rich import print as rprint
+from rich.console import Console
+from rich.table import Table
+
+from basileus.chain.wallet import load_wallet_addresses
+from basileus.infra.aleph import DEFAULT_CRN
+from basileus.infra.health import AgentHealth, bounded, collect_health
+from basileus.infra.sizing import DEFAULT_HEADROOM, ResourceProfile, recommend_size
+from basileus.infra.ssh import profile_service
+from basileus.ui import _fail, _run_step
+
+console = Console()
+
+
+def _render(
+    profiled: list[tuple[AgentHealth, ResourceProfile]], headroom: float
+) -> Table:
+    table = Table(header_style="bold")
+    table.add_column("Agent", style="cyan")
+    table.add_column("Instance")
+    table.add_column("CPU avg / p95", justify="right")
+    table.add_column("RSS avg / peak", justify="right")
+    table.add_column("Restarts", justify="right")
+    table.add_column("Recommended", style="bold")
+    for agent, profile in profiled:
+        size = recommend_size(profile, headroom)
+        table.add_row(
+            agent.address,
+            profile.size.describe(),
+            f"{profile.cpu_avg:.2f} / {profile.cpu_p95:.2f} vCPU",
+            f"{profile.rss_avg:.0f} / {profile.rss_peak:.0f} MiB",
+            str(profile.restarts),
+            size.describe() if size != profile.size else f"{size.describe()} (same)",
+        )
+    return table
+
+
+async def profile_command(
+    paths: list[Path] = typer.Argument(
+        None,
+        help="Agent directories (default: current working directory)",
+    ),
+    addresses: list[str] = typer.Option(
+        [],
+        "--address",
+        help="Agent address to profile (repeatable, no agent directory needed)",
+    ),
+    ssh_pubkey_path: Path = typer.Option(
+        None,
+        "--ssh-key",
+        help="Path to SSH public key file (default: auto-detect from ~/.ssh/)",
+    ),
+    window: int = typer.Option(
+        300,
+        "--window",
+        min=10,
+        help="Seconds to sample the agent service for",
+    ),
+    interval: int = typer.Option(
+        5,
+        "--interval",
+        min=1,
+        help="Seconds between samples",
+    ),
+    headroom: float = typer.Option(
+        DEFAULT_HEADROOM,
+        "--headroom",
+        min=1.0,
+        help="Factor applied to p95 CPU and peak RSS before picking a tier",
+    ),
+) -> None:
+    """Sample agents' CPU and memory use and recommend the smallest instance that fits."""
+
+    if not paths and not addresses:
+        paths = [Path.cwd()]
+
+    try:
+        all_addresses = list(addresses) + load_wallet_addresses(paths or [])
+    except FileNotFoundError as e:
+        _fail("Loading agent wallets", e)
+
+    console.rule("[bold blue]Basileus Agent Resource Profile")
+    rprint()
+
+    agents = await _run_step(
+        "Locating agent instances",
+        fn=lambda: collect_health(all_addresses, DEFAULT_CRN, check_ssh=False),
+    )
+    running = [agent for agent in agents if agent.instance_ip]
+    for agent in agents:
+        if not agent.instance_ip:
+            rprint(f"  [yellow]{agent.address}: no running instance[/yellow]")
+    if not running:
+        raise typer.Exit(1)
+
+    def sample(host: str) -> Callable[[], Awaitable[ResourceProfile]]:
+        return lambda: asyncio.to_thread(
+            profile_service, host, ssh_pubkey_path, window, interval
+        )
+
+    n = len(running)
+    results = await _run_step(
+        f"Sampling {n} agent{'s' if n > 1 else ''} for {window}s",
+        fn=lambda: asyncio.gather(
+            *(
+                bounded("ssh", window + 60, sample(str(agent.instance_ip)))
+                for agent in running
+            )
+        ),
+    )
+
+    profiled = []
+    for agent, (profile, err) in zip(running, results):
+        if profile is None:
+            rprint(f"  [yellow]{agent.address} (ssh): {err}[/yellow]")
+        else:
+            profiled.append((agent, profile))
+    if not profiled:
+        raise typer.Exit(1)
+
+    rprint()
+    console.print(_render(profiled, headroom))
+    rprint()
+    for agent, profile in profiled:
+        size = recommend_size(profile, headroom)
+        rprint(
+            f"  [dim]{agent.address}: basileus deploy "
+            f"--vcpus {size.vcpus} --memory {size.memory}[/dim]"
+        )
@@ -4,9 +4,8 @@ from pathlib import Path
 import typer
 from rich import print as rprint
 from rich.console import Console
-from web3 import Web3
 
-from basileus.chain.constants import BASE_RPC_URL
+from basileus.chain.rpc import get_web3
 from basileus.chain.ens import check_existing_subname
 from basileus.chain.erc8004 import (
     build_agent_metadata,
@@ -14,7 +13,9 @@ from basileus.chain.erc8004 import (
     register_agent,
     upload_metadata_to_ipfs,
 )
+from basileus.chain.tx import Confirmation, set_confirmation
 from basileus.chain.wallet import load_existing_wallet
+from basileus.commands.options import CONFIRMATION_OPTION
 from basileus.infra.aleph import get_aleph_account
 from basileus.ui import _fail, _run_step
 
@@ -26,9 +27,12 @@ async def register_command(
         None,
         help="Path to agent directory (default: current working directory)",
     ),
+    confirmation: Confirmation = CONFIRMATION_OPTION,
 ) -> None:
     """Register an existing Basileus agent on the ERC-8004 IdentityRegistry."""
 
+    set_confirmation(confirmation)
+
     if path is None:
         path = Path.cwd()
     path = path.resolve()
@@ -44,7 +48,7 @@ async def register_command(
     address, private_key = existing
     rprint(f"  [green]Wallet:[/green] {address}")
 
-    w3 = Web3(Web3.HTTPProvider(BASE_RPC_URL))
+    w3 = get_web3()
 
     # Check ENS
     label = check_existing_subname(w3, address)
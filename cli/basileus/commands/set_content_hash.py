@@ -4,15 +4,17 @@ from pathlib import Path
 import typer
 from rich import print as rprint
 from rich.console import Console
-from web3 import Web3
 
-from basileus.chain.constants import BASE_RPC_URL, FRONTEND_CONTENT_HASH
+from basileus.chain.constants import FRONTEND_CONTENT_HASH
+from basileus.chain.rpc import get_web3
 from basileus.chain.ens import (
     check_existing_subname,
     get_content_hash,
     set_content_hash,
 )
+from basileus.chain.tx import Confirmation, set_confirmation
 from basileus.chain.wallet import load_existing_wallet
+from basileus.commands.options import CONFIRMATION_OPTION
 from basileus.ui import _fail, _run_step
 
 console = Console()
@@ -23,9 +25,12 @@ async def set_content_hash_command(
         None,
         help="Path to agent directory (default: current working directory)",
     ),
+    confirmation: Confirmation = CONFIRMATION_OPTION,
 ) -> None:
     """Update the ENS content hash for an agent's subname."""
 
+    set_confirmation(confirmation)
+
     if path is None:
         path = Path.cwd()
     path = path.resolve()
@@ -41,7 +46,7 @@ async def set_content_hash_command(
     address, private_key = existing
     rprint(f"  [green]Wallet:[/green] {address}")
 
-    w3 = Web3(Web3.HTTPProvider(BASE_RPC_URL))
+    w3 = get_web3()
 
     # Check ENS
     label = check_existing_subname(w3, address)
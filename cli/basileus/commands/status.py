@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import typer
+from rich import print as rprint
+from rich.console import Console
+from rich.table import Table
+
+from basileus.chain.wallet import load_wallet_addresses
+from basileus.infra.aleph import DEFAULT_CRN
+from basileus.infra.health import AgentHealth, collect_health
+from basileus.ui import _fail, _run_step
+
+console = Console()
+
+
+def _fmt(value: float | None, digits: int) -> str:
+    return "[dim]?[/dim]" if value is None else f"{value:.{digits}f}"
+
+
+def _fmt_flow(rate: int | None) -> str:
+    """Flow rate in ALEPH/hour."""
+    if rate is None:
+        return "[dim]?[/dim]"
+    if rate == 0:
+        return "[dim]—[/dim]"
+    return f"{rate * 3600 / 10**18:.3f}"
+
+
+def _fmt_service(agent: AgentHealth) -> str:
+    if agent.service_state is None:
+        return "[dim]?[/dim]"
+    color = "green" if agent.service_state == "active" else "red"
+    return f"[{color}]{agent.service_state}[/{color}]"
+
+
+def _agent_name(agent: AgentHealth) -> str:
+    if agent.chain is not None and agent.chain.label:
+        return f"{agent.chain.label}.basileus-agent.eth"
+    return f"{agent.address[:6]}…{agent.address[-4:]}"
+
+
+def _render(agents: list[AgentHealth]) -> Table:
+    table = Table(header_style="bold", caption="Flows in ALEPH/hour")
+    table.add_column("Agent", style="cyan")
+    table.add_column("ETH", justify="right")
+    table.add_column("ALEPH", justify="right")
+    table.add_column("USDC", justify="right")
+    table.add_column("ERC-8004", justify="center")
+    table.add_column("Op. flow", justify="right")
+    table.add_column("Comm. flow", justify="right")
+    table.add_column("Instance")
+    table.add_column("IP")
+    table.add_column("Service")
+
+    for agent in agents:
+        chain = agent.chain
+        registered = "[dim]?[/dim]"
+        if chain is not None and chain.erc8004_registered is not None:
+            registered = (
+                "[green]✔[/green]" if chain.erc8004_registered else "[red]✘[/red]"
+            )
+        if agent.instance_hashes is None:
+            instance = "[dim]?[/dim]"
+        elif agent.instance_hashes:
+            instance = agent.instance_hashes[0][:12]
+        else:
+            instance = "[dim]none[/dim]"
+        table.add_row(
+            _agent_name(agent),
+            _fmt(chain.eth if chain else None, 4),
+            _fmt(chain.aleph if chain else None, 2),
+            _fmt(chain.usdc if chain else None, 2),
+            registered,
+            _fmt_flow(chain.operator_flow if chain else None),
+            _fmt_flow(chain.community_flow if chain else None),
+            instance,
+            agent.instance_ip or "[dim]—[/dim]",
+            _fmt_service(agent),
+        )
+    return table
+
+
+async def status_command(
+    paths: list[Path] = typer.Argument(
+        None,
+        help="Agent directories (default: current working directory)",
+    ),
+    addresses: list[str] = typer.Option(
+        [],
+        "--address",
+        help="Agent address to check (repeatable, no agent directory needed)",
+    ),
+    ssh_pubkey_path: Path = typer.Option(
+        None,
+        "--ssh-key",
+        help="Path to SSH public key file (default: auto-detect from ~/.ssh/)",
+    ),
+    no_ssh: bool = typer.Option(
+        False,
+        "--no-ssh",
+        help="Skip the systemd service check over SSH",
+    ),
+) -> None:
+    """Show balances, registrations, payment flows, instance and service state of agents."""
+
+    if not paths and not addresses:
+        paths = [Path.cwd()]
+
+    try:
+        all_addresses = list(addresses) + load_wallet_addresses(paths or [])
+    except FileNotFoundError as e:
+        _fail("Loading agent wallets", e)
+
+    console.rule("[bold blue]Basileus Agent Status")
+    rprint()
+
+    n = len(all_addresses)
+    agents = await _run_step(
+        f"Collecting status of {n} agent{'s' if n > 1 else ''}",
+        fn=lambda: collect_health(
+            all_addresses,
+            DEFAULT_CRN,
+            ssh_pubkey_path=ssh_pubkey_path,
+            check_ssh=not no_ssh,
+        ),
+    )
+    rprint()
+    console.print(_render(agents))
+
+    for agent in agents:
+        for source, error in agent.errors.items():
+            rprint(f"  [yellow]{_agent_name(agent)} ({source}): {error}[/yellow]")
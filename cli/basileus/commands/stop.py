@@ -4,6 +4,7 @@ import typer
 from rich import print as rprint
 from rich.console import Console
 
+from basileus.commands.options import CONFIRMATION_OPTION
 from basileus.infra.aleph import (
     DEFAULT_CRN,
     check_existing_resources,
@@ -11,6 +12,7 @@ from basileus.infra.aleph import (
     get_aleph_account,
 )
 from basileus.ui import _run_step
+from basileus.chain.tx import Confirmation, set_confirmation
 from basileus.chain.wallet import load_existing_wallet
 
 console = Console()
@@ -21,9 +23,12 @@ async def stop_command(
         None,
         help="Path to agent directory (default: current working directory)",
     ),
+    confirmation: Confirmation = CONFIRMATION_OPTION,
 ) -> None:
     """Stop a running Basileus agent — tears down Aleph instance and closes payment flows."""
 
+    set_confirmation(confirmation)
+
     if path is None:
         path = Path.cwd()
     path = path.resolve()
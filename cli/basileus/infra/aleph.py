@@ -1,19 +1,16 @@
 import asyncio
+import tempfile
+from collections.abc import Mapping
 from dataclasses import dataclass
 from decimal import Decimal
-from ipaddress import IPv6Interface
 from pathlib import Path
 from typing import Any
 
-from aiohttp import ClientSession
 from aleph.sdk.chains.ethereum import ETHAccount
-from aleph.sdk.client.authenticated_http import (
-    AlephHttpClient,
-    AuthenticatedAlephHttpClient,
-)
 from aleph.sdk.conf import settings
 from aleph.sdk.evm_utils import FlowUpdate
 from aleph.sdk.query.filters import MessageFilter
+from aleph.sdk.types import StorageEnum
 from aleph_message.models import (
     Chain,
     InstanceMessage,
@@ -29,12 +26,28 @@ from aleph_message.models.execution.environment import (
     NodeRequirements,
 )
 
+from basileus.chain.rpc import get_web3
+from basileus.infra.bundle import (
+    AGENT_VOLUME_MOUNT,
+    Compression,
+    build_bundle,
+    build_volume,
+)
+from basileus.infra.crn import PATH_EXECUTIONS_LIST, crn_watcher, execution_ip
+from basileus.infra.sessions import (
+    aleph_client,
+    authenticated_aleph_client,
+    http_session,
+)
+from basileus.infra.sftp import file_sha256
+
 ALEPH_API_URL = "https://api2.aleph.im"
 ALEPH_CHANNEL = "basileus"
 COMMUNITY_RECEIVER = "0x5aBd3258C5492fD378EBC2e0017416E199e5Da56"
 
-PATH_EXECUTIONS_LIST = "/about/executions/list"
 PATH_INSTANCE_NOTIFY = "/control/allocation/notify"
+PATH_STORAGE_RAW = "/api/v0/storage/raw"
+PATH_MESSAGES = "/api/v0/messages.json"
 
 ALEPH_DECIMALS = 18
 MIN_ALEPH_BALANCE = Decimal(10**ALEPH_DECIMALS)  # 1 ALEPH in wei
@@ -54,16 +67,22 @@ DEFAULT_CRN = CRNInfo(
 )
 
 
+_sdk_patched = False
+
+
 def _patch_aleph_sdk() -> None:
-    """Patch Aleph SDK for Base L2 compatibility.
+    """Patch Aleph SDK for Base L2 compatibility. Idempotent, applied on first use.
 
     1. Skip can_transact — its balance check uses inflated maxFeePerGas.
     2. Fix nonce — SDK uses 'latest' which can be stale between consecutive
        txs on fast L2s. Wrap original method to use 'pending' instead.
     """
+    global _sdk_patched
+    if _sdk_patched:
+        return
+
     from aleph.sdk.chains.ethereum import ETHAccount
     from aleph.sdk.connectors.superfluid import Superfluid
-    from web3 import Web3
 
     ETHAccount.can_transact = lambda self, tx=None, block=True: True  # type: ignore[assignment,misc]
 
@@ -71,22 +90,24 @@ def _patch_aleph_sdk() -> None:
 
     def _patched_get_tx(self: Superfluid, operation: Any, rpc: str) -> Any:
         tx = _original_get_tx(self, operation, rpc)
-        w3 = Web3(Web3.HTTPProvider(rpc))
+        w3 = get_web3()
         tx["nonce"] = w3.eth.get_transaction_count(
             w3.to_checksum_address(self.normalized_address), "pending"
         )
         return tx
 
     Superfluid._get_populated_transaction_request = _patched_get_tx  # type: ignore[assignment]
-
-
-_patch_aleph_sdk()
+    _sdk_patched = True
 
 
 def get_aleph_account(private_key: str) -> ETHAccount:
     """Create ETHAccount from hex private key on Base chain."""
+    _patch_aleph_sdk()
     key_bytes = bytes.fromhex(private_key.removeprefix("0x"))
-    return ETHAccount(key_bytes, chain=Chain.BASE)
+    account = ETHAccount(key_bytes, chain=Chain.BASE)
+    # Superfluid txs are signed, sent and confirmed through account._provider
+    account._provider = get_web3()
+    return account
 
 
 def get_user_ssh_pubkey() -> str | None:
@@ -132,15 +153,15 @@ async def check_existing_resources(
     account: ETHAccount, crn: CRNInfo
 ) -> ExistingResources:
     """Check if address already has instance messages or Superfluid flows."""
-    async with AlephHttpClient(api_server=ALEPH_API_URL) as client:
-        msgs = await client.get_messages(
-            message_filter=MessageFilter(
-                message_types=[MessageType.instance],
-                addresses=[account.get_address()],
-                channels=[ALEPH_CHANNEL],
-            )
+    client = await aleph_client(ALEPH_API_URL)
+    msgs = await client.get_messages(
+        message_filter=MessageFilter(
+            message_types=[MessageType.instance],
+            addresses=[account.get_address()],
+            channels=[ALEPH_CHANNEL],
         )
-        instance_hashes = [m.item_hash for m in msgs.messages]
+    )
+    instance_hashes = [str(m.item_hash) for m in msgs.messages]
 
     operator_flow: dict[str, Any] = await account.get_flow(crn.receiver_address)
     community_flow: dict[str, Any] = await account.get_flow(COMMUNITY_RECEIVER)
@@ -185,15 +206,13 @@ async def delete_existing_resources(
         await asyncio.sleep(5)
 
     if resources.instance_hashes:
-        async with AuthenticatedAlephHttpClient(
-            account=account, api_server=ALEPH_API_URL
-        ) as client:
-            for h in resources.instance_hashes:
-                await client.forget(
-                    hashes=[h],
-                    reason="Cleanup before redeployment",
-                    channel=ALEPH_CHANNEL,
-                )
+        client = await authenticated_aleph_client(account, ALEPH_API_URL)
+        for h in resources.instance_hashes:
+            await client.forget(
+                hashes=[ItemHash(h)],
+                reason="Cleanup before redeployment",
+                channel=ALEPH_CHANNEL,
+            )
 
 
 async def create_instance(
@@ -202,92 +221,115 @@ async def create_instance(
     vcpus: int = 2,
     memory: int = 4096,
     ssh_pubkey: str | None = None,
+    volumes: list[Mapping[str, Any]] | None = None,
 ) -> InstanceMessage:
-    """Create an Aleph PAYG instance. Returns the InstanceMessage."""
-    async with AuthenticatedAlephHttpClient(
-        account=account, api_server=ALEPH_API_URL
-    ) as client:
-        rootfs = settings.DEBIAN_12_QEMU_ROOTFS_ID
-        rootfs_message: StoreMessage = await client.get_message(
-            item_hash=rootfs, message_type=StoreMessage
-        )
-        rootfs_size = (
-            rootfs_message.content.size
-            if rootfs_message.content.size is not None
-            else settings.DEFAULT_ROOTFS_SIZE
-        )
+    """Create an Aleph PAYG instance. Returns the InstanceMessage.
 
-        ssh_keys = [ssh_pubkey] if ssh_pubkey else []
+    volumes are extra volumes to attach, e.g. from publish_agent_volume.
+    """
+    client = await authenticated_aleph_client(account, ALEPH_API_URL)
+    rootfs = settings.DEBIAN_12_QEMU_ROOTFS_ID
+    rootfs_message: StoreMessage = await client.get_message(
+        item_hash=rootfs, message_type=StoreMessage
+    )
+    rootfs_size = (
+        rootfs_message.content.size
+        if rootfs_message.content.size is not None
+        else settings.DEFAULT_ROOTFS_SIZE
+    )
 
-        instance_message, _status = await client.create_instance(
-            rootfs=rootfs,
-            rootfs_size=rootfs_size,
-            hypervisor=HypervisorType.qemu,
-            payment=Payment(
-                chain=Chain.BASE,
-                type=PaymentType.superfluid,
-                receiver=crn.receiver_address,
-            ),
-            requirements=HostRequirements(
-                node=NodeRequirements(node_hash=ItemHash(crn.hash))
-            ),
-            channel=ALEPH_CHANNEL,
-            address=account.get_address(),
-            ssh_keys=ssh_keys,
-            metadata={"name": "basileus-agent"},
-            vcpus=vcpus,
-            memory=memory,
-            sync=True,
-        )
-        return instance_message
+    ssh_keys = [ssh_pubkey] if ssh_pubkey else []
+
+    instance_message, _status = await client.create_instance(
+        rootfs=rootfs,
+        rootfs_size=rootfs_size,
+        hypervisor=HypervisorType.qemu,
+        payment=Payment(
+            chain=Chain.BASE,
+            type=PaymentType.superfluid,
+            receiver=crn.receiver_address,
+        ),
+        requirements=HostRequirements(
+            node=NodeRequirements(node_hash=ItemHash(crn.hash))
+        ),
+        channel=ALEPH_CHANNEL,
+        address=account.get_address(),
+        ssh_keys=ssh_keys,
+        metadata={"name": "basileus-agent"},
+        vcpus=vcpus,
+        memory=memory,
+        volumes=volumes,
+        sync=True,
+    )
+    return instance_message
 
 
 async def notify_allocation(
     crn: CRNInfo, instance_hash: str, max_retries: int = 5, retry_delay: int = 3
 ) -> None:
     """Notify CRN to allocate the instance. Retries on flow-related errors."""
+    session = await http_session()
     for attempt in range(max_retries):
-        async with ClientSession() as session:
-            async with session.post(
-                f"{crn.url}{PATH_INSTANCE_NOTIFY}",
-                json={"instance": instance_hash},
-            ) as resp:
-                if resp.ok:
-                    return
-                error = await resp.text()
-                if (
-                    "payment stream" in error.lower() or "402" in error
-                ) and attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
-                    continue
-                raise ValueError(f"Allocation failed: {error}")
+        async with session.post(
+            f"{crn.url}{PATH_INSTANCE_NOTIFY}",
+            json={"instance": instance_hash},
+        ) as resp:
+            if resp.ok:
+                return
+            error = await resp.text()
+            if (
+                "payment stream" in error.lower() or "402" in error
+            ) and attempt < max_retries - 1:
+                await asyncio.sleep(retry_delay)
+                continue
+            raise ValueError(f"Allocation failed: {error}")
+
+
+async def fetch_instance_messages(addresses: list[str]) -> dict[str, list[str]]:
+    """Fetch instance message hashes for many addresses in one query.
+
+    Returns {address: [instance hashes]}, with an entry for every address.
+    """
+    client = await aleph_client(ALEPH_API_URL)
+    msgs = await client.get_messages(
+        message_filter=MessageFilter(
+            message_types=[MessageType.instance],
+            addresses=addresses,
+            channels=[ALEPH_CHANNEL],
+        )
+    )
+    by_sender: dict[str, list[str]] = {a.lower(): [] for a in addresses}
+    for m in msgs.messages:
+        by_sender.setdefault(m.sender.lower(), []).append(m.item_hash)
+    return {a: by_sender[a.lower()] for a in addresses}
+
+
+async def fetch_executions(crn: CRNInfo) -> dict[str, Any]:
+    """Fetch the CRN executions list: {instance hash: execution entry}."""
+    session = await http_session()
+    async with session.get(f"{crn.url}{PATH_EXECUTIONS_LIST}") as resp:
+        resp.raise_for_status()
+        return await resp.json()
+
+
+def instance_ip(executions: dict[str, Any], instance_hash: str) -> str:
+    """IPv6 of an instance from a CRN executions list. Empty string if absent."""
+    if instance_hash not in executions:
+        return ""
+    return execution_ip(executions[instance_hash])
 
 
 async def fetch_instance_ip(crn: CRNInfo, instance_hash: str) -> str:
     """Fetch IPv6 of instance from CRN. Returns empty string if not found."""
-    async with ClientSession() as session:
-        async with session.get(f"{crn.url}{PATH_EXECUTIONS_LIST}") as resp:
-            resp.raise_for_status()
-            executions = await resp.json()
-            if instance_hash not in executions:
-                return ""
-            interface = IPv6Interface(executions[instance_hash]["networking"]["ipv6"])
-            return str(interface.ip + 1)
+    entries = await crn_watcher(crn.url).lookup({instance_hash})
+    return instance_ip(entries, instance_hash)
 
 
 async def wait_for_instance(
-    crn: CRNInfo, instance_hash: str, max_attempts: int = 30, interval: int = 10
+    crn: CRNInfo, instance_hash: str, timeout: float = 300
 ) -> str:
     """Wait for instance to get an IP. Returns IPv6 address."""
-    for attempt in range(max_attempts):
-        ip = await fetch_instance_ip(crn, instance_hash)
-        if ip:
-            return ip
-        if attempt < max_attempts - 1:
-            await asyncio.sleep(interval)
-    raise TimeoutError(
-        f"Instance {instance_hash} did not get an IP after {max_attempts} attempts"
-    )
+    return await crn_watcher(crn.url).wait(instance_hash, timeout)
 
 
 def check_aleph_balance(account: ETHAccount) -> Decimal:
@@ -300,3 +342,100 @@ def check_aleph_balance(account: ETHAccount) -> Decimal:
             f"Fund {account.get_address()} with ALEPH tokens on Base."
         )
     return balance_aleph
+
+
+def stored_file_url(file_hash: str) -> str:
+    """Public download URL of a file in Aleph native storage."""
+    return f"{ALEPH_API_URL}{PATH_STORAGE_RAW}/{file_hash}"
+
+
+async def stored_file_exists(file_hash: str) -> bool:
+    """Whether Aleph storage already serves the file with this hash."""
+    session = await http_session()
+    async with session.head(stored_file_url(file_hash)) as resp:
+        return resp.ok
+
+
+async def store_message_exists(item_hash: str, address: str | None = None) -> bool:
+    """Whether a STORE message (from address, if given) pins item_hash on Aleph."""
+    params = {"msgType": MessageType.store.value, "contentHashes": item_hash}
+    if address is not None:
+        params["addresses"] = address
+    session = await http_session()
+    async with session.get(f"{ALEPH_API_URL}{PATH_MESSAGES}", params=params) as resp:
+        resp.raise_for_status()
+        body = await resp.json()
+    return bool(body.get("messages"))
+
+
+async def publish_bundle(account: ETHAccount, bundle_path: Path) -> StoreMessage:
+    """Store a bundle on Aleph. Returns the STORE message.
+
+    Native storage addresses files by sha256, so the same code is uploaded
+    once however many agents are deployed from it: when the file is already
+    there, only a message referencing it is posted, pinning it for this account.
+    """
+    file_hash = await asyncio.to_thread(file_sha256, bundle_path)
+    client = await authenticated_aleph_client(account, ALEPH_API_URL)
+    if await stored_file_exists(file_hash):
+        message, _status = await client.create_store(
+            file_hash=file_hash,
+            storage_engine=StorageEnum.storage,
+            channel=ALEPH_CHANNEL,
+            sync=True,
+        )
+    else:
+        message, _status = await client.create_store(
+            file_path=bundle_path,
+            storage_engine=StorageEnum.storage,
+            channel=ALEPH_CHANNEL,
+            sync=True,
+        )
+    if message.content.item_hash != file_hash:
+        raise RuntimeError(
+            f"Aleph stored {message.content.item_hash}, expected {file_hash}"
+        )
+    return message
+
+
+async def publish_agent_bundle(
+    account: ETHAccount,
+    agent_path: Path,
+    compression: Compression = Compression.deflate,
+    level: int | None = None,
+) -> str:
+    """Bundle the agent code without env files and store it on Aleph. Returns the hash."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = await asyncio.to_thread(
+            build_bundle,
+            agent_path,
+            Path(tmp),
+            compression,
+            level,
+            include_secrets=False,
+        )
+        message = await publish_bundle(account, bundle)
+    return message.content.item_hash
+
+
+async def publish_agent_volume(
+    account: ETHAccount,
+    agent_path: Path,
+    compression: Compression = Compression.deflate,
+    level: int | None = None,
+) -> dict[str, Any]:
+    """Store the agent code as a squashfs image on Aleph.
+
+    Returns the immutable volume to pass to create_instance.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        image = await asyncio.to_thread(
+            build_volume, agent_path, Path(tmp), compression, level
+        )
+        message = await publish_bundle(account, image)
+    return {
+        "comment": "Basileus agent code",
+        "mount": AGENT_VOLUME_MOUNT,
+        "ref": message.item_hash,
+        "use_latest": False,
+    }
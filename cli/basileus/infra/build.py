@@ -0,0 +1,88 @@
+"""Ahead-of-time agent build: one minified JS bundle with its source map.
+
+esbuild bundles src/index.ts and its dependencies into BUILD_OUTPUT, so the
+instance runs the agent with plain `node`. There is no TypeScript transpile
+on each (re)start and no node_modules to install there. The build directory
+is laid out like a tiny agent directory (the bundle plus the env files), so
+the usual bundle / volume delivery ships it as is.
+"""
+
+import shutil
+import subprocess
+from enum import Enum
+from pathlib import Path
+
+from basileus.infra.bundle import collect_agent_files, split_secret_files
+
+BUILD_ENTRY = "src/index.ts"
+# Also referenced by INSTALL_DEPS_SCRIPT and CONFIGURE_SERVICE_SCRIPT
+BUILD_OUTPUT = "dist/basileus-agent.mjs"
+NODE_TARGET = "node22"  # Node.js major installed by INSTALL_NODE_SCRIPT
+# Locked in the agent's devDependencies; the npx fallback (agent directories
+# without it) is pinned to the same release
+ESBUILD_VERSION = "0.27.3"
+# Optional native add-ons of ws: loaded with try/require, fine to leave out
+EXTERNAL_PACKAGES = ["bufferutil", "utf-8-validate"]
+# ESM output: bundled CommonJS dependencies still call require()
+_REQUIRE_SHIM = (
+    "import{createRequire as __basileusRequire}from'node:module';"
+    "const require=__basileusRequire(import.meta.url);"
+)
+
+
+class AgentRuntime(str, Enum):
+    bundle = "bundle"  # prebuilt bundle run with node
+    tsx = "tsx"  # sources + npm install on the instance, run with tsx
+
+
+def _esbuild(agent_path: Path) -> list[str]:
+    local = agent_path / "node_modules" / ".bin" / "esbuild"
+    if local.exists():
+        return [str(local)]
+    npx = shutil.which("npx")
+    if npx is None:
+        raise RuntimeError("Building the agent needs Node.js (npx) installed locally")
+    return [npx, "--yes", f"esbuild@{ESBUILD_VERSION}"]
+
+
+def build_agent(agent_path: Path, out_dir: Path) -> Path:
+    """Bundle the agent into out_dir and copy its env files next to it.
+
+    Returns out_dir, to deliver in place of agent_path. Dependencies must
+    be installed locally (`npm install`), esbuild resolves them from there.
+    """
+    if not (agent_path / BUILD_ENTRY).exists():
+        raise FileNotFoundError(f"No {BUILD_ENTRY} in {agent_path}")
+    if not (agent_path / "node_modules").is_dir():
+        raise RuntimeError(
+            f"Building the agent needs its dependencies: run `npm install` in "
+            f"{agent_path} (or deploy with --runtime tsx)"
+        )
+
+    cmd = [
+        *_esbuild(agent_path),
+        BUILD_ENTRY,
+        "--bundle",
+        "--platform=node",
+        f"--target={NODE_TARGET}",
+        "--format=esm",
+        "--minify",
+        "--sourcemap",
+        "--legal-comments=none",
+        "--log-level=error",
+        f"--banner:js={_REQUIRE_SHIM}",
+        f"--outfile={out_dir / BUILD_OUTPUT}",
+        *(f"--external:{name}" for name in EXTERNAL_PACKAGES),
+    ]
+    proc = subprocess.run(
+        cmd, cwd=agent_path, capture_output=True, text=True, check=False
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"esbuild failed:\n{proc.stderr.strip()[-2000:]}")
+
+    _, secrets = split_secret_files(collect_agent_files(agent_path))
+    for path, arcname in secrets:
+        dest = out_dir / arcname
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, dest)
+    return out_dir
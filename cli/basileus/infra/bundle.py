@@ -0,0 +1,418 @@
+"""Agent code bundles: file selection and multi-core compression.
+
+Entries are compressed on a thread pool (zlib and zstd release the GIL), so
+large vendored assets no longer serialize on a single core. Formats:
+
+- zip (deflate): entries deflated in parallel and assembled by a small zip
+  writer; extracted with `unzip` on the instance.
+- tar.zst (zstd): one tar stream compressed by zstd's own worker threads;
+  extracted with `tar --zstd`. Needs Python 3.14+ or the `zstd` extra.
+
+Code volumes are squashfs images built by `mksquashfs` (also multi-core),
+attached read-only to the instance instead of being uploaded.
+"""
+
+import os
+import shutil
+import subprocess
+import struct
+import tarfile
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any
+
+from pathspec import PathSpec
+
+AGENT_ZIP_BLACKLIST = [".git", ".idea", ".vscode"]
+AGENT_ZIP_WHITELIST = [".env", ".env.prod"]
+# Env files hold the wallet private key: never part of a published bundle
+SECRET_FILE_PATTERNS = [".env", ".env.*"]
+
+REMOTE_BUNDLE_DIR = "/tmp"
+REMOTE_BUNDLE_NAME = "basileus-agent"
+
+# Where the code volume is mounted on the instance, and the file marking it
+AGENT_VOLUME_MOUNT = "/opt/basileus-code"
+AGENT_VOLUME_MARKER = ".basileus-volume"
+
+# Already-compressed formats: deflating them again costs CPU for ~0 gain
+STORED_SUFFIXES = {
+    ".7z", ".avif", ".br", ".bz2", ".gif", ".gz", ".jar", ".jpeg", ".jpg",
+    ".mp3", ".mp4", ".ogg", ".png", ".rar", ".tgz", ".webm", ".webp", ".whl",
+    ".woff", ".woff2", ".xz", ".zip", ".zst",
+}  # fmt: skip
+
+
+class Compression(str, Enum):
+    deflate = "deflate"
+    zstd = "zstd"
+
+
+class CodeDelivery(str, Enum):
+    ssh = "ssh"  # bundle (with env files) pushed to each instance over SFTP
+    aleph = "aleph"  # public bundle stored once on Aleph, fetched by hash
+    volume = "volume"  # squashfs image attached to the instance message
+
+
+DEFAULT_LEVELS = {Compression.deflate: 6, Compression.zstd: 3}
+BUNDLE_SUFFIXES = {Compression.deflate: ".zip", Compression.zstd: ".tar.zst"}
+
+
+def remote_bundle_path(compression: Compression) -> str:
+    """Upload destination of a bundle, read by DEPLOY_CODE_SCRIPT."""
+    return f"{REMOTE_BUNDLE_DIR}/{REMOTE_BUNDLE_NAME}{BUNDLE_SUFFIXES[compression]}"
+
+
+def collect_agent_files(agent_path: Path) -> list[tuple[Path, str]]:
+    """Files to ship (respecting .gitignore), as (path, archive name) pairs."""
+    gitignore_path = agent_path / ".gitignore"
+    if gitignore_path.exists():
+        patterns = gitignore_path.read_text().splitlines()
+    else:
+        patterns = []
+
+    spec = PathSpec.from_lines("gitwildmatch", patterns + AGENT_ZIP_BLACKLIST)
+
+    files = []
+    for root, _, names in os.walk(agent_path):
+        for fname in names:
+            full = os.path.join(root, fname)
+            rel = os.path.relpath(full, agent_path)
+            if not spec.match_file(rel) or rel in AGENT_ZIP_WHITELIST:
+                files.append((Path(full), rel))
+    return sorted(files, key=lambda f: f[1])
+
+
+def split_secret_files(
+    files: list[tuple[Path, str]],
+) -> tuple[list[tuple[Path, str]], list[tuple[Path, str]]]:
+    """Split bundle files into (public, secret) lists. Secrets are env files."""
+    spec = PathSpec.from_lines("gitwildmatch", SECRET_FILE_PATTERNS)
+    public = [f for f in files if not spec.match_file(f[1])]
+    secrets = [f for f in files if spec.match_file(f[1])]
+    return public, secrets
+
+
+# --- zip (deflate) ---------------------------------------------------------
+
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+_ZIP_UTF8_FLAG = 0x800
+_ZIP_VERSION = 20
+_ZIP64_VERSION = 45
+_MAX_32 = 0xFFFFFFFF
+_MAX_16 = 0xFFFF
+# Every entry is dated 1980-01-01 00:00 (the DOS epoch), not its mtime: the
+# same code gives the same archive bytes, so its sha256 dedups on Aleph
+_ZIP_DOS_TIME = 0
+_ZIP_DOS_DATE = (1 << 5) | 1
+
+
+@dataclass
+class _ZipEntry:
+    name: bytes
+    method: int
+    crc: int
+    size: int
+    data: bytes
+    csize: int
+    dos_time: int
+    dos_date: int
+    mode: int
+    offset: int = 0
+
+
+def _deflate_entry(path: Path, arcname: str, level: int) -> _ZipEntry:
+    """Read and deflate one file. Runs on a worker thread."""
+    raw = path.read_bytes()
+    st = path.stat()
+    method, data = _ZIP_STORED, raw
+    if level > 0 and raw and path.suffix.lower() not in STORED_SUFFIXES:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(raw) + compressor.flush()
+        if len(deflated) < len(raw):
+            method, data = _ZIP_DEFLATED, deflated
+    return _ZipEntry(
+        name=arcname.replace(os.sep, "/").encode(),
+        method=method,
+        crc=zlib.crc32(raw),
+        size=len(raw),
+        data=data,
+        csize=len(data),
+        dos_time=_ZIP_DOS_TIME,
+        dos_date=_ZIP_DOS_DATE,
+        mode=st.st_mode,
+    )
+
+
+def _write_local_entry(out: IO[bytes], entry: _ZipEntry) -> None:
+    entry.offset = out.tell()
+    zip64 = entry.size >= _MAX_32 or len(entry.data) >= _MAX_32
+    extra = struct.pack("<HHQQ", 1, 16, entry.size, len(entry.data)) if zip64 else b""
+    out.write(
+        struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50,
+            _ZIP64_VERSION if zip64 else _ZIP_VERSION,
+            _ZIP_UTF8_FLAG,
+            entry.method,
+            entry.dos_time,
+            entry.dos_date,
+            entry.crc,
+            _MAX_32 if zip64 else len(entry.data),
+            _MAX_32 if zip64 else entry.size,
+            len(entry.name),
+            len(extra),
+        )
+    )
+    out.write(entry.name)
+    out.write(extra)
+    out.write(entry.data)
+    entry.data = b""  # free memory, only the header fields are needed now
+
+
+def _write_central_directory(out: IO[bytes], entries: list[_ZipEntry]) -> None:
+    cd_offset = out.tell()
+    for e in entries:
+        size, csize, offset = e.size, e.csize, e.offset
+        extra_fields = [v for v in (size, csize, offset) if v >= _MAX_32]
+        extra = b""
+        if extra_fields:
+            extra = struct.pack(
+                f"<HH{len(extra_fields)}Q", 1, 8 * len(extra_fields), *extra_fields
+            )
+        version = _ZIP64_VERSION if extra else _ZIP_VERSION
+        out.write(
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50,
+                (3 << 8) | version,  # made by: Unix, so unzip applies the mode
+                version,
+                _ZIP_UTF8_FLAG,
+                e.method,
+                e.dos_time,
+                e.dos_date,
+                e.crc,
+                min(csize, _MAX_32),
+                min(size, _MAX_32),
+                len(e.name),
+                len(extra),
+                0,
+                0,
+                0,
+                (e.mode & 0xFFFF) << 16,
+                min(offset, _MAX_32),
+            )
+        )
+        out.write(e.name)
+        out.write(extra)
+    cd_size = out.tell() - cd_offset
+
+    count = len(entries)
+    if count >= _MAX_16 or cd_offset >= _MAX_32 or cd_size >= _MAX_32:
+        zip64_eocd = out.tell()
+        out.write(
+            struct.pack(
+                "<IQHHIIQQQQ",
+                0x06064B50,
+                44,
+                _ZIP64_VERSION,
+                _ZIP64_VERSION,
+                0,
+                0,
+                count,
+                count,
+                cd_size,
+                cd_offset,
+            )
+        )
+        out.write(struct.pack("<IIQI", 0x07064B50, 0, zip64_eocd, 1))
+    out.write(
+        struct.pack(
+            "<IHHHHIIH",
+            0x06054B50,
+            0,
+            0,
+            min(count, _MAX_16),
+            min(count, _MAX_16),
+            min(cd_size, _MAX_32),
+            min(cd_offset, _MAX_32),
+            0,
+        )
+    )
+
+
+def _ordered_map(
+    pool: ThreadPoolExecutor,
+    window: int,
+    fn: Callable[..., Any],
+    items: list[tuple[Path, str]],
+    *args: Any,
+) -> Iterator[Any]:
+    """pool.map keeping at most `window` results in memory."""
+    pending: deque[Future[Any]] = deque()
+    for item in items:
+        pending.append(pool.submit(fn, *item, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def build_zip(
+    files: list[tuple[Path, str]], out_path: Path, level: int, workers: int
+) -> None:
+    """Write a zip of files sorted by name, deflating on `workers` threads."""
+    entries = []
+    with (
+        out_path.open("wb") as out,
+        ThreadPoolExecutor(max_workers=workers) as pool,
+    ):
+        ordered = sorted(files, key=lambda f: f[1])
+        for entry in _ordered_map(pool, workers * 4, _deflate_entry, ordered, level):
+            _write_local_entry(out, entry)
+            entries.append(entry)
+        _write_central_directory(out, entries)
+
+
+# --- tar.zst (zstd) --------------------------------------------------------
+
+
+def _zstd_writer(out: IO[bytes], level: int, workers: int) -> IO[bytes]:
+    """Multi-threaded zstd stream over out (stdlib on 3.14+, else zstandard)."""
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        options = {
+            zstd.CompressionParameter.compression_level: level,
+            zstd.CompressionParameter.nb_workers: workers,
+        }
+        return zstd.ZstdFile(out, "w", options=options)
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        raise RuntimeError(
+            "zstd compression needs Python 3.14+ or the zstandard package "
+            "(pip install 'basileus[zstd]')"
+        ) from None
+    compressor = zstandard.ZstdCompressor(level=level, threads=workers)
+    return compressor.stream_writer(out, closefd=False)
+
+
+def _normalize(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    """Owned by root with a zero mtime, so the archive only depends on content."""
+    info.uid = info.gid = 0
+    info.uname = info.gname = "root"
+    info.mtime = 0
+    return info
+
+
+def build_tar_zst(
+    files: list[tuple[Path, str]], out_path: Path, level: int, workers: int
+) -> None:
+    """Write a zstd tar of files sorted by name, compressing on `workers` threads."""
+    with out_path.open("wb") as out:
+        stream = _zstd_writer(out, level, workers)
+        with stream, tarfile.open(fileobj=stream, mode="w|") as tar:
+            for path, arcname in sorted(files, key=lambda f: f[1]):
+                tar.add(path, arcname=arcname, recursive=False, filter=_normalize)
+
+
+def build_bundle(
+    agent_path: Path,
+    out_dir: Path,
+    compression: Compression = Compression.deflate,
+    level: int | None = None,
+    workers: int | None = None,
+    include_secrets: bool = True,
+) -> Path:
+    """Bundle the agent directory into out_dir. Returns the archive path.
+
+    With include_secrets=False, env files are left out so the bundle can be
+    published; deliver them with upload_secrets instead.
+    """
+    files = collect_agent_files(agent_path)
+    if not include_secrets:
+        files, _ = split_secret_files(files)
+    level = DEFAULT_LEVELS[compression] if level is None else level
+    workers = workers or os.cpu_count() or 1
+    out_path = out_dir / f"{REMOTE_BUNDLE_NAME}{BUNDLE_SUFFIXES[compression]}"
+    if compression is Compression.zstd:
+        build_tar_zst(files, out_path, level, workers)
+    else:
+        build_zip(files, out_path, level, workers)
+    return out_path
+
+
+# --- squashfs volume ---------------------------------------------------------
+
+SQUASHFS_COMPRESSORS = {Compression.deflate: "gzip", Compression.zstd: "zstd"}
+
+
+def _stage(files: list[tuple[Path, str]], staging: Path) -> None:
+    """Lay out files under staging, hard-linking where possible."""
+    for path, arcname in files:
+        dest = staging / arcname
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, dest)
+        except OSError:
+            shutil.copy2(path, dest)
+    (staging / AGENT_VOLUME_MARKER).touch()
+
+
+def build_volume(
+    agent_path: Path,
+    out_dir: Path,
+    compression: Compression = Compression.deflate,
+    level: int | None = None,
+    workers: int | None = None,
+) -> Path:
+    """Build a squashfs image of the agent code (env files excluded).
+
+    Returns the image path. Needs `mksquashfs` (squashfs-tools) on the PATH.
+    """
+    mksquashfs = shutil.which("mksquashfs")
+    if mksquashfs is None:
+        raise RuntimeError(
+            "Building a code volume needs mksquashfs "
+            "(apt install squashfs-tools / brew install squashfs)"
+        )
+    files, _ = split_secret_files(collect_agent_files(agent_path))
+    level = DEFAULT_LEVELS[compression] if level is None else level
+    workers = workers or os.cpu_count() or 1
+    staging = out_dir / "staging"
+    staging.mkdir()
+    _stage(files, staging)
+
+    out_path = out_dir / f"{REMOTE_BUNDLE_NAME}.squashfs"
+    cmd = [
+        mksquashfs,
+        str(staging),
+        str(out_path),
+        "-noappend",
+        "-all-root",
+        # Fixed timestamps: the same code gives the same image (and hash)
+        "-mkfs-time",
+        "0",
+        "-all-time",
+        "0",
+        "-quiet",
+        "-comp",
+        SQUASHFS_COMPRESSORS[compression],
+        "-processors",
+        str(workers),
+    ]
+    if level > 0:
+        cmd += ["-Xcompression-level", str(level)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"mksquashfs failed: {proc.stderr.strip()}")
+    return out_path
@@ -0,0 +1,50 @@
+"""Small JSON caches kept on disk between commands.
+
+Stored under $BASILEUS_CACHE_DIR, else $XDG_CACHE_HOME/basileus, else
+~/.cache/basileus. A missing or corrupt cache file reads as empty: caches
+only ever save network calls, they are never the source of truth.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR_ENV = "BASILEUS_CACHE_DIR"
+
+
+def cache_dir() -> Path:
+    """Basileus cache directory, created on first use."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        path = Path(override).expanduser()
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        path = Path(base) / "basileus"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def load_json_cache(name: str) -> dict[str, Any]:
+    """Read cache `name`. Empty if missing or unreadable."""
+    try:
+        data = json.loads((cache_dir() / f"{name}.json").read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def update_json_cache(name: str, entries: dict[str, Any]) -> None:
+    """Merge entries into cache `name`, replacing the file atomically."""
+    data = load_json_cache(name)
+    data.update(entries)
+    directory = cache_dir()
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, directory / f"{name}.json")
+    except BaseException:
+        os.unlink(tmp)
+        raise
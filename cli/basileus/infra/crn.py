@@ -0,0 +1,193 @@
+"""Watching a CRN's executions list for instances coming up.
+
+The executions list holds every VM on the node, so on busy CRNs it is large.
+Lookups stream the body and decode only the entries being waited on, send
+conditional requests when the CRN returns an ETag / Last-Modified, and share
+one poll per CRN between all instances waiting on it.
+"""
+
+import asyncio
+import json
+import re
+import time
+from ipaddress import IPv6Interface
+from typing import Any
+
+from basileus.infra.sessions import http_session
+
+PATH_EXECUTIONS_LIST = "/about/executions/list"
+
+SCAN_CHUNK_SIZE = 64 * 1024
+
+# Adaptive polling: a fresh instance usually gets its IP ~45s after allocation.
+# Poll sparsely before that, tightly around it, then back off again.
+EXPECTED_BOOT_SECONDS = 45
+MIN_POLL_INTERVAL = 2.0
+MAX_POLL_INTERVAL = 10.0
+
+_DECODER = json.JSONDecoder()
+
+
+def execution_ip(entry: dict[str, Any]) -> str:
+    """IPv6 of an instance from its execution entry. Empty string if not assigned."""
+    ipv6 = (entry.get("networking") or {}).get("ipv6")
+    if not ipv6:
+        return ""
+    return str(IPv6Interface(ipv6).ip + 1)
+
+
+class ExecutionScanner:
+    """Pull a few entries out of an executions list as it streams in.
+
+    Searches the raw bytes for `"<hash>":` and decodes only that value, so
+    other executions are never parsed. Instance hashes only appear as keys of
+    the top-level object.
+    """
+
+    def __init__(self, instance_hashes: set[str]) -> None:
+        self.pending = set(instance_hashes)
+        self.found: dict[str, dict[str, Any]] = {}
+        self._buffer = bytearray()
+        self._keep = max((len(h) + 2 for h in instance_hashes), default=0)
+        self._compile()
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def _compile(self) -> None:
+        alternatives = "|".join(re.escape(h) for h in sorted(self.pending))
+        self._pattern = re.compile(rf'"({alternatives})"\s*:\s*'.encode())
+
+    def feed(self, chunk: bytes) -> None:
+        self._buffer += chunk
+        pos = 0
+        while self.pending:
+            match = self._pattern.search(self._buffer, pos)
+            if match is None:
+                break
+            text = self._buffer[match.end() :].decode("utf-8", errors="replace")
+            try:
+                value, _ = _DECODER.raw_decode(text)
+            except ValueError:
+                # Value not fully received yet: keep it for the next chunk
+                del self._buffer[: match.start()]
+                return
+            instance_hash = match.group(1).decode()
+            self.found[instance_hash] = value
+            self.pending.discard(instance_hash)
+            if self.pending:
+                self._compile()
+            pos = match.end()
+        # Drop scanned bytes, keeping enough to match a key split across chunks
+        del self._buffer[: max(0, len(self._buffer) - self._keep)]
+
+
+class CRNWatcher:
+    """Single poller for one CRN, serving every instance waiting on it."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.loop = asyncio.get_running_loop()
+        self._waiters: dict[str, list[asyncio.Future[str]]] = {}
+        self._since: dict[str, float] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._scanned: frozenset[str] = frozenset()
+        self._found: dict[str, dict[str, Any]] = {}
+
+    async def lookup(self, instance_hashes: set[str]) -> dict[str, dict[str, Any]]:
+        """Fetch the execution entries of instance_hashes present on the CRN."""
+        headers = {}
+        if instance_hashes <= self._scanned:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            elif self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
+        session = await http_session()
+        async with session.get(
+            f"{self.url}{PATH_EXECUTIONS_LIST}", headers=headers
+        ) as resp:
+            if resp.status == 304:
+                return {h: e for h, e in self._found.items() if h in instance_hashes}
+            resp.raise_for_status()
+            scanner = ExecutionScanner(instance_hashes)
+            async for chunk in resp.content.iter_chunked(SCAN_CHUNK_SIZE):
+                scanner.feed(chunk)
+                if scanner.done:
+                    break
+            self._etag = resp.headers.get("ETag")
+            self._last_modified = resp.headers.get("Last-Modified")
+
+        self._scanned = frozenset(instance_hashes)
+        self._found = scanner.found
+        return scanner.found
+
+    async def wait(self, instance_hash: str, timeout: float) -> str:
+        """Wait until instance_hash has an IP on this CRN. Returns the IPv6."""
+        future: asyncio.Future[str] = self.loop.create_future()
+        self._waiters.setdefault(instance_hash, []).append(future)
+        self._since.setdefault(instance_hash, time.monotonic())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Instance {instance_hash} did not get an IP after {timeout:g}s"
+            ) from None
+        finally:
+            waiters = self._waiters.get(instance_hash, [])
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters:
+                self._waiters.pop(instance_hash, None)
+                self._since.pop(instance_hash, None)
+
+    def _next_interval(self) -> float:
+        if not self._since:
+            return MAX_POLL_INTERVAL
+        elapsed = time.monotonic() - min(self._since.values())
+        remaining = EXPECTED_BOOT_SECONDS - elapsed
+        if remaining > 0:
+            interval = remaining / 2
+        else:
+            interval = MIN_POLL_INTERVAL - remaining / 10
+        return min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, interval))
+
+    async def _poll(self) -> None:
+        while self._waiters:
+            try:
+                entries = await self.lookup(set(self._waiters))
+            except Exception as e:
+                for futures in self._waiters.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                self._waiters.clear()
+                self._since.clear()
+                return
+            for instance_hash, entry in entries.items():
+                ip = execution_ip(entry)
+                if not ip:
+                    continue
+                self._since.pop(instance_hash, None)
+                for future in self._waiters.pop(instance_hash, []):
+                    if not future.done():
+                        future.set_result(ip)
+            if not self._waiters:
+                return
+            await asyncio.sleep(self._next_interval())
+
+
+_watchers: dict[str, CRNWatcher] = {}
+
+
+def crn_watcher(url: str) -> CRNWatcher:
+    """Shared watcher for the CRN at url, bound to the running event loop."""
+    watcher = _watchers.get(url)
+    if watcher is None or watcher.loop is not asyncio.get_running_loop():
+        watcher = _watchers[url] = CRNWatcher(url)
+    return watcher
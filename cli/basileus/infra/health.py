@@ -0,0 +1,139 @@
+"""Concurrent health collection for one or many agents.
+
+Every source (chain, Aleph API, CRN, SSH) is queried once for the whole set
+of agents where possible, all sources run concurrently, and each has its own
+timeout so one slow source only blanks its own columns.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+from web3 import Web3
+
+from basileus.chain.rpc import get_web3
+from basileus.chain.state import ChainState, read_chain_states
+from basileus.infra.aleph import (
+    COMMUNITY_RECEIVER,
+    CRNInfo,
+    fetch_executions,
+    fetch_instance_messages,
+    instance_ip,
+)
+from basileus.infra.ssh import check_service
+
+CHAIN_TIMEOUT = 15
+ALEPH_TIMEOUT = 15
+CRN_TIMEOUT = 10
+SSH_TIMEOUT = 10
+MAX_SSH_WORKERS = 64
+
+T = TypeVar("T")
+
+
+@dataclass
+class AgentHealth:
+    """Everything known about one agent. None means unknown (see errors)."""
+
+    address: str
+    chain: ChainState | None = None
+    instance_hashes: list[str] | None = None
+    instance_ip: str | None = None
+    service_state: str | None = None
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+async def bounded(
+    source: str, timeout: float, fn: Callable[[], Awaitable[T]]
+) -> tuple[T | None, str | None]:
+    """Run one collector with a timeout. Returns (result, error)."""
+    try:
+        return await asyncio.wait_for(fn(), timeout), None
+    except asyncio.TimeoutError:
+        return None, f"{source} timed out after {timeout}s"
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e or repr(e)}"
+
+
+async def collect_health(
+    addresses: list[str],
+    crn: CRNInfo,
+    ssh_pubkey_path: Path | None = None,
+    check_ssh: bool = True,
+    w3: Web3 | None = None,
+) -> list[AgentHealth]:
+    """Collect chain state, Aleph instances, CRN execution/IP and service state."""
+    w3 = w3 or get_web3()
+    agents = [AgentHealth(address=a) for a in addresses]
+
+    (
+        (states, chain_err),
+        (instances, aleph_err),
+        (executions, crn_err),
+    ) = await asyncio.gather(
+        bounded(
+            "chain",
+            CHAIN_TIMEOUT,
+            lambda: asyncio.to_thread(
+                read_chain_states,
+                w3,
+                addresses,
+                crn.receiver_address,
+                COMMUNITY_RECEIVER,
+            ),
+        ),
+        bounded("aleph", ALEPH_TIMEOUT, lambda: fetch_instance_messages(addresses)),
+        bounded("crn", CRN_TIMEOUT, lambda: fetch_executions(crn)),
+    )
+
+    for i, agent in enumerate(agents):
+        if states is not None:
+            agent.chain = states[i]
+        elif chain_err:
+            agent.errors["chain"] = chain_err
+
+        if instances is not None:
+            agent.instance_hashes = instances[agent.address]
+        elif aleph_err:
+            agent.errors["aleph"] = aleph_err
+
+        if executions is not None and agent.instance_hashes:
+            ips = [instance_ip(executions, h) for h in agent.instance_hashes]
+            agent.instance_ip = next((ip for ip in ips if ip), "")
+        elif crn_err:
+            agent.errors["crn"] = crn_err
+
+    if check_ssh:
+        reachable = [a for a in agents if a.instance_ip]
+        results = await check_services(
+            [str(a.instance_ip) for a in reachable], ssh_pubkey_path
+        )
+        for agent, (state, err) in zip(reachable, results):
+            if err:
+                agent.errors["ssh"] = err
+            else:
+                agent.service_state = state
+    return agents
+
+
+async def check_services(
+    hosts: list[str], ssh_pubkey_path: Path | None
+) -> list[tuple[str | None, str | None]]:
+    """Query systemd over SSH on every host in parallel. Returns (state, error) per host."""
+    if not hosts:
+        return []
+
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=min(len(hosts), MAX_SSH_WORKERS)) as pool:
+
+        def run(host: str) -> Callable[[], Awaitable[Any]]:
+            return lambda: loop.run_in_executor(
+                pool, check_service, host, ssh_pubkey_path, SSH_TIMEOUT
+            )
+
+        return await asyncio.gather(
+            *(bounded("ssh", SSH_TIMEOUT * 2, run(host)) for host in hosts)
+        )
@@ -0,0 +1,74 @@
+"""Minimal Prometheus text-format exporter served over aiohttp."""
+
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelSet = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+@dataclass
+class Gauge:
+    """A gauge metric holding the latest value per label set."""
+
+    name: str
+    help: str
+    samples: dict[LabelSet, float] = field(default_factory=dict)
+
+    def set(self, value: float, **labels: str) -> None:
+        self.samples[tuple(sorted(labels.items()))] = float(value)
+
+    def remove(self, **labels: str) -> None:
+        self.samples.pop(tuple(sorted(labels.items())), None)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, value in self.samples.items():
+            lines.append(f"{self.name}{_format_labels(labels)} {value!r}")
+        return "\n".join(lines)
+
+
+@dataclass
+class MetricsRegistry:
+    """Collection of gauges rendered together on /metrics."""
+
+    gauges: dict[str, Gauge] = field(default_factory=dict)
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        if name not in self.gauges:
+            self.gauges[name] = Gauge(name, help)
+        return self.gauges[name]
+
+    def render(self) -> str:
+        return "\n".join(g.render() for g in self.gauges.values()) + "\n"
+
+
+async def serve_metrics(
+    registry: MetricsRegistry, host: str, port: int
+) -> web.AppRunner:
+    """Start an HTTP server exposing the registry on /metrics. Caller must cleanup()."""
+
+    async def handle(_request: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render().encode(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -2,37 +2,78 @@ INSTALL_NODE_SCRIPT = r"""#!/bin/bash
 set -euo pipefail
 export DEBIAN_FRONTEND=noninteractive
 curl -fsSL https://deb.nodesource.com/setup_22.x | bash -
-apt-get install -y nodejs unzip
-npm install -g tsx
+apt-get install -y nodejs unzip zstd
 """
 
 DEPLOY_CODE_SCRIPT = r"""#!/bin/bash
 set -euo pipefail
 rm -rf /opt/basileus
 mkdir -p /opt/basileus
-unzip -o /tmp/basileus-agent.zip -d /opt/basileus
+if [ -f /tmp/basileus-agent.tar.zst ]; then
+  tar --zstd -xf /tmp/basileus-agent.tar.zst -C /opt/basileus
+elif [ -f /tmp/basileus-agent.zip ]; then
+  unzip -o /tmp/basileus-agent.zip -d /opt/basileus
+else
+  # Code volume: attached as a raw drive, mount it unless already mounted
+  if [ ! -f /opt/basileus-code/.basileus-volume ]; then
+    dev=$(blkid -t TYPE=squashfs -o device | head -n1 || true)
+    if [ -z "$dev" ]; then
+      echo "No agent bundle or code volume found" >&2
+      exit 1
+    fi
+    mkdir -p /opt/basileus-code
+    mount -o ro "$dev" /opt/basileus-code
+  fi
+  cp -a /opt/basileus-code/. /opt/basileus/
+  rm -f /opt/basileus/.basileus-volume
+fi
+rm -f /tmp/basileus-agent.tar.zst /tmp/basileus-agent.zip
+if [ -d /tmp/basileus-secrets ]; then
+  cp -a /tmp/basileus-secrets/. /opt/basileus/
+  rm -rf /tmp/basileus-secrets
+fi
+"""
+
+# Formatted with url, sha256 and path of the bundle stored on Aleph
+FETCH_BUNDLE_SCRIPT = r"""#!/bin/bash
+set -euo pipefail
+rm -f /tmp/basileus-agent.tar.zst /tmp/basileus-agent.zip
+curl -fsSL --retry 5 --retry-all-errors -o {path} {url}
+echo "{sha256}  {path}" | sha256sum -c --quiet -
 """
 
 INSTALL_DEPS_SCRIPT = r"""#!/bin/bash
 set -euo pipefail
 cd /opt/basileus
+# Prebuilt bundle (see infra/build.py): its dependencies are inside it
+[ -f dist/basileus-agent.mjs ] && exit 0
 npm install --omit=dev
 npm rebuild
+npm install -g tsx
 """
 
 CONFIGURE_SERVICE_SCRIPT = r"""#!/bin/bash
 set -euo pipefail
 
-cat > /etc/systemd/system/basileus-agent.service <<'UNIT'
+if [ -f /opt/basileus/dist/basileus-agent.mjs ]; then
+  exec_start="/usr/bin/node --enable-source-maps dist/basileus-agent.mjs"
+else
+  exec_start="/usr/bin/env tsx src/index.ts"
+fi
+
+cat > /etc/systemd/system/basileus-agent.service <<UNIT
 [Unit]
 Description=Basileus Agent
 After=network.target
 
 [Service]
 Type=simple
-ExecStart=/usr/bin/env tsx src/index.ts
+ExecStart=$exec_start
 WorkingDirectory=/opt/basileus
 Environment=PATH=/usr/bin:/usr/local/bin:/opt/basileus/node_modules/.bin
+# Recreated empty on every (re)start; the agent touches ready in it once up
+RuntimeDirectory=basileus-agent
+Environment=BASILEUS_READY_FILE=/run/basileus-agent/ready
 Restart=on-failure
 RestartSec=10
 StartLimitBurst=5
@@ -45,3 +86,117 @@ systemctl daemon-reload
 systemctl enable basileus-agent
 systemctl start basileus-agent
 """
+
+# Readiness probe, run right after the unit is started. Watches ActiveState
+# and NRestarts for up to 120s until the agent's ready file appears or, for an
+# agent that never writes it, the unit has been active without restarting for
+# 15s, whichever comes first. Measurements go to /var/lib/basileus/readiness.
+VERIFY_SERVICE_SCRIPT = r"""#!/bin/bash
+set -uo pipefail
+timeout_ms=120000
+stable_ms=15000
+ready_file=/run/basileus-agent/ready
+now_ms() { date +%s%3N; }
+start=$(now_ms)
+active_since=""
+restarts=0
+signal=none
+while :; do
+  now=$(now_ms)
+  active=$(systemctl show basileus-agent -p ActiveState --value)
+  n=$(systemctl show basileus-agent -p NRestarts --value)
+  if [ "$n" != "$restarts" ]; then
+    restarts=$n
+    active_since=""
+  fi
+  if [ "$active" = active ]; then
+    [ -n "$active_since" ] || active_since=$now
+    if [ -f "$ready_file" ]; then
+      signal=agent
+      healthy=$now
+      break
+    fi
+    if [ $((now - active_since)) -ge $stable_ms ]; then
+      signal=unit
+      healthy=$((active_since + stable_ms))
+      break
+    fi
+  else
+    active_since=""
+    [ "$active" = failed ] && break
+  fi
+  [ $((now - start)) -ge $timeout_ms ] && break
+  sleep 0.5
+done
+healthy_after=""
+[ "$signal" = none ] || healthy_after=$((healthy - start))
+echo "signal=$signal healthy_after_ms=$healthy_after restarts=$restarts state=$active" \
+  > /var/lib/basileus/readiness
+[ "$signal" != none ]
+"""
+
+# Formatted with samples and interval (seconds). Prints the instance's vCPUs
+# and MemTotal (kB), then one line per sample: time (ns), the unit's
+# CPUUsageNSec and the summed VmRSS (kB) of the processes in its cgroup.
+PROFILE_SERVICE_SCRIPT = r"""#!/bin/bash
+set -uo pipefail
+cgroup=/sys/fs/cgroup$(systemctl show basileus-agent -p ControlGroup --value)
+echo "$(nproc) $(awk '/^MemTotal:/ {{print $2}}' /proc/meminfo)"
+for _ in $(seq {samples}); do
+  cpu=$(systemctl show basileus-agent -p CPUUsageNSec --value)
+  rss=0
+  for pid in $(cat "$cgroup/cgroup.procs" 2>/dev/null); do
+    kb=$(awk '/^VmRSS:/ {{print $2}}' /proc/$pid/status 2>/dev/null)
+    rss=$((rss + ${{kb:-0}}))
+  done
+  echo "$(date +%s%N) ${{cpu// /_}} $rss"
+  sleep {interval}
+done
+"""
+
+# Runs detached under systemd-run, so it goes on if the deployer disconnects.
+# Node is installed while the code is still being delivered; the deployer
+# touches code-delivered once the bundle / secrets are in place.
+PROVISION_SCRIPT = r"""#!/bin/bash
+set -euo pipefail
+state=/var/lib/basileus
+mkdir -p $state
+rm -f $state/ready $state/failed $state/readiness
+stage=start
+trap 'echo "$stage" > $state/failed' ERR
+
+stage=install-node
+bash /tmp/basileus-install-node.sh
+
+stage=wait-for-code
+for _ in $(seq 1800); do
+  [ -f $state/code-delivered ] && break
+  sleep 1
+done
+[ -f $state/code-delivered ]
+rm -f $state/code-delivered
+
+stage=deploy-code
+bash /tmp/basileus-deploy-code.sh
+
+stage=install-deps
+bash /tmp/basileus-install-deps.sh
+
+stage=configure-service
+bash /tmp/basileus-configure-service.sh
+
+stage=verify-service
+bash /tmp/basileus-verify-service.sh
+touch $state/ready
+"""
+
+# Prints ready, running or failed:<stage>, then readiness probe results if any
+PROVISION_STATE_SCRIPT = r"""
+state=/var/lib/basileus
+readiness=$(cat $state/readiness 2>/dev/null)
+if [ -f $state/ready ]; then echo "ready $readiness"
+elif [ -f $state/failed ]; then echo "failed:$(cat $state/failed) $readiness"
+elif systemctl is-active --quiet basileus-provision; then echo running
+else echo failed:stopped
+fi
+"""
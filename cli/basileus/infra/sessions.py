@@ -0,0 +1,83 @@
+"""Long-lived HTTP clients shared for the life of a command or daemon.
+
+Aleph and CRN calls used to open a fresh client per call (and per retry or
+poll), paying DNS + TLS setup every time. Clients handed out here are kept
+alive per endpoint and closed once when the command finishes.
+"""
+
+import asyncio
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from aleph.sdk.chains.ethereum import ETHAccount
+from aleph.sdk.client.authenticated_http import (
+    AlephHttpClient,
+    AuthenticatedAlephHttpClient,
+)
+
+HTTP_TIMEOUT = ClientTimeout(total=60, connect=15)
+KEEPALIVE_TIMEOUT = 60  # seconds an idle connection stays open
+DNS_CACHE_TTL = 300
+
+_loop: asyncio.AbstractEventLoop | None = None
+_http_session: ClientSession | None = None
+_aleph_clients: dict[tuple[str, str | None], AlephHttpClient] = {}
+
+
+def _bind_loop() -> None:
+    """Drop clients created on another event loop (they cannot be reused)."""
+    global _loop, _http_session
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        _loop = loop
+        _http_session = None
+        _aleph_clients.clear()
+
+
+async def http_session() -> ClientSession:
+    """Shared aiohttp session for raw requests (CRNs). Pools connections per host."""
+    global _http_session
+    _bind_loop()
+    if _http_session is None or _http_session.closed:
+        _http_session = ClientSession(
+            timeout=HTTP_TIMEOUT,
+            connector=TCPConnector(
+                keepalive_timeout=KEEPALIVE_TIMEOUT, ttl_dns_cache=DNS_CACHE_TTL
+            ),
+        )
+    return _http_session
+
+
+async def aleph_client(api_server: str) -> AlephHttpClient:
+    """Shared read-only Aleph API client for api_server."""
+    _bind_loop()
+    key = (api_server, None)
+    if key not in _aleph_clients:
+        _aleph_clients[key] = await AlephHttpClient(api_server=api_server).__aenter__()
+    return _aleph_clients[key]
+
+
+async def authenticated_aleph_client(
+    account: ETHAccount, api_server: str
+) -> AuthenticatedAlephHttpClient:
+    """Shared signing Aleph API client for (api_server, account)."""
+    _bind_loop()
+    key = (api_server, account.get_address())
+    if key not in _aleph_clients:
+        _aleph_clients[key] = await AuthenticatedAlephHttpClient(
+            account=account, api_server=api_server
+        ).__aenter__()
+    client = _aleph_clients[key]
+    assert isinstance(client, AuthenticatedAlephHttpClient)
+    return client
+
+
+async def close_sessions() -> None:
+    """Close every pooled client. Called once when the command exits."""
+    global _http_session
+    clients = list(_aleph_clients.values())
+    _aleph_clients.clear()
+    for client in clients:
+        await client.__aexit__(None, None, None)
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
@@ -0,0 +1,156 @@
+"""Parallel, pipelined SFTP uploads with progress and checksum verification.
+
+A single SFTP channel is capped at one server window per round trip, which
+on high-latency IPv6 paths to CRNs is far below the link speed. Large files
+are split into parts written concurrently over separate channels of the same
+SSH connection, each with pipelined writes and large requests.
+"""
+
+import hashlib
+import shlex
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import paramiko
+
+SFTP_WINDOW_SIZE = 16 * 1024 * 1024
+SFTP_MAX_PACKET_SIZE = 64 * 1024
+SFTP_REQUEST_SIZE = 64 * 1024  # well under OpenSSH's 256 KiB message limit
+PARALLEL_STREAMS = 8
+MIN_PART_SIZE = 2 * 1024 * 1024
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _parts(size: int) -> list[tuple[int, int]]:
+    """Split size bytes into (offset, length) parts, one per stream."""
+    if size == 0:
+        return [(0, 0)]
+    streams = max(1, min(PARALLEL_STREAMS, size // MIN_PART_SIZE))
+    part = -(-size // streams)
+    return [(off, min(part, size - off)) for off in range(0, size, part)]
+
+
+def _open_sftp(transport: paramiko.Transport) -> paramiko.SFTPClient:
+    sftp = paramiko.SFTPClient.from_transport(
+        transport, window_size=SFTP_WINDOW_SIZE, max_packet_size=SFTP_MAX_PACKET_SIZE
+    )
+    if sftp is None:
+        raise RuntimeError("Could not open SFTP channel")
+    return sftp
+
+
+def _upload_part(
+    sftp: paramiko.SFTPClient,
+    local_path: Path,
+    remote_path: str,
+    offset: int,
+    length: int,
+    report: Callable[[int], None],
+) -> None:
+    with local_path.open("rb") as src, sftp.open(remote_path, "r+b", 0) as dst:
+        dst.MAX_REQUEST_SIZE = SFTP_REQUEST_SIZE
+        dst.set_pipelined(True)
+        src.seek(offset)
+        dst.seek(offset)
+        remaining = length
+        while remaining:
+            data = src.read(min(SFTP_REQUEST_SIZE, remaining))
+            if not data:
+                raise OSError(f"{local_path} shrank during upload")
+            dst.write(data)
+            remaining -= len(data)
+            report(len(data))
+
+
+def _upload_part_on_new_channel(
+    transport: paramiko.Transport,
+    local_path: Path,
+    remote_path: str,
+    offset: int,
+    length: int,
+    report: Callable[[int], None],
+) -> None:
+    sftp = _open_sftp(transport)
+    try:
+        _upload_part(sftp, local_path, remote_path, offset, length, report)
+    finally:
+        sftp.close()
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def remote_sha256(client: paramiko.SSHClient, remote_path: str) -> str:
+    _stdin, stdout, stderr = client.exec_command(
+        f"sha256sum -- {shlex.quote(remote_path)}"
+    )
+    if stdout.channel.recv_exit_status() != 0:
+        raise RuntimeError(f"sha256sum failed: {stderr.read().decode().strip()}")
+    return stdout.read().decode().split()[0]
+
+
+def upload_file(
+    client: paramiko.SSHClient,
+    local_path: Path,
+    remote_path: str,
+    progress: ProgressCallback | None = None,
+) -> None:
+    """Upload local_path to remote_path and verify its sha256.
+
+    progress, if given, is called with (bytes sent, total bytes) from worker
+    threads as the upload advances.
+    """
+    transport = client.get_transport()
+    if transport is None:
+        raise RuntimeError("SSH client is not connected")
+
+    size = local_path.stat().st_size
+    sent = 0
+    lock = threading.Lock()
+
+    def report(n: int) -> None:
+        nonlocal sent
+        with lock:
+            sent += n
+            done = sent
+        if progress is not None:
+            progress(done, size)
+
+    (first_off, first_len), *rest = _parts(size)
+    sftp = _open_sftp(transport)
+    try:
+        sftp.open(remote_path, "wb").close()
+        with ThreadPoolExecutor(max_workers=len(rest) + 1) as pool:
+            local_digest = pool.submit(file_sha256, local_path)
+            futures = [
+                pool.submit(
+                    _upload_part_on_new_channel,
+                    transport,
+                    local_path,
+                    remote_path,
+                    off,
+                    n,
+                    report,
+                )
+                for off, n in rest
+            ]
+            _upload_part(sftp, local_path, remote_path, first_off, first_len, report)
+            for future in futures:
+                future.result()
+            expected = local_digest.result()
+    finally:
+        sftp.close()
+
+    actual = remote_sha256(client, remote_path)
+    if actual != expected:
+        raise RuntimeError(
+            f"Checksum mismatch for {remote_path}: expected {expected}, got {actual}"
+        )
@@ -0,0 +1,117 @@
+"""Instance sizing from the agent service's measured CPU and memory use.
+
+Aleph prices instances in compute units of 1 vCPU and 2 GiB, so the size is
+picked among INSTANCE_TIERS. A profile is sampled on a running instance by
+PROFILE_SERVICE_SCRIPT: CPU from the unit's CPUUsageNSec between samples,
+memory as the summed RSS of the processes in its cgroup.
+
+CPU is sized on the p95 (a short burst only gets throttled), memory on the
+peak (going over it gets the agent OOM-killed), both times a headroom factor.
+"""
+
+import statistics
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class InstanceSize:
+    vcpus: int
+    memory: int  # MiB
+
+    def describe(self) -> str:
+        return f"{self.vcpus} vCPU{'s' if self.vcpus != 1 else ''}, {self.memory} MiB"
+
+
+INSTANCE_TIERS = [InstanceSize(vcpus, vcpus * 2048) for vcpus in (1, 2, 4, 6, 8, 12)]
+DEFAULT_INSTANCE_SIZE = InstanceSize(2, 4096)
+DEFAULT_HEADROOM = 1.5
+SYSTEM_MEMORY = 512  # MiB left to the OS, sshd, journald... besides the agent
+MIN_PROFILE_SAMPLES = 3
+
+
+def instance_size(vcpus: int, memory: int) -> InstanceSize:
+    """The tier with these resources. Raises ValueError if there is none."""
+    size = InstanceSize(vcpus, memory)
+    if size not in INSTANCE_TIERS:
+        tiers = ", ".join(f"{t.vcpus}/{t.memory}" for t in INSTANCE_TIERS)
+        raise ValueError(
+            f"{vcpus} vCPUs / {memory} MiB is not an Aleph tier (vCPUs/MiB: {tiers})"
+        )
+    return size
+
+
+@dataclass
+class ResourceProfile:
+    """Agent service resource use over a sampling window."""
+
+    size: InstanceSize  # of the instance it was measured on
+    samples: int
+    window: float  # seconds
+    cpu_avg: float  # vCPUs
+    cpu_p95: float
+    rss_avg: float  # MiB
+    rss_peak: float
+    restarts: int  # CPU counter resets seen: the service restarted
+
+    @classmethod
+    def parse(cls, output: str) -> "ResourceProfile":
+        """Parse PROFILE_SERVICE_SCRIPT output.
+
+        First line: vCPUs and MemTotal (kB) of the instance. Then one line per
+        sample: time (ns), CPUUsageNSec and RSS (kB) of the service.
+        """
+        header, *lines = output.strip().splitlines()
+        nproc, mem_kb = (int(v) for v in header.split())
+        samples = []
+        for line in lines:
+            t, cpu, rss_kb = line.split()
+            samples.append((int(t), int(cpu) if cpu.isdigit() else None, int(rss_kb)))
+        if len(samples) < MIN_PROFILE_SAMPLES:
+            raise ValueError(f"Only {len(samples)} samples, is the agent running?")
+
+        usage, restarts = [], 0
+        for (t0, cpu0, _), (t1, cpu1, _) in zip(samples, samples[1:]):
+            if cpu0 is None or cpu1 is None:
+                continue  # CPU accounting off for the unit
+            if cpu1 < cpu0:
+                restarts += 1
+                continue
+            usage.append((cpu1 - cpu0) / (t1 - t0))
+        rss = [kb / 1024 for _, _, kb in samples]
+        if not usage or not any(rss):
+            raise ValueError("The agent service was not running while sampled")
+
+        # MemTotal is a bit under the instance memory (kernel reservations)
+        memory = mem_kb / 1024
+        size = next(
+            (
+                tier
+                for tier in INSTANCE_TIERS
+                if tier.vcpus == nproc and memory <= tier.memory < memory * 1.25
+            ),
+            InstanceSize(nproc, round(memory)),
+        )
+        return cls(
+            size=size,
+            samples=len(samples),
+            window=(samples[-1][0] - samples[0][0]) / 1e9,
+            cpu_avg=statistics.fmean(usage),
+            cpu_p95=(
+                statistics.quantiles(usage, n=20)[-1] if len(usage) > 1 else usage[0]
+            ),
+            rss_avg=statistics.fmean(rss),
+            rss_peak=max(rss),
+            restarts=restarts,
+        )
+
+
+def recommend_size(
+    profile: ResourceProfile, headroom: float = DEFAULT_HEADROOM
+) -> InstanceSize:
+    """Smallest tier fitting the profile with headroom (the largest one otherwise)."""
+    cpu_needed = profile.cpu_p95 * headroom
+    memory_needed = profile.rss_peak * headroom + SYSTEM_MEMORY
+    for tier in INSTANCE_TIERS:
+        if tier.vcpus >= cpu_needed and tier.memory >= memory_needed:
+            return tier
+    return INSTANCE_TIERS[-1]
@@ -1,21 +1,34 @@
-import os
+import shlex
 import tempfile
 import time
-import zipfile
+from dataclasses import dataclass
 from pathlib import Path
 
 import paramiko
-from pathspec import PathSpec
 
+from basileus.infra.bundle import (
+    Compression,
+    build_bundle,
+    collect_agent_files,
+    remote_bundle_path,
+    split_secret_files,
+)
+from basileus.infra.sftp import ProgressCallback, upload_file
 from basileus.infra.scripts import (
     CONFIGURE_SERVICE_SCRIPT,
     DEPLOY_CODE_SCRIPT,
+    FETCH_BUNDLE_SCRIPT,
     INSTALL_DEPS_SCRIPT,
     INSTALL_NODE_SCRIPT,
+    PROFILE_SERVICE_SCRIPT,
+    PROVISION_SCRIPT,
+    PROVISION_STATE_SCRIPT,
+    VERIFY_SERVICE_SCRIPT,
 )
+from basileus.infra.sizing import ResourceProfile
 
-AGENT_ZIP_BLACKLIST = [".git", ".idea", ".vscode"]
-AGENT_ZIP_WHITELIST = [".env", ".env.prod"]
+REMOTE_SECRETS_DIR = "/tmp/basileus-secrets"
+PROVISION_STATE_DIR = "/var/lib/basileus"
 
 
 def _resolve_private_key(ssh_pubkey_path: Path) -> str:
@@ -51,6 +64,32 @@ def _run_script(client: paramiko.SSHClient, script: str, label: str) -> None:
         raise RuntimeError(f"{label} failed (exit {exit_status}):\n{err}")
 
 
+def _connect_once(
+    host: str, ssh_pubkey_path: Path | None, timeout: int
+) -> paramiko.SSHClient:
+    """Open one SSH connection as root, without retries."""
+    if ssh_pubkey_path is not None:
+        key_path = _resolve_private_key(ssh_pubkey_path)
+    else:
+        key_path = _auto_detect_ssh_key()
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            hostname=host,
+            username="root",
+            key_filename=key_path,
+            timeout=timeout,
+            banner_timeout=timeout,
+            auth_timeout=timeout,
+        )
+    except Exception:
+        client.close()
+        raise
+    return client
+
+
 def wait_for_ssh(
     host: str, ssh_pubkey_path: Path | None = None, timeout: int = 300
 ) -> paramiko.SSHClient:
@@ -86,57 +125,214 @@ def wait_for_ssh(
     )
 
 
-def upload_agent(client: paramiko.SSHClient, agent_path: Path) -> None:
-    """Zip agent directory (respecting .gitignore) and upload via SFTP."""
-    gitignore_path = agent_path / ".gitignore"
-    if gitignore_path.exists():
-        patterns = gitignore_path.read_text().splitlines()
-    else:
-        patterns = []
-
-    spec = PathSpec.from_lines("gitwildmatch", patterns + AGENT_ZIP_BLACKLIST)
+def upload_agent(
+    client: paramiko.SSHClient,
+    agent_path: Path,
+    progress: ProgressCallback | None = None,
+    compression: Compression = Compression.deflate,
+    level: int | None = None,
+) -> None:
+    """Bundle agent directory (respecting .gitignore) and upload via SFTP."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = build_bundle(agent_path, Path(tmp), compression, level)
+        upload_file(client, bundle, remote_bundle_path(compression), progress)
+
+
+def fetch_bundle(
+    client: paramiko.SSHClient,
+    url: str,
+    sha256: str,
+    compression: Compression = Compression.deflate,
+) -> None:
+    """Have the instance download a published bundle and check its sha256."""
+    script = FETCH_BUNDLE_SCRIPT.format(
+        url=shlex.quote(url), sha256=sha256, path=remote_bundle_path(compression)
+    )
+    _run_script(client, script, "fetch-bundle")
 
-    with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
-        tmp_path = tmp.name
 
+def upload_secrets(client: paramiko.SSHClient, agent_path: Path) -> None:
+    """Upload env files (left out of published bundles) for DEPLOY_CODE_SCRIPT."""
+    _, secrets = split_secret_files(collect_agent_files(agent_path))
+    sftp = client.open_sftp()
     try:
-        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for root, _, files in os.walk(agent_path):
-                for fname in files:
-                    full = os.path.join(root, fname)
-                    rel = os.path.relpath(full, agent_path)
-                    if not spec.match_file(rel) or rel in AGENT_ZIP_WHITELIST:
-                        zf.write(full, arcname=rel)
-
-        sftp = client.open_sftp()
-        sftp.put(tmp_path, "/tmp/basileus-agent.zip")
-        sftp.close()
+        sftp.mkdir(REMOTE_SECRETS_DIR, 0o700)
+    except OSError:
+        pass  # left over from an interrupted deploy
+    try:
+        for path, arcname in secrets:
+            remote = f"{REMOTE_SECRETS_DIR}/{arcname}"
+            for parent in reversed(Path(arcname).parents[:-1]):
+                try:
+                    sftp.mkdir(f"{REMOTE_SECRETS_DIR}/{parent}", 0o700)
+                except OSError:
+                    pass
+            sftp.put(str(path), remote)
+            sftp.chmod(remote, 0o600)
     finally:
-        os.unlink(tmp_path)
+        sftp.close()
 
 
-def install_node(client: paramiko.SSHClient) -> None:
-    """Install Node.js 22 and tsx on the remote host."""
-    _run_script(client, INSTALL_NODE_SCRIPT, "install-node")
+PROVISION_SCRIPTS = {
+    "install-node": INSTALL_NODE_SCRIPT,
+    "deploy-code": DEPLOY_CODE_SCRIPT,
+    "install-deps": INSTALL_DEPS_SCRIPT,
+    "configure-service": CONFIGURE_SERVICE_SCRIPT,
+    "verify-service": VERIFY_SERVICE_SCRIPT,
+    "provision": PROVISION_SCRIPT,
+}
 
 
-def deploy_code(client: paramiko.SSHClient) -> None:
-    """Unzip uploaded agent code to /opt/basileus."""
-    _run_script(client, DEPLOY_CODE_SCRIPT, "deploy-code")
+def start_provisioning(client: paramiko.SSHClient) -> None:
+    """Start provisioning in the background on the instance.
+
+    Node.js is installed right away; the rest waits for mark_code_delivered.
+    Progress is reported by provisioning_state, logs are in the
+    basileus-provision journal.
+    """
+    sftp = client.open_sftp()
+    try:
+        for label, script in PROVISION_SCRIPTS.items():
+            with sftp.file(f"/tmp/basileus-{label}.sh", "w") as f:
+                f.write(script)
+    finally:
+        sftp.close()
 
+    _stdin, stdout, stderr = client.exec_command(
+        f"rm -f {PROVISION_STATE_DIR}/code-delivered && "
+        "systemd-run --unit=basileus-provision --collect --quiet "
+        "bash /tmp/basileus-provision.sh"
+    )
+    exit_status = stdout.channel.recv_exit_status()
+    if exit_status != 0:
+        err = stderr.read().decode()
+        raise RuntimeError(f"provision failed to start (exit {exit_status}):\n{err}")
 
-def install_deps(client: paramiko.SSHClient) -> None:
-    """Run npm install in /opt/basileus."""
-    _run_script(client, INSTALL_DEPS_SCRIPT, "install-deps")
 
+def mark_code_delivered(client: paramiko.SSHClient) -> None:
+    """Let provisioning go on once the bundle / secrets are on the instance."""
+    _stdin, stdout, _stderr = client.exec_command(
+        f"mkdir -p {PROVISION_STATE_DIR} && touch {PROVISION_STATE_DIR}/code-delivered"
+    )
+    if stdout.channel.recv_exit_status() != 0:
+        raise RuntimeError("Could not hand the code over to provisioning")
+
+
+@dataclass
+class Readiness:
+    """Agent service start-up as measured by the readiness probe."""
+
+    signal: str  # agent: ready file written, unit: stayed up, none: not healthy
+    healthy_after: float | None  # seconds from service start
+    restarts: int
+    state: str  # unit ActiveState when the probe ended
+
+    @classmethod
+    def parse(cls, fields: list[str]) -> "Readiness | None":
+        values = dict(f.split("=", 1) for f in fields if "=" in f)
+        if "signal" not in values:
+            return None
+        healthy_ms = values.get("healthy_after_ms")
+        return cls(
+            signal=values["signal"],
+            healthy_after=int(healthy_ms) / 1000 if healthy_ms else None,
+            restarts=int(values.get("restarts") or 0),
+            state=values.get("state", ""),
+        )
+
+    def describe(self) -> str:
+        restarts = f"{self.restarts} restart{'s' if self.restarts != 1 else ''}"
+        if self.healthy_after is None:
+            return f"{self.state}, {restarts}"
+        how = "ready signal" if self.signal == "agent" else "no ready signal"
+        return f"healthy in {self.healthy_after:.1f}s, {how}, {restarts}"
+
+
+def provisioning_state(client: paramiko.SSHClient) -> tuple[str, Readiness | None]:
+    """Return (ready, running or failed:<stage>, readiness probe results)."""
+    _stdin, stdout, _stderr = client.exec_command(PROVISION_STATE_SCRIPT)
+    stdout.channel.recv_exit_status()
+    state, *fields = stdout.read().decode().split() or [""]
+    return state, Readiness.parse(fields)
 
-def configure_service(client: paramiko.SSHClient) -> None:
-    """Write systemd unit, enable and start the service."""
-    _run_script(client, CONFIGURE_SERVICE_SCRIPT, "configure-service")
 
+def wait_for_provisioning(
+    host: str,
+    ssh_pubkey_path: Path | None = None,
+    timeout: int = 900,
+    interval: int = 10,
+) -> Readiness | None:
+    """Poll the readiness marker until provisioning is done.
 
-def verify_service(client: paramiko.SSHClient) -> bool:
-    """Check if basileus-agent systemd service is active."""
+    Uses one short connection per poll, so no session is held meanwhile.
+    Returns the readiness probe's measurements of the agent service.
+    """
+    deadline = time.time() + timeout
+    state, readiness = "running", None
+    last_error: Exception | None = None
+    while time.time() < deadline:
+        try:
+            client = _connect_once(host, ssh_pubkey_path, timeout=10)
+            try:
+                state, readiness = provisioning_state(client)
+            finally:
+                client.close()
+            last_error = None
+        except (paramiko.AuthenticationException, FileNotFoundError):
+            raise  # wrong or missing key: polling again will not help
+        except (OSError, paramiko.SSHException) as e:
+            last_error = e  # transient, try again next poll
+        if state == "ready":
+            return readiness
+        if state.startswith("failed:"):
+            detail = f": agent service {readiness.describe()}" if readiness else ""
+            raise RuntimeError(
+                f"Provisioning failed at {state.removeprefix('failed:')}{detail} "
+                "(see `journalctl -u basileus-provision` on the instance)"
+            )
+        time.sleep(interval)
+    detail = f" (last error: {last_error})" if last_error else ""
+    raise TimeoutError(f"Provisioning of {host} not done after {timeout}s{detail}")
+
+
+def service_state(client: paramiko.SSHClient) -> str:
+    """Return `systemctl is-active` state of basileus-agent (active, failed...)."""
     _stdin, stdout, _stderr = client.exec_command("systemctl is-active basileus-agent")
     stdout.channel.recv_exit_status()
-    return stdout.read().strip() == b"active"
+    return stdout.read().decode().strip()
+
+
+def check_service(
+    host: str, ssh_pubkey_path: Path | None = None, timeout: int = 10
+) -> str:
+    """Connect once (no retries) and return the basileus-agent service state."""
+    client = _connect_once(host, ssh_pubkey_path, timeout)
+    try:
+        return service_state(client)
+    finally:
+        client.close()
+
+
+def profile_service(
+    host: str,
+    ssh_pubkey_path: Path | None = None,
+    window: int = 300,
+    interval: int = 5,
+) -> ResourceProfile:
+    """Sample the basileus-agent service's CPU and RSS for window seconds."""
+    client = _connect_once(host, ssh_pubkey_path, timeout=10)
+    try:
+        transport = client.get_transport()
+        if transport is not None:
+            transport.set_keepalive(30)  # the session is silent until the end
+        script = PROFILE_SERVICE_SCRIPT.format(
+            samples=max(window // interval, 1) + 1, interval=interval
+        )
+        _stdin, stdout, stderr = client.exec_command(f"bash -c {shlex.quote(script)}")
+        exit_status = stdout.channel.recv_exit_status()
+        if exit_status != 0:
+            err = stderr.read().decode()
+            raise RuntimeError(f"profile failed (exit {exit_status}):\n{err}")
+        return ResourceProfile.parse(stdout.read().decode())
+    finally:
+        client.close()
@@ -1,15 +1,65 @@
 from basileus.async_typer import AsyncTyper
-from basileus.commands.deploy import deploy_command
-from basileus.commands.register import register_command
-from basileus.commands.set_content_hash import set_content_hash_command
-from basileus.commands.stop import stop_command
 
 app = AsyncTyper(
     help="Basileus — Deploy autonomous prediction market agents on Base",
     no_args_is_help=True,
 )
 
-app.command(name="deploy")(deploy_command)
-app.command(name="register")(register_command)
-app.command(name="set-content-hash")(set_content_hash_command)
-app.command(name="stop")(stop_command)
+
+@app.callback()
+def main() -> None:
+    """Basileus — Deploy autonomous prediction market agents on Base"""
+
+
+# Command modules pull in web3, aleph-sdk, paramiko... so they are imported
+# only when their command runs, keeping `basileus --help` fast.
+app.lazy_command(
+    "deploy",
+    "basileus.commands.deploy:deploy_command",
+    help="Deploy a new Basileus agent — generates wallet, funds it, and deploys to Aleph Cloud.",
+)
+app.lazy_command(
+    "fund",
+    "basileus.commands.fund:fund_command",
+    help="Fund many agent wallets from a treasury in a single transaction.",
+)
+app.lazy_command(
+    "index",
+    "basileus.commands.index:index_command",
+    help="Look up agentIds, ENS labels and label owners from a local event index.",
+)
+app.lazy_command(
+    "labels",
+    "basileus.commands.labels:labels_command",
+    help="Find free <label>.basileus-agent.eth names, checked in one batch.",
+)
+app.lazy_command(
+    "monitor",
+    "basileus.commands.monitor:monitor_command",
+    help="Continuously monitor agents and export Prometheus metrics on /metrics.",
+)
+app.lazy_command(
+    "profile",
+    "basileus.commands.profile:profile_command",
+    help="Sample agents' CPU and memory use and recommend the smallest instance that fits.",
+)
+app.lazy_command(
+    "register",
+    "basileus.commands.register:register_command",
+    help="Register an existing Basileus agent on the ERC-8004 IdentityRegistry.",
+)
+app.lazy_command(
+    "set-content-hash",
+    "basileus.commands.set_content_hash:set_content_hash_command",
+    help="Update the ENS content hash for an agent's subname.",
+)
+app.lazy_command(
+    "status",
+    "basileus.commands.status:status_command",
+    help="Show balances, registrations, payment flows, instance and service state of agents.",
+)
+app.lazy_command(
+    "stop",
+    "basileus.commands.stop:stop_command",
+    help="Stop a running Basileus agent — tears down Aleph instance and closes payment flows.",
+)
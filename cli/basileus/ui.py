@@ -4,6 +4,13 @@ from typing import Any
 
 import typer
 from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    DownloadColumn,
+    Progress,
+    TextColumn,
+    TransferSpeedColumn,
+)
 from rich.status import Status
 
 console = Console()
@@ -31,3 +38,28 @@ async def _run_step(
         return result
     except Exception as e:
         _fail(label, e)
+
+
+async def _run_transfer_step(
+    label: str, fn: Callable[[Callable[[int, int], None]], Any]
+) -> Any:
+    """Run a step that reports (done, total) bytes, showing a transfer bar."""
+    try:
+        with Progress(
+            TextColumn(f"{label}..."),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            console=console,
+            transient=True,
+        ) as progress:
+            task = progress.add_task(label, total=None)
+
+            def report(done: int, total: int) -> None:
+                progress.update(task, completed=done, total=total)
+
+            result = await fn(report)
+        console.print(f"  [green]\u2714[/green] {label}")
+        return result
+    except Exception as e:
+        _fail(label, e)
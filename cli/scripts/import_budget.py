@@ -0,0 +1,99 @@
+"""Guard CLI startup latency: `basileus --help` must not pull in heavy deps.
+
+Also checks that the help text each lazy command is registered with in
+basileus/main.py matches the docstring of the function it loads.
+
+Usage: python scripts/import_budget.py [--runs N] [--budget SECONDS]
+"""
+
+import argparse
+import importlib
+import inspect
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that only the commands needing them may import
+HEAVY_MODULES = ["web3", "aleph", "paramiko", "pathspec", "eth_account"]
+
+DEFAULT_RUNS = 10
+DEFAULT_BUDGET = 0.8  # seconds, median of `python -m basileus --help`
+
+
+def _leaked_modules() -> list[str]:
+    """Import the entry point in a fresh interpreter and list heavy modules it loaded."""
+    code = (
+        "import sys, basileus.main\n"
+        f"heavy = {HEAVY_MODULES!r}\n"
+        "print(' '.join(m for m in heavy if m in sys.modules))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return out.stdout.split()
+
+
+def _help_mismatches() -> list[str]:
+    """Lazy commands whose registered help differs from their docstring."""
+    from basileus.main import app
+
+    mismatches = []
+    for name, lazy in app.lazy_commands.items():
+        module_name, attr = lazy.import_path.split(":")
+        fn = getattr(importlib.import_module(module_name), attr)
+        if inspect.getdoc(fn) != lazy.help:
+            mismatches.append(name)
+    return mismatches
+
+
+def _time_help(runs: int) -> list[float]:
+    """Wall-clock time of `python -m basileus --help`, one fresh process per run."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "basileus", "--help"],
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET)
+    args = parser.parse_args()
+
+    leaked = _leaked_modules()
+    if leaked:
+        print(f"FAIL: `import basileus.main` loads {', '.join(leaked)}")
+        return 1
+
+    # Imports every command module into this process; the leak check and the
+    # timings run in fresh interpreters, so they are not affected
+    mismatches = _help_mismatches()
+    if mismatches:
+        print(
+            f"FAIL: help in basileus/main.py differs from the docstring of "
+            f"{', '.join(mismatches)}"
+        )
+        return 1
+
+    timings = _time_help(args.runs)
+    median = statistics.median(timings)
+    print(
+        f"basileus --help: median {median * 1000:.0f} ms, "
+        f"min {min(timings) * 1000:.0f} ms over {args.runs} runs "
+        f"(budget {args.budget * 1000:.0f} ms)"
+    )
+    if median > args.budget:
+        print("FAIL: startup latency over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Measure agent upload throughput against a local SSH server with injected latency.
+
+Starts an in-process paramiko SSH/SFTP server behind a TCP proxy that delays
+every packet by half the requested round-trip time, then uploads a random
+file with plain `sftp.put` and with basileus' parallel `upload_file`.
+
+Usage: python scripts/sftp_benchmark.py [--size-mb N] [--rtt-ms 0,50,150]
+"""
+
+import argparse
+import os
+import queue
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
+
+import paramiko
+from paramiko.common import (
+    AUTH_FAILED,
+    AUTH_SUCCESSFUL,
+    OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED,
+    OPEN_SUCCEEDED,
+)
+
+from basileus.infra.sftp import upload_file
+
+USERNAME = "root"
+PASSWORD = "benchmark"
+
+
+class _Server(paramiko.ServerInterface):
+    """Accepts a fixed password and runs exec requests as local commands."""
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "password"
+
+    def check_auth_password(self, username: str, password: str) -> int:
+        if (username, password) == (USERNAME, PASSWORD):
+            return AUTH_SUCCESSFUL
+        return AUTH_FAILED
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:
+        if kind == "session":
+            return OPEN_SUCCEEDED
+        return OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(
+        self, channel: paramiko.Channel, command: bytes
+    ) -> bool:
+        def run() -> None:
+            proc = subprocess.run(command.decode(), shell=True, capture_output=True)
+            channel.sendall(proc.stdout)
+            channel.sendall_stderr(proc.stderr)
+            channel.send_exit_status(proc.returncode)
+            channel.close()
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+
+class _Handle(paramiko.SFTPHandle):
+    readfile: IO[Any]
+    writefile: IO[Any]
+
+    def stat(self) -> paramiko.SFTPAttributes | int:
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+
+class _LocalSFTP(paramiko.SFTPServerInterface):
+    """SFTP server writing straight to the local filesystem."""
+
+    def open(
+        self, path: str, flags: int, attr: paramiko.SFTPAttributes
+    ) -> _Handle | int:
+        try:
+            fd = os.open(path, flags, 0o644)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno or 0)
+        mode = "r+b" if flags & (os.O_WRONLY | os.O_RDWR) else "rb"
+        f = os.fdopen(fd, mode)
+        handle = _Handle(flags)
+        handle.readfile = f
+        handle.writefile = f
+        return handle
+
+    def stat(self, path: str) -> paramiko.SFTPAttributes | int:
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno or 0)
+
+    lstat = stat
+
+
+def _serve(listener: socket.socket, host_key: paramiko.PKey) -> None:
+    while True:
+        sock, _ = listener.accept()
+        transport = paramiko.Transport(sock)
+        transport.add_server_key(host_key)
+        transport.set_subsystem_handler("sftp", paramiko.SFTPServer, _LocalSFTP)
+        transport.start_server(server=_Server())
+
+
+def _pipe(src: socket.socket, dst: socket.socket, delay: float) -> None:
+    """Forward src -> dst, releasing each chunk `delay` seconds after receipt."""
+    pending: queue.Queue[tuple[float, bytes]] = queue.Queue()
+
+    def writer() -> None:
+        while True:
+            due, data = pending.get()
+            if not data:
+                dst.close()
+                return
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                dst.sendall(data)
+            except OSError:
+                return
+
+    threading.Thread(target=writer, daemon=True).start()
+    while True:
+        try:
+            data = src.recv(256 * 1024)
+        except OSError:
+            data = b""
+        pending.put((time.monotonic() + delay, data))
+        if not data:
+            return
+
+
+def _proxy(listener: socket.socket, target: tuple[str, int], rtt: float) -> None:
+    while True:
+        client, _ = listener.accept()
+        upstream = socket.create_connection(target)
+        for a, b in ((client, upstream), (upstream, client)):
+            threading.Thread(target=_pipe, args=(a, b, rtt / 2), daemon=True).start()
+
+
+def _listen() -> socket.socket:
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    return sock
+
+
+def _start(target: Callable[..., object], *args: object) -> None:
+    threading.Thread(target=target, args=args, daemon=True).start()
+
+
+def _connect(port: int) -> paramiko.SSHClient:
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        "127.0.0.1",
+        port=port,
+        username=USERNAME,
+        password=PASSWORD,
+        allow_agent=False,
+        look_for_keys=False,
+    )
+    return client
+
+
+def _measure(port: int, local: Path, remote: str, parallel: bool) -> float:
+    """Upload once over a fresh connection. Returns MB/s."""
+    client = _connect(port)
+    try:
+        start = time.perf_counter()
+        if parallel:
+            upload_file(client, local, remote)
+        else:
+            sftp = client.open_sftp()
+            sftp.put(str(local), remote)
+            sftp.close()
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+    return local.stat().st_size / elapsed / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=32)
+    parser.add_argument("--rtt-ms", default="0,50,150")
+    args = parser.parse_args()
+
+    server = _listen()
+    _start(_serve, server, paramiko.RSAKey.generate(2048))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        local = Path(tmp) / "bundle.bin"
+        local.write_bytes(os.urandom(args.size_mb * 1024 * 1024))
+        remote = str(Path(tmp) / "uploaded.bin")
+
+        print(f"{args.size_mb} MiB upload      sftp.put    upload_file")
+        for rtt_ms in (int(r) for r in args.rtt_ms.split(",")):
+            proxy = _listen()
+            _start(_proxy, proxy, server.getsockname(), rtt_ms / 1000)
+            port = proxy.getsockname()[1]
+            baseline = _measure(port, local, remote, parallel=False)
+            tuned = _measure(port, local, remote, parallel=True)
+            print(f"RTT {rtt_ms:>4} ms   {baseline:>8.1f} MB/s {tuned:>8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import stat
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from basileus.infra.bundle import Compression, build_bundle, build_zip
+
+
+class BuildZipTest(unittest.TestCase):
+    """build_zip output read back with the stdlib zipfile module."""
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _file(self, name: str, data: bytes, mode: int = 0o644) -> Path:
+        path = self.tmp / "src" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        path.chmod(mode)
+        return path
+
+    def _round_trip(
+        self, files: list[tuple[Path, str]], level: int = 6
+    ) -> zipfile.ZipFile:
+        out = self.tmp / "bundle.zip"
+        build_zip(files, out, level, workers=4)
+        archive = zipfile.ZipFile(out)
+        self.addCleanup(archive.close)
+        self.assertIsNone(archive.testzip())  # every CRC checks out
+        self.assertEqual(archive.namelist(), sorted(arcname for _, arcname in files))
+        for path, arcname in files:
+            self.assertEqual(archive.read(arcname), path.read_bytes(), arcname)
+        return archive
+
+    def test_entries(self) -> None:
+        files = [
+            (self._file("empty", b""), "empty"),
+            (self._file("index.js", b"console.log(1);\n" * 5000), "src/index.js"),
+            (self._file("run.sh", b"#!/bin/sh\necho ok\n", 0o755), "run.sh"),
+            # Stored as is: already-compressed suffix, and data deflate cannot shrink
+            (self._file("logo.png", b"png" * 1000), "assets/logo.png"),
+            (self._file("noise.bin", os.urandom(64 * 1024)), "noise.bin"),
+            (self._file("utf8.md", "héllo wörld".encode()), "docs/données/日本語.md"),
+        ]
+        archive = self._round_trip(files)
+
+        methods = {info.filename: info.compress_type for info in archive.infolist()}
+        self.assertEqual(methods["src/index.js"], zipfile.ZIP_DEFLATED)
+        self.assertEqual(methods["assets/logo.png"], zipfile.ZIP_STORED)
+        self.assertEqual(methods["noise.bin"], zipfile.ZIP_STORED)
+        run_sh = archive.getinfo("run.sh")
+        self.assertEqual(stat.S_IMODE(run_sh.external_attr >> 16), 0o755)
+        self.assertTrue(archive.getinfo("docs/données/日本語.md").flag_bits & 0x800)
+
+    def test_large_entry(self) -> None:
+        data = os.urandom(1024 * 1024) * 24  # 24 MiB, deflates to ~1 MiB
+        self._round_trip([(self._file("big.bin", data), "big.bin")])
+
+    def test_level_zero_stores(self) -> None:
+        files = [(self._file("a.txt", b"a" * 10_000), "a.txt")]
+        archive = self._round_trip(files, level=0)
+        self.assertEqual(archive.getinfo("a.txt").compress_type, zipfile.ZIP_STORED)
+
+    def test_zip64_entry_count(self) -> None:
+        # Over 65535 entries: the count only fits the zip64 end of central
+        # directory. (Sizes and offsets over 4 GiB take the same zip64 extra
+        # field code path, but are too large to build here.)
+        path = self._file("x.txt", b"x")
+        files = [(path, f"d/{i:05}.txt") for i in range(70_000)]
+        self._round_trip(files)
+
+
+class ReproducibleBundleTest(unittest.TestCase):
+    """The same agent code bundles to the same bytes, whatever the mtimes."""
+
+    def _digest(self, agent: Path, compression: Compression, mtime: int) -> str:
+        for path in agent.rglob("*"):
+            os.utime(path, (mtime, mtime))
+        with tempfile.TemporaryDirectory() as out_dir:
+            bundle = build_bundle(agent, Path(out_dir), compression, workers=4)
+            return hashlib.sha256(bundle.read_bytes()).hexdigest()
+
+    def _check(self, compression: Compression) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            agent = Path(tmp)
+            (agent / "src").mkdir()
+            (agent / "src" / "index.js").write_text("console.log(1);\n" * 100)
+            (agent / "package.json").write_text("{}\n")
+            (agent / "README.md").write_text("agent\n")
+            self.assertEqual(
+                self._digest(agent, compression, 1_600_000_000),
+                self._digest(agent, compression, 1_700_000_123),
+            )
+
+    def test_zip(self) -> None:
+        self._check(Compression.deflate)
+
+    def test_tar_zst(self) -> None:
+        try:
+            self._check(Compression.zstd)
+        except RuntimeError as e:  # neither Python 3.14+ nor the zstd extra
+            self.skipTest(str(e))
+
+
+if __name__ == "__main__":
+    unittest.main()